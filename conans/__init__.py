@@ -1,15 +1,19 @@
-# Allow conans to import ConanFile from here
-# to allow refactors
-from conans.client.build.autotools_environment import AutoToolsBuildEnvironment
-from conans.client.build.cmake import CMake
-from conans.client.build.meson import Meson
-from conans.client.build.msbuild import MSBuild
-from conans.client.build.visual_environment import VisualStudioBuildEnvironment
-from conans.client.run_environment import RunEnvironment
-from conans.model.conan_file import ConanFile
-from conans.model.options import Options
-from conans.model.settings import Settings
-from conans.util.files import load
+from conans.util.lazy import lazy_attributes as _lazy_attributes
+
+# Allow conans to import ConanFile from here to allow refactors. They are imported when used,
+# so the modules that don't need them (e.g. the daemon client) don't import all the tools
+# The build helpers are only imported by the recipes that use them
+_lazy_attributes(__name__, {
+    "ConanFile": "conans.model.conan_file",
+    "Options": "conans.model.options",
+    "Settings": "conans.model.settings",
+    "load": "conans.util.files",
+    "AutoToolsBuildEnvironment": "conans.client.build.autotools_environment",
+    "CMake": "conans.client.build.cmake",
+    "Meson": "conans.client.build.meson",
+    "MSBuild": "conans.client.build.msbuild",
+    "VisualStudioBuildEnvironment": "conans.client.build.visual_environment",
+    "RunEnvironment": "conans.client.run_environment"})
 
 # complex_search: With ORs and not filtering by not restricted settings
 COMPLEX_SEARCH_CAPABILITY = "complex_search"
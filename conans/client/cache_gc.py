@@ -0,0 +1,207 @@
+""" Removal of the least recently used package and build folders of the cache, to keep its
+size bounded. The last use of a package is the modification time of its folder, updated when it
+is installed (see ClientCache.record_package_use), and the one of a build folder when it is
+built. Only the folders that no other conan process is using are removed, the ones whose locks
+can be acquired without waiting: the installs hold a read lock of every package they use until
+they finish using it (see ClientCache.package_use_lock).
+
+The automatic collection after the installs doesn't walk the whole store each time. The sizes of
+the written folders are added to an estimate of the store size, saved next to it, and the store
+is only walked when the estimate is over the max size, or once a day to correct it (the folders
+removed by other means are not subtracted, neither the new sources are added).
+"""
+import json
+import os
+import re
+import time
+from contextlib import contextmanager
+
+import fasteners
+
+from conans.client.remover import DiskRemover
+from conans.errors import ConanException
+from conans.model.ref import PackageReference
+from conans.search.search import search_recipes
+from conans.util.files import load, save
+from conans.util.log import logger
+
+SIZE_SUFFIX = ".size"
+_FULL_WALK_INTERVAL = 24 * 3600
+# Between the walks of a store over the max size, if they can't remove enough (packages in use)
+_MIN_WALK_INTERVAL = 300
+
+_SIZE_UNITS = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4}
+_SIZE_PATTERN = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([KMGT]?)i?B?\s*$", re.IGNORECASE)
+
+
+def parse_size(text):
+    """ Bytes of sizes like 1024, 500M, 1.5G or 20GB """
+    match = _SIZE_PATTERN.match(str(text))
+    if not match:
+        raise ConanException("Invalid size '%s', use a number of bytes or K, M, G, T units"
+                             % text)
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2).upper()])
+
+
+def human_size(size):
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024:
+            break
+        size /= 1024.0
+    else:
+        unit = "TB"
+    return "%.1f%s" % (size, unit) if unit != "B" else "%d%s" % (size, unit)
+
+
+def folder_size(folder):
+    result = 0
+    for root, _, files in os.walk(folder):
+        for filename in files:
+            try:
+                result += os.lstat(os.path.join(root, filename)).st_size
+            except OSError:  # Removed meanwhile
+                pass
+    return result
+
+
+def _last_use(folder):
+    try:
+        return os.path.getmtime(folder)
+    except OSError:
+        return None
+
+
+class _Entry(object):
+    """ A package or build folder that can be removed """
+
+    def __init__(self, package_ref, folder, is_build):
+        self.package_ref = package_ref
+        self.folder = folder
+        self.is_build = is_build
+        self.last_use = _last_use(folder)
+
+    def __str__(self):
+        return "%s %s:%s" % ("build" if self.is_build else "package", self.package_ref.conan,
+                             self.package_ref.package_id)
+
+
+class _SizeEstimate(object):
+    """ The size of the store when it was last walked, plus the sizes of the folders written
+    since then. Used holding its lock, it is updated by concurrent conan processes
+    """
+
+    def __init__(self, cache):
+        self._path = os.path.normpath(cache.store) + SIZE_SUFFIX
+
+    def __enter__(self):
+        self._lock = fasteners.InterProcessLock(self._path + ".lock", logger=logger)
+        self._lock.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._lock.release()
+
+    def load(self):
+        """ (size, time of the last walk), None if the store was never walked """
+        try:
+            data = json.loads(load(self._path))
+            return data["size"], data["walked"]
+        except (IOError, OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save(self, size, walked):
+        save(self._path, json.dumps({"size": size, "walked": walked}))
+
+
+@contextmanager
+def _unused(client_cache, entry):
+    """ Holds the locks of the entry if no other process holds them, yields if they were acquired
+    """
+    locks = [client_cache.conanfile_write_lock(entry.package_ref.conan)]
+    if not entry.is_build:
+        locks.append(client_cache.package_lock(entry.package_ref))
+        locks.append(client_cache.package_unused_lock(entry.package_ref))
+    acquired = []
+    try:
+        for lock in locks:
+            if not lock.try_acquire():
+                break
+            acquired.append(lock)
+        yield len(acquired) == len(locks)
+    finally:
+        for lock in reversed(acquired):
+            lock.__exit__(None, None, None)
+
+
+def cache_gc(client_cache, max_size, output, keep=None):
+    """ Removes the least recently used package and build folders until the store is not bigger
+    than max_size bytes. Never the packages in 'keep', or the ones used by other processes.
+    Returns the removed bytes
+    """
+    cache = client_cache.writable_layer  # The lower stores are read-only
+    entries = []
+    outside_size = 0  # Of the short_paths folders, not in the store
+    for conan_ref in search_recipes(cache):
+        for package_id in cache.conan_packages(conan_ref):
+            package_ref = PackageReference(conan_ref, package_id)
+            entries.append(_Entry(package_ref, cache.package(package_ref, short_paths=None),
+                                  is_build=False))
+        for build_id in cache.conan_builds(conan_ref):
+            package_ref = PackageReference(conan_ref, build_id)
+            entries.append(_Entry(package_ref, cache.build(package_ref, short_paths=None),
+                                  is_build=True))
+    store = os.path.join(cache.store, "")
+    for entry in entries:
+        if not entry.folder.startswith(store):
+            outside_size += folder_size(entry.folder)
+    walked = time.time()
+    total = folder_size(cache.store) + outside_size
+    if total <= max_size:
+        with _SizeEstimate(cache) as estimate:
+            estimate.save(total, walked)
+        return 0
+
+    output.info("Cache size %s is over %s, removing the least recently used packages"
+                % (human_size(total), human_size(max_size)))
+    removed = 0
+    remover = DiskRemover(cache)
+    for entry in sorted(entries, key=lambda e: e.last_use or 0):
+        if total - removed <= max_size:
+            break
+        if not entry.is_build and keep and entry.package_ref in keep:
+            continue
+        with _unused(cache, entry) as unused:
+            if not unused or _last_use(entry.folder) != entry.last_use:
+                logger.debug("GC: Skipping %s, in use" % str(entry))
+                continue
+            size = folder_size(entry.folder)
+            conan_ref, package_id = entry.package_ref.conan, entry.package_ref.package_id
+            if entry.is_build:
+                remover.remove_builds(conan_ref, [package_id])
+            else:
+                remover.remove_packages(conan_ref, [package_id])
+                cache.registry.prefs.remove(entry.package_ref, quiet=True)
+        removed += size
+        output.info("Removed %s (%s)" % (str(entry), human_size(size)))
+
+    output.info("Removed %s, cache size %s" % (human_size(removed), human_size(total - removed)))
+    with _SizeEstimate(cache) as estimate:
+        estimate.save(total - removed, walked)
+    return removed
+
+
+def auto_cache_gc(client_cache, max_size, output, keep, written_folders):
+    """ The cache_gc after an install that wrote the written_folders. The store is only walked
+    if its estimated size is over max_size, or to correct the estimate
+    """
+    added = sum(folder_size(folder) for folder in written_folders)
+    with _SizeEstimate(client_cache.writable_layer) as estimate:
+        current = estimate.load()
+        if current is not None:
+            size, walked = current[0] + added, current[1]
+            estimate.save(size, walked)
+            elapsed = time.time() - walked
+            if 0 <= elapsed < _FULL_WALK_INTERVAL and \
+                    (size <= max_size or elapsed < _MIN_WALK_INTERVAL):
+                return 0
+    return cache_gc(client_cache, max_size, output, keep)
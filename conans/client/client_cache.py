@@ -1,5 +1,7 @@
+import copy
 import os
 import shutil
+import uuid
 from collections import OrderedDict
 from contextlib import contextmanager
 from os.path import join, normpath
@@ -10,20 +12,29 @@ from conans.client.output import Color
 from conans.client.profile_loader import read_profile
 from conans.client.remote_registry import default_remotes, dump_registry, migrate_registry_file,\
     RemoteRegistry
+from conans.client.store.hashes_cache import HashesCache
+from conans.client.store.settings_cache import SettingsCache
+from conans.client.store.trash import Trash
+from conans.client.store.validators_cache import ValidatorsCache
 from conans.errors import ConanException
 from conans.model.manifest import FileTreeManifest
 from conans.model.package_metadata import PackageMetadata
 from conans.model.profile import Profile
-from conans.model.ref import ConanFileReference
+from conans.model.ref import ConanFileReference, PackageReference
 from conans.model.settings import Settings
-from conans.paths import CONAN_MANIFEST, PUT_HEADERS, SimplePaths, check_ref_case
+from conans.paths import CONAN_MANIFEST, PACKAGE_METADATA, PUT_HEADERS, SCM_FOLDER, SimplePaths, \
+    check_ref_case
 from conans.unicode import get_cwd
-from conans.util.files import list_folder_subdirs, load, normalize, save
+from conans.util.files import is_dirty, list_folder_subdirs, load, normalize, rmdir, save
 from conans.util.locks import Lock, NoLock, ReadLock, SimpleLock, WriteLock
 
 CONAN_CONF = 'conan.conf'
 CONAN_SETTINGS = "settings.yml"
 LOCALDB = ".conan.db"
+HASHES_DB = ".hashes.db"
+SETTINGS_CACHE = ".settings.cache"
+VALIDATORS_DB = ".validators.db"
+TRASH_SUFFIX = ".trash"
 REGISTRY = "registry.txt"
 REGISTRY_JSON = "registry.json"
 PROFILES_FOLDER = "profiles"
@@ -53,6 +64,7 @@ class ClientCache(SimplePaths):
         self.client_cert_path = normpath(join(self.conan_folder, CLIENT_CERT))
         self.client_cert_key_path = normpath(join(self.conan_folder, CLIENT_KEY))
         self._registry = None
+        self._lower_stores = None
 
         super(ClientCache, self).__init__(self._store_folder)
 
@@ -62,6 +74,22 @@ class ClientCache(SimplePaths):
             self._registry = RemoteRegistry(self.registry_path, self._output)
         return self._registry
 
+    @property
+    def hashes_cache(self):
+        return HashesCache(join(self.conan_folder, HASHES_DB))
+
+    @property
+    def settings_cache(self):
+        return SettingsCache(join(self.conan_folder, SETTINGS_CACHE))
+
+    @property
+    def validators_cache(self):
+        return ValidatorsCache(join(self.conan_folder, VALIDATORS_DB))
+
+    @property
+    def trash(self):
+        return Trash(normpath(self.store) + TRASH_SUFFIX)
+
     @property
     def cacert_path(self):
         return normpath(join(self.conan_folder, CACERT_FILE))
@@ -93,6 +121,22 @@ class ClientCache(SimplePaths):
         return SimpleLock(join(self.conan(package_ref.conan), "locks",
                                package_ref.package_id))
 
+    def package_use_lock(self, package_ref):
+        """ Read lock held while the package is used by an install, the cache_gc doesn't remove
+        the packages whose write lock it can't acquire
+        """
+        if self._no_locks():
+            return NoLock()
+        return ReadLock(join(self.conan(package_ref.conan), "locks", package_ref.package_id),
+                        package_ref, self._output)
+
+    def package_unused_lock(self, package_ref):
+        """ Write lock of package_use_lock(), acquired by the cache_gc without waiting """
+        if self._no_locks():
+            return NoLock()
+        return WriteLock(join(self.conan(package_ref.conan), "locks", package_ref.package_id),
+                         package_ref, self._output)
+
     @property
     def put_headers_path(self):
         return join(self.conan_folder, PUT_HEADERS)
@@ -208,13 +252,12 @@ class ClientCache(SimplePaths):
         if not self._settings:
             # TODO: Read default environment settings
             if not os.path.exists(self.settings_path):
-                save(self.settings_path, normalize(default_settings_yml))
-                settings = Settings.loads(default_settings_yml)
+                content = normalize(default_settings_yml)
+                save(self.settings_path, content)
             else:
                 content = load(self.settings_path)
-                settings = Settings.loads(content)
-
-            self._settings = settings
+            definition = self.settings_cache.load(content)
+            self._settings = Settings(definition)
         return self._settings
 
     @property
@@ -229,12 +272,12 @@ class ClientCache(SimplePaths):
     def conan_packages(self, conan_reference):
         """ Returns a list of package_id from a local cache package folder """
         assert isinstance(conan_reference, ConanFileReference)
-        packages_dir = self.packages(conan_reference)
-        try:
-            packages = [dirname for dirname in os.listdir(packages_dir)
-                        if os.path.isdir(join(packages_dir, dirname))]
-        except OSError:  # if there isn't any package folder
-            packages = []
+        packages = _list_subdirs(self.packages(conan_reference))
+        for lower in self.lower_stores:
+            for package_id in _list_subdirs(lower.packages(conan_reference)):
+                if package_id not in packages and \
+                        self._lower_package_store(PackageReference(conan_reference, package_id)):
+                    packages.append(package_id)
         return packages
 
     def conan_builds(self, conan_reference):
@@ -248,9 +291,21 @@ class ClientCache(SimplePaths):
             builds = []
         return builds
 
+    def record_package_use(self, package_ref):
+        """ The modification time of the package folder is its last use, the least recently used
+        packages are removed first to keep the cache size (see cache_gc)
+        """
+        try:
+            os.utime(super(ClientCache, self).package(package_ref, short_paths=None), None)
+        except OSError:  # Not in this store, a lower one is never modified
+            pass
+
     def load_manifest(self, conan_reference):
         """conan_id = sha(zip file)"""
         assert isinstance(conan_reference, ConanFileReference)
+        lower = self._lower_recipe_store(conan_reference)
+        if lower:
+            return FileTreeManifest.load(lower.export(conan_reference))
         export_folder = self.export(conan_reference)
         check_ref_case(conan_reference, export_folder, self.store)
         return FileTreeManifest.load(export_folder)
@@ -266,10 +321,10 @@ class ClientCache(SimplePaths):
             return None, None
         return self._digests(package_folder)
 
-    @staticmethod
-    def _digests(folder, exports_sources_folder=None):
+    def _digests(self, folder, exports_sources_folder=None):
         readed_digest = FileTreeManifest.load(folder)
-        expected_digest = FileTreeManifest.create(folder, exports_sources_folder)
+        expected_digest = FileTreeManifest.create(folder, exports_sources_folder,
+                                                  hashes_cache=self.hashes_cache)
         return readed_digest, expected_digest
 
     def delete_empty_dirs(self, deleted_refs):
@@ -300,6 +355,7 @@ class ClientCache(SimplePaths):
         self._settings = None
         self._default_profile = None
         self._no_lock = None
+        self._lower_stores = None
 
     # Metadata
     def load_metadata(self, conan_reference):
@@ -313,7 +369,134 @@ class ClientCache(SimplePaths):
     def update_metadata(self, conan_reference):
         metadata = self.load_metadata(conan_reference)
         yield metadata
-        save(self.package_metadata(conan_reference), metadata.dumps())
+        save(super(ClientCache, self).package_metadata(conan_reference), metadata.dumps())
+
+    # Read-only lower stores
+    @property
+    def lower_stores(self):
+        """ The read-only stores where the recipes and packages not in this store are looked
+        for, in order. The recipes and packages are never written there: a recipe is copied to
+        this store before modifying it, and the missing packages are installed in this store
+        """
+        if self._lower_stores is None:
+            self._lower_stores = [SimplePaths(path)
+                                  for path in self.conan_config.storage_lower_paths]
+        return self._lower_stores
+
+    @property
+    def writable_layer(self):
+        """ This cache without the lower stores, to modify or remove only what is in this store
+        """
+        if not self.lower_stores:
+            return self
+        result = copy.copy(self)
+        result._lower_stores = []
+        return result
+
+    def _lower_recipe_store(self, conan_reference):
+        """ The lower store with the recipe, None if it is in this store or nowhere """
+        lower_stores = self.lower_stores
+        if not lower_stores or os.path.exists(super(ClientCache, self).export(conan_reference)):
+            return None
+        for lower in lower_stores:
+            if os.path.exists(lower.export(conan_reference)):
+                return lower
+        return None
+
+    def _lower_package_store(self, package_ref):
+        """ The lower store with the package, if it is not in this store. Only the packages of
+        the same recipe (manifest) are used
+        """
+        lower_stores = self.lower_stores
+        if not lower_stores or os.path.exists(super(ClientCache, self).package(package_ref,
+                                                                               short_paths=None)):
+            return None
+        conan_ref = package_ref.conan
+        manifest = None
+        for lower in lower_stores:
+            folder = lower.package(package_ref, short_paths=None)
+            if os.path.exists(folder) and not is_dirty(folder):
+                if manifest is None:
+                    manifest = _load_if_exists(join(self.export(conan_ref), CONAN_MANIFEST))
+                if manifest and manifest == _load_if_exists(join(lower.export(conan_ref),
+                                                                 CONAN_MANIFEST)):
+                    return lower
+        return None
+
+    def copy_up_recipe(self, conan_reference):
+        """ Copies the recipe from a lower store to this one, to modify it. The export folder is
+        renamed into place the last one, from then on the recipe is read from this store
+        """
+        lower = self._lower_recipe_store(conan_reference)
+        if not lower:
+            return
+        for filename in (PACKAGE_METADATA, SCM_FOLDER):
+            src = join(lower.conan(conan_reference), filename)
+            dst = join(self.conan(conan_reference), filename)
+            if os.path.exists(src) and not os.path.exists(dst):
+                save(dst, load(src))
+        for src, dst in ((lower.export_sources(conan_reference, short_paths=None),
+                          super(ClientCache, self).export_sources(conan_reference)),
+                         (lower.export(conan_reference),
+                          super(ClientCache, self).export(conan_reference))):
+            if not os.path.exists(src) or os.path.exists(dst):
+                continue
+            tmp = "%s.%s" % (dst, uuid.uuid4().hex)
+            shutil.copytree(src, tmp, symlinks=True)
+            try:
+                os.rename(tmp, dst)
+            except OSError:  # Copied meanwhile by other process
+                rmdir(tmp)
+
+    def copy_up_package(self, package_reference):
+        """ Copies the package from a lower store to this one, to modify it (the upload writes
+        its tgz file). The recipe must be copied up before
+        """
+        lower = self._lower_package_store(package_reference)
+        if not lower:
+            return
+        src = lower.package(package_reference, short_paths=None)
+        dst = super(ClientCache, self).package(package_reference)
+        tmp = "%s.%s" % (dst, uuid.uuid4().hex)
+        shutil.copytree(src, tmp, symlinks=True)
+        try:
+            os.rename(tmp, dst)
+        except OSError:  # Copied meanwhile by other process
+            rmdir(tmp)
+
+    def export(self, conan_reference):
+        lower = self._lower_recipe_store(conan_reference)
+        if lower:
+            return lower.export(conan_reference)
+        return super(ClientCache, self).export(conan_reference)
+
+    def export_sources(self, conan_reference, short_paths=False):
+        lower = self._lower_recipe_store(conan_reference)
+        if lower:
+            folder = lower.export_sources(conan_reference, short_paths=None)
+            if os.path.exists(folder):
+                return folder
+        return super(ClientCache, self).export_sources(conan_reference, short_paths)
+
+    def conanfile(self, conan_reference):
+        lower = self._lower_recipe_store(conan_reference)
+        if lower:
+            return lower.conanfile(conan_reference)
+        return super(ClientCache, self).conanfile(conan_reference)
+
+    def package(self, package_reference, short_paths=False):
+        lower = self._lower_package_store(package_reference)
+        if lower:
+            return lower.package(package_reference, short_paths=None)
+        return super(ClientCache, self).package(package_reference, short_paths)
+
+    def package_metadata(self, conan_reference):
+        metadata = super(ClientCache, self).package_metadata(conan_reference)
+        if not os.path.exists(metadata):
+            lower = self._lower_recipe_store(conan_reference)
+            if lower:
+                return lower.package_metadata(conan_reference)
+        return metadata
 
     # Revisions
     def package_summary_hash(self, package_ref):
@@ -322,6 +505,20 @@ class ClientCache(SimplePaths):
         return readed_digest.summary_hash
 
 
+def _list_subdirs(folder):
+    try:
+        return [dirname for dirname in os.listdir(folder) if os.path.isdir(join(folder, dirname))]
+    except OSError:  # if there isn't any folder
+        return []
+
+
+def _load_if_exists(path):
+    try:
+        return load(path)
+    except IOError:
+        return None
+
+
 def _mix_settings_with_env(settings):
     """Reads CONAN_ENV_XXXX variables from environment
     and if it's defined uses these value instead of the default
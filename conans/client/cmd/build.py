@@ -11,9 +11,11 @@ from conans.util.log import logger
 def build(graph_manager, hook_manager, conanfile_path, output,
           source_folder, build_folder, package_folder, install_folder,
           test=False, should_configure=True, should_build=True, should_install=True,
-          should_test=True):
+          should_test=True, conanfile=None):
     """ Call to build() method saved on the conanfile.py
     param conanfile_path: path to a conanfile.py
+    param conanfile: the conanfile just installed in install_folder by this process, not to
+    load it again (test_package of conan create)
     """
     logger.debug("BUILD: folder '%s'" % build_folder)
     logger.debug("BUILD: Conanfile at '%s'" % conanfile_path)
@@ -22,8 +24,12 @@ def build(graph_manager, hook_manager, conanfile_path, output,
         # Append env_vars to execution environment and clear when block code ends
         output = ScopedOutput(("%s (test package)" % test) if test else "Project",
                               output)
-        conan_file = graph_manager.load_consumer_conanfile(conanfile_path, install_folder,
-                                                           output, deps_info_required=True)
+        if conanfile:
+            conan_file = conanfile
+            conan_file.output = output
+        else:
+            conan_file = graph_manager.load_consumer_conanfile(conanfile_path, install_folder,
+                                                               output, deps_info_required=True)
     except NotFoundException:
         # TODO: Auto generate conanfile from requirements file
         raise ConanException("'%s' file is needed for build.\n"
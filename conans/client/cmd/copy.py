@@ -18,11 +18,7 @@ def _get_package_ids(client_cache, reference, package_ids):
     if not package_ids:
         return []
     if package_ids is True:
-        packages = client_cache.packages(reference)
-        if os.path.exists(packages):
-            package_ids = os.listdir(packages)
-        else:
-            package_ids = []
+        package_ids = client_cache.conan_packages(reference)
     return package_ids
 
 
@@ -34,11 +30,15 @@ def cmd_copy(reference, user_channel, package_ids, client_cache, user_io, remote
     short_paths = _prepare_sources(client_cache, reference, remote_manager, loader)
     package_ids = _get_package_ids(client_cache, reference, package_ids)
     package_copy(reference, user_channel, package_ids, client_cache, user_io,
-                 short_paths, force)
+                 short_paths, force, dest_paths=client_cache.writable_layer)
 
 
 def package_copy(src_ref, user_channel, package_ids, paths, user_io,
-                 short_paths=False, force=False):
+                 short_paths=False, force=False, dest_paths=None):
+    """
+    param dest_paths: Where the copies are written, if not the same paths they are read from
+    """
+    dest_paths = dest_paths or paths
     dest_ref = ConanFileReference.loads("%s/%s@%s" % (src_ref.name,
                                                       src_ref.version,
                                                       user_channel))
@@ -46,7 +46,7 @@ def package_copy(src_ref, user_channel, package_ids, paths, user_io,
     export_origin = paths.export(src_ref)
     if not os.path.exists(export_origin):
         raise ConanException("'%s' doesn't exist" % str(src_ref))
-    export_dest = paths.export(dest_ref)
+    export_dest = dest_paths.export(dest_ref)
     if os.path.exists(export_dest):
         if not force and not user_io.request_boolean("'%s' already exist. Override?"
                                                      % str(dest_ref)):
@@ -56,7 +56,7 @@ def package_copy(src_ref, user_channel, package_ids, paths, user_io,
     user_io.out.info("Copied %s to %s" % (str(src_ref), str(dest_ref)))
 
     export_sources_origin = paths.export_sources(src_ref, short_paths)
-    export_sources_dest = paths.export_sources(dest_ref, short_paths)
+    export_sources_dest = dest_paths.export_sources(dest_ref, short_paths)
     if os.path.exists(export_sources_dest):
         rmdir(export_sources_dest)
     shutil.copytree(export_sources_origin, export_sources_dest, symlinks=True)
@@ -67,7 +67,7 @@ def package_copy(src_ref, user_channel, package_ids, paths, user_io,
         package_origin = PackageReference(src_ref, package_id)
         package_dest = PackageReference(dest_ref, package_id)
         package_path_origin = paths.package(package_origin, short_paths)
-        package_path_dest = paths.package(package_dest, short_paths)
+        package_path_dest = dest_paths.package(package_dest, short_paths)
         if os.path.exists(package_path_dest):
             if not force and not user_io.request_boolean("Package '%s' already exist."
                                                          " Override?" % str(package_id)):
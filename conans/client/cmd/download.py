@@ -45,6 +45,6 @@ def _download_binaries(conanfile, reference, package_ids, client_cache, remote_m
 
     for package_id in package_ids:
         package_ref = PackageReference(reference, package_id)
-        package_folder = client_cache.package(package_ref, short_paths=short_paths)
+        package_folder = client_cache.writable_layer.package(package_ref, short_paths=short_paths)
         output.info("Downloading %s" % str(package_ref))
         remote_manager.get_package(package_ref, package_folder, remote, output, recorder)
@@ -26,10 +26,10 @@ class AliasConanfile(ConanFile):
     alias = "%s"
 """ % str(target_reference)
 
-    export_path = client_cache.export(reference)
+    export_path = client_cache.writable_layer.export(reference)
     mkdir(export_path)
     save(os.path.join(export_path, CONANFILE), conanfile)
-    mkdir(client_cache.export_sources(reference))
+    mkdir(client_cache.writable_layer.export_sources(reference))
     digest = FileTreeManifest.create(export_path)
     digest.save(export_path)
 
@@ -55,6 +55,7 @@ def cmd_export(conanfile_path, conanfile, reference, keep_source, output, client
                              % (conan_ref_str, " ".join(str(s) for s in refs)))
 
     with client_cache.conanfile_write_lock(reference):
+        client_cache.copy_up_recipe(reference)  # The previous digest, not to modify it
         _export_conanfile(conanfile_path, conanfile.output, client_cache, conanfile, reference,
                           keep_source)
     conanfile_cache_path = client_cache.conanfile(reference)
@@ -164,7 +165,8 @@ def _export_conanfile(conanfile_path, output, client_cache, conanfile, conan_ref
                                                            exports_folder,
                                                            output, client_cache, conan_ref)
 
-    digest = FileTreeManifest.create(exports_folder, exports_source_folder)
+    digest = FileTreeManifest.create(exports_folder, exports_source_folder,
+                                     hashes_cache=client_cache.hashes_cache)
 
     if previous_digest and previous_digest == digest:
         output.info("The stored package has not changed")
@@ -28,7 +28,8 @@ def export_pkg(client_cache, graph_manager, hook_manager, recorder, output,
     pkg_id = conanfile.info.package_id()
     output.info("Packaging to %s" % pkg_id)
     pkg_reference = PackageReference(reference, pkg_id)
-    dest_package_folder = client_cache.package(pkg_reference, short_paths=conanfile.short_paths)
+    dest_package_folder = client_cache.writable_layer.package(pkg_reference,
+                                                               short_paths=conanfile.short_paths)
 
     if os.path.exists(dest_package_folder):
         if force:
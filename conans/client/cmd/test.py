@@ -29,22 +29,24 @@ class PackageTester(object):
         if build_modes is None:
             build_modes = ["never"]
         try:
-            self._manager.install(create_reference=reference,
-                                  reference=conanfile_abs_path,
-                                  install_folder=test_build_folder,
-                                  remote_name=remote_name,
-                                  graph_info=graph_info,
-                                  update=update,
-                                  build_modes=build_modes,
-                                  manifest_folder=manifest_folder,
-                                  manifest_verify=manifest_verify,
-                                  manifest_interactive=manifest_interactive,
-                                  keep_build=keep_build)
+            conanfile = self._manager.install(create_reference=reference,
+                                              reference=conanfile_abs_path,
+                                              install_folder=test_build_folder,
+                                              remote_name=remote_name,
+                                              graph_info=graph_info,
+                                              update=update,
+                                              build_modes=build_modes,
+                                              manifest_folder=manifest_folder,
+                                              manifest_verify=manifest_verify,
+                                              manifest_interactive=manifest_interactive,
+                                              keep_build=keep_build)
             # FIXME: This is ugly access to graph_manager and hook_manager. Will be cleaned in 2.0
+            # The test conanfile, its dependencies and their package_info() are the ones of the
+            # install graph, not loaded and configured again from the install folder
             build(self._manager._graph_manager, self._manager._hook_manager, conanfile_abs_path,
                   self._user_io.out,
                   base_folder, test_build_folder, package_folder=None,
-                  install_folder=test_build_folder, test=str(reference))
+                  install_folder=test_build_folder, test=str(reference), conanfile=conanfile)
         finally:
             if delete_after_build:
                 os.chdir(base_folder)  # Required for windows where deleting the cwd is not possible.
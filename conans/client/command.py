@@ -442,6 +442,23 @@ class Command(object):
             verify_ssl = get_bool_from_text(args.verify_ssl)
             return self._conan.config_install(args.item, verify_ssl, args.type, args.args)
 
+    def cache(self, *args):
+        """Manages the local cache.
+
+        'gc' removes the least recently used package and build folders until the cache is not
+        bigger than the max size. The ones used by other conan processes are never removed.
+        """
+        parser = argparse.ArgumentParser(description=self.cache.__doc__, prog="conan cache")
+        subparsers = parser.add_subparsers(dest='subcommand', help='sub-command help')
+        gc_subparser = subparsers.add_parser('gc', help='Remove the least recently used packages')
+        gc_subparser.add_argument("--max-size", "-s",
+                                  help="Max size of the cache, e.g. 20G, 500M, or bytes. Default "
+                                       "the storage.max_size of conan.conf")
+        args = parser.parse_args(*args)
+
+        if args.subcommand == "gc":
+            return self._conan.cache_gc(args.max_size)
+
     def info(self, *args):
         """Gets information about the dependency graph of a recipe.
 
@@ -1339,7 +1356,7 @@ class Command(object):
                 ("Creator commands", ("new", "create", "upload", "export", "export-pkg", "test")),
                 ("Package development commands", ("source", "build", "package")),
                 ("Misc commands", ("profile", "remote", "user", "imports", "copy", "remove",
-                                   "alias", "download", "inspect", "help"))]
+                                   "alias", "download", "inspect", "cache", "help"))]
 
         def check_all_commands_listed():
             """Keep updated the main directory, raise if don't"""
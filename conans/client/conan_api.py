@@ -2,8 +2,6 @@ import os
 import sys
 from collections import OrderedDict
 
-import requests
-
 import conans
 from conans import __version__ as client_version
 from conans.client import packager, tools
@@ -27,7 +25,6 @@ from conans.client.graph.range_resolver import RangeResolver
 from conans.client.hook_manager import HookManager
 from conans.client.importer import run_imports, undo_imports
 from conans.client.loader import ConanFileLoader
-from conans.client.manager import ConanManager
 from conans.client.migrations import ClientMigrator
 from conans.client.output import ConanOutput, ScopedOutput
 from conans.client.profile_loader import profile_from_args, read_profile
@@ -56,7 +53,7 @@ from conans.unicode import get_cwd
 from conans.util.env_reader import get_env
 from conans.util.files import exception_message_safe, mkdir, save_files
 from conans.util.log import configure_logger
-from conans.util.tracer import log_command, log_exception
+from conans.util.tracer import flush_trace, log_command, log_exception
 
 default_manifest_folder = '.conan_manifests'
 
@@ -69,11 +66,10 @@ def get_request_timeout():
         raise ConanException("Specify a numeric parameter for 'request_timeout'")
 
 
-def get_basic_requester(client_cache):
-    requester = requests.Session()
-    # Manage the verify and the client certificates and setup proxies
-
-    return ConanRequester(requester, client_cache, get_request_timeout())
+def get_basic_requester(client_cache, http_requester=None):
+    # Manage the verify and the client certificates and setup proxies, with a requests session
+    # created when needed if not given
+    return ConanRequester(http_requester, client_cache, get_request_timeout())
 
 
 def api_method(f):
@@ -94,6 +90,7 @@ def api_method(f):
             raise
         finally:
             os.chdir(curdir)
+            flush_trace()
     return wrapper
 
 
@@ -159,7 +156,8 @@ class ConanAPIV1(object):
         # To handle remote connections
         put_headers = client_cache.read_put_headers()
         rest_api_client = RestApiClient(user_io.out, requester=version_checker_req,
-                                        put_headers=put_headers)
+                                        put_headers=put_headers,
+                                        validators_cache=client_cache.validators_cache)
         # To store user and token
         localdb = LocalDB(client_cache.localdb)
         # Wraps RestApiClient to add authentication support (same interface)
@@ -169,7 +167,7 @@ class ConanAPIV1(object):
         return localdb, rest_api_client, remote_manager
 
     @staticmethod
-    def factory(interactive=None):
+    def factory(interactive=None, http_requester=None):
         """Factory"""
         # Respect color env setting or check tty if unset
         color_set = "CONAN_COLOR_DISPLAY" in os.environ
@@ -195,6 +193,8 @@ class ConanAPIV1(object):
         except Exception as e:
             out.error(str(e))
             raise
+        # The folders left by the previous commands
+        client_cache.trash.empty(wait=False)
 
         with tools.environment_append(client_cache.conan_config.env_vars):
             # Adjust CONAN_LOGGING_LEVEL with the env readed
@@ -206,7 +206,7 @@ class ConanAPIV1(object):
                                        user_io.out)
 
             # Get the new command instance after migrations have been done
-            requester = get_basic_requester(client_cache)
+            requester = get_basic_requester(client_cache, http_requester)
             _, _, remote_manager = ConanAPIV1.instance_remote_manager(
                 requester,
                 client_cache, user_io,
@@ -249,6 +249,8 @@ class ConanAPIV1(object):
 
     def _init_manager(self, action_recorder):
         """Every api call gets a new recorder and new manager"""
+        # Not imported by the commands that don't install (installer, generators...)
+        from conans.client.manager import ConanManager
         return ConanManager(self._client_cache, self._user_io,
                             self._remote_manager, action_recorder,
                             self._graph_manager, self._hook_manager)
@@ -458,7 +460,8 @@ class ConanAPIV1(object):
     def install_reference(self, reference, settings=None, options=None, env=None,
                           remote_name=None, verify=None, manifests=None,
                           manifests_interactive=None, build=None, profile_name=None,
-                          update=False, generators=None, install_folder=None, cwd=None):
+                          update=False, generators=None, install_folder=None, cwd=None,
+                          profile_names=None):
 
         try:
             recorder = ActionRecorder()
@@ -468,20 +471,24 @@ class ConanAPIV1(object):
             manifests = _parse_manifests_arguments(verify, manifests, manifests_interactive, cwd)
             manifest_folder, manifest_interactive, manifest_verify = manifests
 
-            graph_info = get_graph_info(profile_name, settings, options, env, cwd, None,
-                                        self._client_cache, self._user_io.out)
+            configurations = _get_configurations(profile_name, profile_names, settings, options,
+                                                 env, cwd, install_folder, self._client_cache,
+                                                 self._user_io.out)
 
             if not generators:  # We don't want the default txt
                 generators = False
 
-            mkdir(install_folder)
             manager = self._init_manager(recorder)
-            manager.install(reference=reference, install_folder=install_folder,
-                            remote_name=remote_name, graph_info=graph_info, build_modes=build,
-                            update=update, manifest_folder=manifest_folder,
-                            manifest_verify=manifest_verify,
-                            manifest_interactive=manifest_interactive,
-                            generators=generators)
+            with self._graph_manager.reuse_recipes():
+                for config_install_folder, graph_info in configurations:
+                    mkdir(config_install_folder)
+                    manager.install(reference=reference, install_folder=config_install_folder,
+                                    remote_name=remote_name, graph_info=graph_info,
+                                    build_modes=build, update=update,
+                                    manifest_folder=manifest_folder,
+                                    manifest_verify=manifest_verify,
+                                    manifest_interactive=manifest_interactive,
+                                    generators=generators)
             return recorder.get_info()
         except ConanException as exc:
             recorder.error = True
@@ -492,7 +499,8 @@ class ConanAPIV1(object):
     def install(self, path="", settings=None, options=None, env=None,
                 remote_name=None, verify=None, manifests=None,
                 manifests_interactive=None, build=None, profile_name=None,
-                update=False, generators=None, no_imports=False, install_folder=None, cwd=None):
+                update=False, generators=None, no_imports=False, install_folder=None, cwd=None,
+                profile_names=None):
 
         try:
             recorder = ActionRecorder()
@@ -500,9 +508,6 @@ class ConanAPIV1(object):
             manifests = _parse_manifests_arguments(verify, manifests, manifests_interactive, cwd)
             manifest_folder, manifest_interactive, manifest_verify = manifests
 
-            graph_info = get_graph_info(profile_name, settings, options, env, cwd, None,
-                                        self._client_cache, self._user_io.out)
-
             wspath = _make_abs_path(path, cwd)
             if install_folder:
                 if os.path.isabs(install_folder):
@@ -513,25 +518,34 @@ class ConanAPIV1(object):
                 wsinstall_folder = None
             workspace = Workspace.get_workspace(wspath, wsinstall_folder)
             if workspace:
+                if profile_names:
+                    raise ConanException("Several profiles can't be installed with a workspace")
+                graph_info = get_graph_info(profile_name, settings, options, env, cwd, None,
+                                            self._client_cache, self._user_io.out)
                 self._user_io.out.success("Using conanws.yml file from %s" % workspace._base_folder)
                 manager = self._init_manager(recorder)
                 manager.install_workspace(graph_info, workspace, remote_name, build, update)
                 return
 
             install_folder = _make_abs_path(install_folder, cwd)
+            configurations = _get_configurations(profile_name, profile_names, settings, options,
+                                                 env, cwd, install_folder, self._client_cache,
+                                                 self._user_io.out)
             conanfile_path = _get_conanfile_path(path, cwd, py=None)
             manager = self._init_manager(recorder)
-            manager.install(reference=conanfile_path,
-                            install_folder=install_folder,
-                            remote_name=remote_name,
-                            graph_info=graph_info,
-                            build_modes=build,
-                            update=update,
-                            manifest_folder=manifest_folder,
-                            manifest_verify=manifest_verify,
-                            manifest_interactive=manifest_interactive,
-                            generators=generators,
-                            no_imports=no_imports)
+            with self._graph_manager.reuse_recipes():
+                for config_install_folder, graph_info in configurations:
+                    manager.install(reference=conanfile_path,
+                                    install_folder=config_install_folder,
+                                    remote_name=remote_name,
+                                    graph_info=graph_info,
+                                    build_modes=build,
+                                    update=update,
+                                    manifest_folder=manifest_folder,
+                                    manifest_verify=manifest_verify,
+                                    manifest_interactive=manifest_interactive,
+                                    generators=generators,
+                                    no_imports=no_imports)
             return recorder.get_info()
         except ConanException as exc:
             recorder.error = True
@@ -723,6 +737,22 @@ class ConanAPIV1(object):
         remover.remove(pattern, remote_name, src, builds, packages, force=force,
                        packages_query=query, outdated=outdated)
 
+    @api_method
+    def cache_gc(self, max_size=None):
+        """ Removes the least recently used packages and builds until the cache is not bigger
+        than max_size, the storage max_size of conan.conf if not specified. Returns the removed
+        bytes
+        """
+        from conans.client.cache_gc import cache_gc, parse_size
+        if max_size is None:
+            max_size = self._client_cache.conan_config.storage_max_size
+            if max_size is None:
+                raise ConanException("Specify the max size, or define storage.max_size in "
+                                     "conan.conf")
+        else:
+            max_size = parse_size(max_size)
+        return cache_gc(self._client_cache, max_size, self._user_io.out)
+
     @api_method
     def copy(self, reference, user_channel, force=False, packages=None):
         """
@@ -973,6 +1003,29 @@ def get_graph_info(profile_name, settings, options, env, cwd, install_folder, cl
     return graph_info
 
 
+def _get_configurations(profile_name, profile_names, settings, options, env, cwd, install_folder,
+                        client_cache, output):
+    """ Returns a list of (install_folder, graph_info) to install. With profile_names, one for
+    each of the profiles, installed in a subfolder of install_folder named as the profile
+    """
+    if not profile_names:
+        graph_info = get_graph_info(profile_name, settings, options, env, cwd, None,
+                                    client_cache, output)
+        return [(install_folder, graph_info)]
+
+    if profile_name:
+        raise ConanException("Do not specify both 'profile_name' and 'profile_names'")
+    result = []
+    for name in profile_names:
+        folder = os.path.join(install_folder, os.path.splitext(os.path.basename(name))[0])
+        if folder in [config_folder for config_folder, _ in result]:
+            raise ConanException("Profiles with the same name can't be installed together: %s"
+                                 % name)
+        graph_info = get_graph_info(name, settings, options, env, cwd, None, client_cache, output)
+        result.append((folder, graph_info))
+    return result
+
+
 def _parse_manifests_arguments(verify, manifests, manifests_interactive, cwd):
     if manifests and manifests_interactive:
         raise ConanException("Do not specify both manifests and "
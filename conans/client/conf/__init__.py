@@ -85,6 +85,7 @@ run_to_output = True        # environment CONAN_LOG_RUN_TO_OUTPUT
 run_to_file = False         # environment CONAN_LOG_RUN_TO_FILE
 level = 50                  # environment CONAN_LOGGING_LEVEL
 # trace_file =              # environment CONAN_TRACE_FILE
+# trace_format = json       # environment CONAN_TRACE_FORMAT (json or compact)
 print_run_commands = False  # environment CONAN_PRINT_RUN_COMMANDS
 
 [general]
@@ -92,12 +93,15 @@ default_profile = %s
 compression_level = 9                 # environment CONAN_COMPRESSION_LEVEL
 sysrequires_sudo = True               # environment CONAN_SYSREQUIRES_SUDO
 request_timeout = 60                  # environment CONAN_REQUEST_TIMEOUT (seconds)
+# parallel_transfers = 4              # environment CONAN_PARALLEL_TRANSFERS (files of a recipe or package transferred concurrently)
 # sysrequires_mode = enabled          # environment CONAN_SYSREQUIRES_MODE (allowed modes enabled/verify/disabled)
 # vs_installation_preference = Enterprise, Professional, Community, BuildTools # environment CONAN_VS_INSTALLATION_PREFERENCE
 # verbose_traceback = False           # environment CONAN_VERBOSE_TRACEBACK
 # bash_path = ""                      # environment CONAN_BASH_PATH (only windows)
 # recipe_linter = False               # environment CONAN_RECIPE_LINTER
 # read_only_cache = True              # environment CONAN_READ_ONLY_CACHE
+# link_build_sources = False          # environment CONAN_LINK_BUILD_SOURCES (reflink or hardlink the sources into the build folder instead of copying them)
+# link_copied_files = False           # environment CONAN_LINK_COPIED_FILES (reflink or hardlink the files copied by package() and imports())
 # pylintrc = path/to/pylintrc_file    # environment CONAN_PYLINTRC
 # cache_no_locks = True               # Disable locking mechanism of local cache
 # user_home_short = your_path         # environment CONAN_USER_HOME_SHORT
@@ -129,6 +133,12 @@ request_timeout = 60                  # environment CONAN_REQUEST_TIMEOUT (secon
 # path beginning with "~" (if the environment var CONAN_USER_HOME is specified, this directory, even
 # with "~/", will be relative to the conan user home, not to the system user home)
 path = ~/.conan/data
+# Read-only stores where the recipes and packages not found in "path" are looked for, in order,
+# e.g. a shared store pre-populated by other conan user home. Separated by ":" (";" in Windows)
+# lower_paths = /nfs/conan/data        # environment CONAN_STORAGE_LOWER_PATHS
+# Maximum size of the store, e.g. 20G. The least recently used package and build folders are
+# removed after installing when it is bigger. "conan cache gc" removes them on demand
+# max_size = 20G                         # environment CONAN_STORAGE_MAX_SIZE
 
 [proxies]
 # Empty section will try to use system proxies.
@@ -165,6 +175,7 @@ class ConanClientConfigParser(ConfigParser, object):
                "CONAN_LOG_RUN_TO_FILE": self._env_c("log.run_to_file", "CONAN_LOG_RUN_TO_FILE", "False"),
                "CONAN_LOGGING_LEVEL": self._env_c("log.level", "CONAN_LOGGING_LEVEL", "50"),
                "CONAN_TRACE_FILE": self._env_c("log.trace_file", "CONAN_TRACE_FILE", None),
+               "CONAN_TRACE_FORMAT": self._env_c("log.trace_format", "CONAN_TRACE_FORMAT", None),
                "CONAN_PRINT_RUN_COMMANDS": self._env_c("log.print_run_commands", "CONAN_PRINT_RUN_COMMANDS", "False"),
                "CONAN_COMPRESSION_LEVEL": self._env_c("general.compression_level", "CONAN_COMPRESSION_LEVEL", "9"),
                "CONAN_NON_INTERACTIVE": self._env_c("general.non_interactive", "CONAN_NON_INTERACTIVE", "False"),
@@ -173,10 +184,13 @@ class ConanClientConfigParser(ConfigParser, object):
                "CONAN_SYSREQUIRES_SUDO": self._env_c("general.sysrequires_sudo", "CONAN_SYSREQUIRES_SUDO", "False"),
                "CONAN_SYSREQUIRES_MODE": self._env_c("general.sysrequires_mode", "CONAN_SYSREQUIRES_MODE", "enabled"),
                "CONAN_REQUEST_TIMEOUT": self._env_c("general.request_timeout", "CONAN_REQUEST_TIMEOUT", None),
+               "CONAN_PARALLEL_TRANSFERS": self._env_c("general.parallel_transfers", "CONAN_PARALLEL_TRANSFERS", None),
                "CONAN_VS_INSTALLATION_PREFERENCE": self._env_c("general.vs_installation_preference", "CONAN_VS_INSTALLATION_PREFERENCE", None),
                "CONAN_RECIPE_LINTER": self._env_c("general.recipe_linter", "CONAN_RECIPE_LINTER", "True"),
                "CONAN_CPU_COUNT": self._env_c("general.cpu_count", "CONAN_CPU_COUNT", None),
                "CONAN_READ_ONLY_CACHE": self._env_c("general.read_only_cache", "CONAN_READ_ONLY_CACHE", None),
+               "CONAN_LINK_BUILD_SOURCES": self._env_c("general.link_build_sources", "CONAN_LINK_BUILD_SOURCES", None),
+               "CONAN_LINK_COPIED_FILES": self._env_c("general.link_copied_files", "CONAN_LINK_COPIED_FILES", None),
                "CONAN_USER_HOME_SHORT": self._env_c("general.user_home_short", "CONAN_USER_HOME_SHORT", None),
                "CONAN_USE_ALWAYS_SHORT_PATHS": self._env_c("general.use_always_short_paths", "CONAN_USE_ALWAYS_SHORT_PATHS", None),
                "CONAN_VERBOSE_TRACEBACK": self._env_c("general.verbose_traceback", "CONAN_VERBOSE_TRACEBACK", None),
@@ -360,6 +374,35 @@ class ConanClientConfigParser(ConfigParser, object):
                 raise ConanException("Conan storage path has to be an absolute path")
         return result
 
+    @property
+    def storage_lower_paths(self):
+        result = get_env("CONAN_STORAGE_LOWER_PATHS", None)
+        if result is None:
+            try:
+                result = self.storage.get("lower_paths") or ""
+            except ConanException:
+                result = ""
+        paths = [conan_expand_user(path.strip()) for path in result.split(os.pathsep)
+                 if path.strip()]
+        for path in paths:
+            if not os.path.isabs(path):
+                raise ConanException("Conan storage lower paths have to be absolute paths")
+        return paths
+
+    @property
+    def storage_max_size(self):
+        """ In bytes, None if not defined """
+        result = get_env("CONAN_STORAGE_MAX_SIZE", None)
+        if result is None:
+            try:
+                result = self.storage.get("max_size")
+            except ConanException:
+                return None
+        if not result:
+            return None
+        from conans.client.cache_gc import parse_size
+        return parse_size(result)
+
     @property
     def proxies(self):
         """ optional field, might not exist
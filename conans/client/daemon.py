@@ -0,0 +1,411 @@
+""" Optional daemon that runs the conan commands in a long-lived process, so the commands don't
+pay the interpreter start-up, the imports and the creation of the HTTP connections each time.
+The "conan" command forwards its arguments, working directory and environment to the daemon of
+its conan user home, if it is running, and streams back the output and the exit code. The
+commands are run one after the other, in the same way as the separate conan processes, so the
+locks of the cache protect it from other conan processes too.
+
+This module is imported by the "conan" command before anything else, so only the standard
+library can be imported at module level.
+"""
+import json
+import os
+import re
+import select
+import signal
+import socket
+import struct
+import sys
+import threading
+import traceback
+import uuid
+
+from conans import __version__ as client_version
+
+# Disables forwarding the commands to the daemon. The commands run by the daemon define it, the
+# conan commands run by the recipes have to run in their own process
+CONAN_NO_DAEMON = "CONAN_NO_DAEMON"
+DAEMON_FILE = ".daemon.json"
+
+# Frames: 1 byte type + 4 bytes length + payload
+_HEADER = struct.Struct(">cI")
+_REQUEST = b"r"
+_STARTED = b"s"
+_CONFIRM = b"c"
+_STDOUT = b"o"
+_STDERR = b"e"
+_EXIT = b"x"
+
+_CONNECT_TIMEOUT = 2
+# The request, and the start of its command, have to be sent within this time. A busy daemon
+# doesn't block the clients, they run the command themselves
+_REQUEST_TIMEOUT = 2
+_MAX_REQUEST_SIZE = 16 * 1024 * 1024
+_DRAIN_TIMEOUT = 5
+# Seconds between the checks of the client connection while its command runs
+_WATCH_INTERVAL = 0.2
+_ERROR_GENERAL = 1
+_ERROR_MIGRATION = 2
+_USER_CTRL_C = 3
+# Modules of the recipes, loaded with a uuid name (see loader._parse_conanfile)
+_RECIPE_MODULE = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+# Imported when the daemon starts, not by the first commands
+_WARM_MODULES = ["conans.client.command", "conans.client.manager", "conans.client.installer",
+                 "conans.client.generators", "requests", "yaml"]
+
+
+def daemon_file_path(user_home):
+    return os.path.join(user_home, ".conan", DAEMON_FILE)
+
+
+def _send_frame(sock, frame_type, payload):
+    sock.sendall(_HEADER.pack(frame_type, len(payload)) + payload)
+
+
+def _recv_exactly(sock, size):
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise EOFError("Connection closed")
+        data += chunk
+    return data
+
+
+def _recv_frame(sock, max_size=None):
+    frame_type, size = _HEADER.unpack(_recv_exactly(sock, _HEADER.size))
+    if max_size is not None and size > max_size:
+        raise ValueError("Frame of %d bytes is too big" % size)
+    return frame_type, _recv_exactly(sock, size)
+
+
+def _binary_stream(stream):
+    return getattr(stream, "buffer", stream)  # py3 text streams wrap the binary one
+
+
+def forward_command(args):
+    """ Runs the conan command in the daemon of the conan user home. Returns its exit code, or
+    None if it has to run in this process: the daemon is not running, can't be reached or
+    can't run it
+    """
+    if os.getenv(CONAN_NO_DAEMON):
+        return None
+    # Commands that could ask the user for input run in this process
+    if not os.getenv("CONAN_NON_INTERACTIVE") and sys.stdin and sys.stdin.isatty():
+        return None
+    user_home = os.path.expanduser(os.getenv("CONAN_USER_HOME", "~"))
+    try:
+        with open(daemon_file_path(user_home)) as handle:
+            daemon = json.load(handle)
+        sock = socket.create_connection(("127.0.0.1", daemon["port"]), _CONNECT_TIMEOUT)
+    except (IOError, OSError, ValueError, KeyError):
+        return None
+
+    try:
+        request = {"token": daemon["token"], "version": client_version, "args": args,
+                   "cwd": os.getcwd(), "env": dict(os.environ)}
+        try:
+            sock.settimeout(_REQUEST_TIMEOUT)
+            _send_frame(sock, _REQUEST, json.dumps(request).encode("utf-8"))
+            frame_type, _ = _recv_frame(sock)
+            if frame_type != _STARTED:
+                return None
+            # The daemon only runs the command if this client didn't give up waiting for it
+            _send_frame(sock, _CONFIRM, b"")
+            sock.settimeout(None)  # The commands can take any time
+        except (socket.error, EOFError):
+            return None
+
+        streams = {_STDOUT: sys.stdout, _STDERR: sys.stderr}
+        try:
+            while True:
+                frame_type, payload = _recv_frame(sock)
+                if frame_type == _EXIT:
+                    return int(payload)
+                stream = streams[frame_type]
+                _binary_stream(stream).write(payload)
+                stream.flush()
+        except (socket.error, EOFError, KeyError, ValueError) as e:
+            sys.stderr.write("ERROR: Lost the connection with the conan daemon: %s\n" % str(e))
+            return _ERROR_GENERAL
+        except KeyboardInterrupt:  # Closing the connection interrupts the command in the daemon
+            print('You pressed Ctrl+C!')
+            return _USER_CTRL_C
+    finally:
+        sock.close()
+
+
+def stop_daemon():
+    """ Stops the daemon of the conan user home, returns False if it was not running
+    """
+    from conans.paths import get_conan_user_home
+    try:
+        with open(daemon_file_path(get_conan_user_home())) as handle:
+            daemon = json.load(handle)
+        sock = socket.create_connection(("127.0.0.1", daemon["port"]), _CONNECT_TIMEOUT)
+        try:
+            request = {"token": daemon["token"], "version": client_version, "stop": True}
+            _send_frame(sock, _REQUEST, json.dumps(request).encode("utf-8"))
+            _recv_frame(sock)
+        finally:
+            sock.close()
+        return True
+    except (IOError, OSError, ValueError, KeyError, EOFError):
+        return False
+
+
+class _OutputForwarder(object):
+    """ Redirects the stdout and stderr file descriptors of the process to pipes, forwarding
+    them to the client, so the output of the commands run by the recipes is also forwarded.
+    sys.stdout and sys.stderr are replaced too, they could be other streams
+    """
+
+    def __init__(self, sock):
+        self._sock = sock
+        self._lock = threading.Lock()
+        self._connected = True
+        self._saved = {}
+        self._threads = []
+        self._streams = None
+
+    def _forward(self, read_fd, frame_type):
+        with os.fdopen(read_fd, "rb", 0) as pipe:
+            while True:
+                data = pipe.read(64 * 1024)
+                if not data:
+                    break
+                with self._lock:
+                    if self._connected:
+                        try:
+                            _send_frame(self._sock, frame_type, data)
+                        except socket.error:  # Keep reading, not to block the command
+                            self._connected = False
+
+    def __enter__(self):
+        sys.stdout.flush()
+        sys.stderr.flush()
+        for fd, frame_type in ((1, _STDOUT), (2, _STDERR)):
+            read_fd, write_fd = os.pipe()
+            self._saved[fd] = os.dup(fd)
+            os.dup2(write_fd, fd)
+            os.close(write_fd)
+            thread = threading.Thread(target=self._forward, args=(read_fd, frame_type))
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+        self._streams = sys.stdout, sys.stderr
+        sys.stdout = os.fdopen(os.dup(1), "w", 1)
+        sys.stderr = os.fdopen(os.dup(2), "w", 1)
+        return self
+
+    def __exit__(self, *exc_info):
+        for stream in (sys.stdout, sys.stderr):
+            try:
+                stream.close()  # colorama wraps them, closes the wrapped ones
+            except Exception:
+                pass
+        sys.stdout, sys.stderr = self._streams
+        for fd, saved in self._saved.items():
+            os.dup2(saved, fd)  # Closes the write end of the pipe
+            os.close(saved)
+        for thread in self._threads:
+            # Processes launched in background by the recipes could keep the pipe open
+            thread.join(_DRAIN_TIMEOUT)
+
+
+def _interrupt_thread(thread_id):
+    """ Raises KeyboardInterrupt in the thread, as a Ctrl+C does in the main one
+    """
+    if thread_id == _main_thread_id() and hasattr(signal, "pthread_kill"):
+        signal.pthread_kill(thread_id, signal.SIGINT)  # Also interrupts the blocking calls
+    else:
+        import ctypes
+        c_thread_id = ctypes.c_ulong if sys.version_info >= (3, 7) else ctypes.c_long
+        ctypes.pythonapi.PyThreadState_SetAsyncExc(c_thread_id(thread_id),
+                                                   ctypes.py_object(KeyboardInterrupt))
+
+
+def _main_thread_id():
+    main_thread = getattr(threading, "main_thread", None)  # Not in py2, neither pthread_kill
+    return main_thread().ident if main_thread else None
+
+
+class _ClientWatcher(threading.Thread):
+    """ Interrupts the command of the client, in the thread that creates the watcher, if the
+    client disconnects (it was interrupted or killed) while the command runs, so the command
+    doesn't keep running and holding the cache locks
+    """
+
+    def __init__(self, sock):
+        super(_ClientWatcher, self).__init__(name="ConanDaemonClientWatcher")
+        self.daemon = True
+        self._sock = sock
+        self._command_thread = threading.current_thread().ident
+        self._lock = threading.Lock()
+        self._stopped = False
+        self.interrupted = False
+
+    def stop(self):
+        """ After it, the command is not interrupted anymore """
+        with self._lock:
+            self._stopped = True
+        self.join()
+
+    def run(self):
+        while True:
+            with self._lock:
+                if self._stopped:
+                    return
+            try:
+                # The client sends nothing while the command runs, readable means closed
+                if not select.select([self._sock], [], [], _WATCH_INTERVAL)[0]:
+                    continue
+            except (select.error, socket.error, ValueError):
+                pass
+            with self._lock:
+                if not self._stopped:
+                    self.interrupted = True
+                    _interrupt_thread(self._command_thread)
+            return
+
+
+class ConanDaemon(object):
+    """ Serves the conan commands of the clients of the conan user home, one at a time, in a
+    local TCP socket. The port and a random token, required by the requests, are written in
+    the .daemon.json file of the conan folder, readable only by the user
+    """
+
+    def __init__(self, user_home, idle_timeout=None):
+        self._daemon_file = daemon_file_path(user_home)
+        self._idle_timeout = idle_timeout
+        self._token = uuid.uuid4().hex
+        self._http_requester = None
+        self._running = False
+
+    def _warm_up(self):
+        from importlib import import_module
+        for module in _WARM_MODULES:
+            import_module(module)
+        import requests
+        self._http_requester = requests.Session()  # Reuses the connections between commands
+
+    def _save_daemon_file(self, port):
+        folder = os.path.dirname(self._daemon_file)
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+        tmp = "%s.%s" % (self._daemon_file, self._token)
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as handle:
+            json.dump({"port": port, "token": self._token, "pid": os.getpid()}, handle)
+        if os.path.exists(self._daemon_file):  # Windows doesn't replace existing files
+            os.remove(self._daemon_file)
+        os.rename(tmp, self._daemon_file)
+
+    def _remove_daemon_file(self):
+        try:
+            with open(self._daemon_file) as handle:
+                if json.load(handle).get("token") != self._token:
+                    return  # Another daemon started later
+            os.remove(self._daemon_file)
+        except (IOError, OSError, ValueError):
+            pass
+
+    def serve(self, on_ready=None):
+        self._warm_up()
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            server.bind(("127.0.0.1", 0))
+            server.listen(16)
+            server.settimeout(self._idle_timeout)
+            self._save_daemon_file(server.getsockname()[1])
+            if on_ready:
+                on_ready()
+            self._running = True
+            while self._running:
+                try:
+                    sock, _ = server.accept()
+                except socket.timeout:
+                    break
+                sock.settimeout(_REQUEST_TIMEOUT)
+                try:
+                    self._serve_client(sock)
+                except (socket.error, EOFError, ValueError, KeyError):
+                    pass  # Wrong request or client gone
+                finally:
+                    sock.close()
+        finally:
+            self._remove_daemon_file()
+            server.close()
+
+    def _serve_client(self, sock):
+        _, payload = _recv_frame(sock, _MAX_REQUEST_SIZE)
+        request = json.loads(payload.decode("utf-8"))
+        if request["token"] != self._token or request["version"] != client_version:
+            return  # The client runs the command itself
+        if request.get("stop"):
+            self._running = False
+            _send_frame(sock, _EXIT, b"0")
+            return
+
+        _send_frame(sock, _STARTED, b"")
+        frame_type, _ = _recv_frame(sock, 0)
+        if frame_type != _CONFIRM:
+            return
+        sock.settimeout(None)
+        exit_code = self._run_command(sock, request)
+        _send_frame(sock, _EXIT, str(int(exit_code or 0)).encode())
+
+    def _run_command(self, sock, request):
+        """ Runs the command with the working directory and environment of the client, and
+        restores the ones of the daemon after it
+        """
+        old_cwd = os.getcwd()
+        old_environ = dict(os.environ)
+        old_path = list(sys.path)
+        old_modules = set(sys.modules)
+        try:
+            os.environ.clear()
+            os.environ.update(request["env"])
+            os.environ[CONAN_NO_DAEMON] = "1"
+            os.chdir(request["cwd"])
+            with _OutputForwarder(sock):
+                watcher = _ClientWatcher(sock)
+                watcher.start()
+                try:
+                    try:
+                        return self._run(request["args"])
+                    finally:
+                        watcher.stop()
+                except SystemExit as e:  # argparse exits with the --help and wrong arguments
+                    return e.code if isinstance(e.code, int) else int(e.code is not None)
+                except KeyboardInterrupt:
+                    if not watcher.interrupted:
+                        raise  # The daemon itself was interrupted
+                    return _USER_CTRL_C
+                except Exception:
+                    traceback.print_exc()
+                    return _ERROR_GENERAL
+        finally:
+            os.chdir(old_cwd)
+            os.environ.clear()
+            os.environ.update(old_environ)
+            sys.path[:] = old_path
+            # The modules of the recipes are loaded again by the next commands
+            for name in set(sys.modules).difference(old_modules):
+                if _RECIPE_MODULE.match(name):
+                    del sys.modules[name]
+
+    def _run(self, args):
+        from conans.client.command import Command
+        from conans.client.conan_api import Conan
+        from conans.client.conan_command_output import CommandOutputer
+        from conans.errors import ConanException
+
+        try:
+            conan_api, client_cache, user_io = Conan.factory(interactive=False,
+                                                             http_requester=self._http_requester)
+        except ConanException:  # Error migrating
+            return _ERROR_MIGRATION
+        outputer = CommandOutputer(user_io, client_cache)
+        command = Command(conan_api, client_cache, user_io, outputer)
+        return command.run(args)
@@ -1,9 +1,11 @@
 import fnmatch
 import os
+import re
 import shutil
+import time
 from collections import defaultdict
 
-from conans.util.files import mkdir, walk
+from conans.util.files import FileLinker, mkdir, walk
 
 
 def report_copied_files(copied, output):
@@ -25,13 +27,45 @@ def report_copied_files(copied, output):
     return True
 
 
+def _compile_pattern(pattern):
+    """ Same matching than fnmatch.fnmatch(name, pattern), with a compiled regex
+    """
+    match = re.compile(fnmatch.translate(os.path.normcase(pattern))).match
+    return lambda name: match(os.path.normcase(name)) is not None
+
+
+# Listings of folders modified this recently are not reused, files could be added to them within
+# the timestamp resolution of the filesystem without changing their mtime. The first one for the
+# filesystems with timestamps of whole seconds, the second one for the fine grained ones
+_RACY_INTERVAL = 2
+_FINE_RACY_INTERVAL = 0.05
+
+
+def _mtime_ns(folder):
+    st = os.stat(folder)
+    return getattr(st, "st_mtime_ns", None) or int(st.st_mtime * 1e9)
+
+
+def _is_racy(mtime_ns, listed_time):
+    interval = _FINE_RACY_INTERVAL if mtime_ns % 1000000000 else _RACY_INTERVAL
+    return mtime_ns >= (listed_time - interval) * 1e9
+
+
+def _list_folder(folder):
+    """ (subfolders, files) of the folder, None if it cannot be listed """
+    for _, subfolders, files in walk(folder, followlinks=True):
+        return subfolders, files
+    return None
+
+
 class FileCopier(object):
     """ main responsible of copying files from place to place:
     package: build folder -> package folder
     imports: package folder -> user folder
     export: user folder -> store "export" folder
     """
-    def __init__(self, root_source_folder, root_destination_folder, excluded=None):
+    def __init__(self, root_source_folder, root_destination_folder, excluded=None,
+                 link_files=False, walk_index=None, linker=None):
         """
         Takes the base folders to copy resources src -> dst. These folders names
         will not be used in the relative names while copying
@@ -39,6 +73,12 @@ class FileCopier(object):
                                   store build folder
         param root_destination_folder: The base folder to copy things to, typicall the
                                        store package folder
+        param link_files: default for the calls, True to reflink or hardlink the files
+                          instead of copying them, if in the same filesystem
+        param linker: FileLinker of the linked files, by default reflinking or hardlinking them
+        param walk_index: dict to store the walks of the source folders, to share them with
+                          other copiers. The listings of the walked folders are reused while
+                          no file is added or removed in them
         """
         self._base_src = root_source_folder
         self._base_dst = root_destination_folder
@@ -46,12 +86,15 @@ class FileCopier(object):
         self._excluded = [root_destination_folder]
         if excluded:
             self._excluded.append(excluded)
+        self._link_files = link_files
+        self._linker = linker or FileLinker()
+        self._walk_index = walk_index if walk_index is not None else {}
 
     def report(self, output):
         return report_copied_files(self._copied, output)
 
     def __call__(self, pattern, dst="", src="", keep_path=True, links=False, symlinks=None,
-                 excludes=None, ignore_case=False):
+                 excludes=None, ignore_case=False, link_files=None):
         """
         param pattern: an fnmatch file pattern of the files that should be copied. Eg. *.dll
         param dst: the destination local folder, wrt to current conanfile dir, to which
@@ -62,10 +105,14 @@ class FileCopier(object):
                          src to dst folders, or just drop. False is useful if you want
                          to collect e.g. many *.libs among many dirs into a single
                          lib dir
+        param link_files: True to reflink or hardlink the files instead of copying them,
+                          if in the same filesystem. None to use the copier default
         return: list of copied files
         """
         if symlinks is not None:
             links = symlinks
+        if link_files is None:
+            link_files = self._link_files
         # Check for ../ patterns and allow them
         if pattern.startswith(".."):
             rel_dir = os.path.abspath(os.path.join(self._base_src, pattern))
@@ -79,11 +126,78 @@ class FileCopier(object):
 
         files_to_copy, link_folders = self._filter_files(src, pattern, links, excludes,
                                                          ignore_case)
-        copied_files = self._copy_files(files_to_copy, src, dst, keep_path, links)
+        linker = self._linker if link_files else None
+        copied_files = self._copy_files(files_to_copy, src, dst, keep_path, links, linker)
         self._link_folders(src, dst, link_folders)
+        self._invalidate_walks(dst)
         self._copied.extend(files_to_copy)
         return copied_files
 
+    def _invalidate_walks(self, dst):
+        """ Removes the walks of the folders that contain dst, or inside it
+        """
+        dst = os.path.join(dst, "")
+        for key in list(self._walk_index):
+            walked = os.path.join(key[0], "")
+            if dst.startswith(walked) or walked.startswith(dst):
+                del self._walk_index[key]
+
+    def _walk(self, src, links):
+        """ return a list of (relative_folder, files) of the src folder, with files=None for the
+        symlinked folders if links. The listings of the folders of a previous walk in the
+        walk_index are reused if their mtime didn't change
+        """
+        # Only the excluded folders inside src can change the walk
+        src_prefix = os.path.join(src, "")
+        excluded = tuple(f for f in self._excluded if f == src or f.startswith(src_prefix))
+        key = (src, links, excluded)
+        previous = self._walk_index.get(key) or {}
+        listings = {}  # {folder: (mtime, racy, subfolders, files)}
+        result = []
+        pending = [src]
+        while pending:
+            root = pending.pop()
+            if root in self._excluded:
+                continue
+
+            if links and os.path.islink(root):
+                result.append((os.path.relpath(root, src), None))
+                continue
+            basename = os.path.basename(root)
+            # Skip git or svn subfolders
+            if basename in [".git", ".svn"]:
+                continue
+            listing = self._folder_listing(root, previous, listings)
+            if listing is None:
+                continue
+            subfolders, files = listing
+            if basename == "test_package":  # DO NOT export test_package/build folder
+                subfolders = [f for f in subfolders if f != "build"]
+            result.append((os.path.relpath(root, src), files))
+            pending.extend(os.path.join(root, f) for f in reversed(subfolders))
+
+        self._walk_index[key] = listings
+        return result
+
+    @staticmethod
+    def _folder_listing(folder, previous, listings):
+        """ (subfolders, files) of the folder, from the previous listings if it didn't change
+        """
+        try:
+            mtime = _mtime_ns(folder)
+        except OSError:
+            return None
+        listed = previous.get(folder)
+        if listed and listed[0] == mtime and not listed[1]:
+            listings[folder] = listed
+            return listed[2], listed[3]
+
+        listed_time = time.time()
+        listing = _list_folder(folder)
+        if listing is not None:
+            listings[folder] = (mtime, _is_racy(mtime, listed_time)) + listing
+        return listing
+
     def _filter_files(self, src, pattern, links, excludes, ignore_case):
 
         """ return a list of the files matching the patterns
@@ -100,32 +214,19 @@ class FileCopier(object):
         else:
             excludes = []
 
-        for root, subfolders, files in walk(src, followlinks=True):
-            if root in self._excluded:
-                subfolders[:] = []
+        exclude_matches = [_compile_pattern(exclude) for exclude in excludes]
+        excluded_folders = set()
+        for relative_path, files in self._walk(src, links):
+            parent = os.path.dirname(relative_path) or "."
+            if relative_path != "." and parent in excluded_folders:
+                excluded_folders.add(relative_path)
                 continue
-
-            if links and os.path.islink(root):
-                linked_folders.append(os.path.relpath(root, src))
-                subfolders[:] = []
+            if files is None:
+                linked_folders.append(relative_path)
                 continue
-            basename = os.path.basename(root)
-            # Skip git or svn subfolders
-            if basename in [".git", ".svn"]:
-                subfolders[:] = []
+            if any(match(relative_path) for match in exclude_matches):
+                excluded_folders.add(relative_path)
                 continue
-            if basename == "test_package":  # DO NOT export test_package/build folder
-                try:
-                    subfolders.remove("build")
-                except:
-                    pass
-
-            relative_path = os.path.relpath(root, src)
-            for exclude in excludes:
-                if fnmatch.fnmatch(relative_path, exclude):
-                    subfolders[:] = []
-                    files = []
-                    break
             for f in files:
                 relative_name = os.path.normpath(os.path.join(relative_path, f))
                 filenames.append(relative_name)
@@ -134,9 +235,10 @@ class FileCopier(object):
             filenames = {f.lower(): f for f in filenames}
             pattern = pattern.lower()
 
-        files_to_copy = fnmatch.filter(filenames, pattern)
-        for exclude in excludes:
-            files_to_copy = [f for f in files_to_copy if not fnmatch.fnmatch(f, exclude)]
+        match = _compile_pattern(pattern)
+        files_to_copy = [f for f in filenames if match(f)]
+        for exclude_match in exclude_matches:
+            files_to_copy = [f for f in files_to_copy if not exclude_match(f)]
 
         if ignore_case:
             files_to_copy = [filenames[f] for f in files_to_copy]
@@ -184,9 +286,9 @@ class FileCopier(object):
                     base_path = os.path.dirname(base_path)
 
     @staticmethod
-    def _copy_files(files, src, dst, keep_path, symlinks):
+    def _copy_files(files, src, dst, keep_path, symlinks, linker=None):
         """ executes a multiple file copy from [(src_file, dst_file), (..)]
-        managing symlinks if necessary
+        managing symlinks if necessary, linking the files if there is a linker
         """
         copied_files = []
         for filename in files:
@@ -204,6 +306,8 @@ class FileCopier(object):
                 except OSError:
                     pass
                 os.symlink(linkto, abs_dst_name)  # @UndefinedVariable
+            elif linker:
+                linker(abs_src_name, abs_dst_name)
             else:
                 shutil.copy2(abs_src_name, abs_dst_name)
             copied_files.append(abs_dst_name)
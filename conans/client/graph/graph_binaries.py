@@ -8,7 +8,7 @@ from conans.model.info import ConanInfo
 from conans.model.manifest import FileTreeManifest
 from conans.model.ref import PackageReference
 from conans.util.env_reader import get_env
-from conans.util.files import is_dirty, rmdir
+from conans.util.files import is_dirty
 
 
 class GraphBinariesAnalyzer(object):
@@ -91,7 +91,7 @@ class GraphBinariesAnalyzer(object):
         with self._client_cache.package_lock(package_ref):
             if is_dirty(package_folder):
                 output.warn("Package is corrupted, removing folder: %s" % package_folder)
-                rmdir(package_folder)
+                self._client_cache.trash.discard(package_folder)
 
         if remote_name:
             remote = self._registry.remotes.get(remote_name)
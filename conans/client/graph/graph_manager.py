@@ -1,8 +1,8 @@
 import fnmatch
 import os
 from collections import OrderedDict
+from contextlib import contextmanager
 
-from conans.client.generators.text import TXTGenerator
 from conans.client.graph.build_mode import BuildMode
 from conans.client.graph.graph import BINARY_BUILD, BINARY_WORKSPACE, Node
 from conans.client.graph.graph_binaries import GraphBinariesAnalyzer
@@ -98,6 +98,16 @@ class GraphManager(object):
                                    processed_profile=processed_profile)
         return graph
 
+    @contextmanager
+    def reuse_recipes(self):
+        """ The graphs computed inside reuse the recipes retrieved, checked against the remotes
+        and parsed by the previous ones, e.g. to install several configurations. The version
+        ranges resolved with the remotes are always reused by the RangeResolver
+        """
+        with self._proxy.reuse_retrieved():
+            with self._loader.reuse_classes():
+                yield
+
     def load_graph(self, reference, create_reference, graph_info, build_mode, check_updates, update,
                    remote_name, recorder, workspace):
 
@@ -246,6 +256,8 @@ def load_deps_info(current_path, conanfile, required):
 
     if not current_path:
         return
+    from conans.client.generators.text import TXTGenerator  # Imports all the generators
+
     info_file_path = os.path.join(current_path, BUILD_INFO)
     try:
         deps_cpp_info, deps_user_info, deps_env_info = TXTGenerator.loads(load(info_file_path))
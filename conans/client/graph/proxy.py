@@ -1,6 +1,5 @@
 import os
-
-from requests.exceptions import RequestException
+from contextlib import contextmanager
 
 from conans.client.graph.graph import (RECIPE_DOWNLOADED, RECIPE_INCACHE, RECIPE_NEWER,
                                        RECIPE_NOT_IN_REMOTE, RECIPE_NO_REMOTE, RECIPE_UPDATEABLE,
@@ -22,8 +21,29 @@ class ConanProxy(object):
         self._out = output
         self._remote_manager = remote_manager
         self._registry = client_cache.registry
+        self._retrieved = None  # {(ref, check_updates, update, remote_name): get_recipe result}
+
+    @contextmanager
+    def reuse_retrieved(self):
+        """ The recipes retrieved or checked against the remotes inside are not checked again,
+        e.g. computing the graphs of several configurations
+        """
+        self._retrieved = {}
+        try:
+            yield
+        finally:
+            self._retrieved = None
 
     def get_recipe(self, conan_reference, check_updates, update, remote_name, recorder):
+        key = conan_reference, check_updates, update, remote_name
+        if self._retrieved is not None and key in self._retrieved:
+            conanfile_path, status, remote, reference = self._retrieved[key]
+            if status in (RECIPE_DOWNLOADED, RECIPE_UPDATED):
+                status = RECIPE_INCACHE
+            log_recipe_got_from_local_cache(reference)
+            recorder.recipe_fetched_from_cache(reference)
+            return conanfile_path, status, remote, reference
+
         with self._client_cache.conanfile_write_lock(conan_reference):
             result = self._get_recipe(conan_reference, check_updates, update, remote_name, recorder)
             conanfile_path, status, remote, reference = result
@@ -32,6 +52,8 @@ class ConanProxy(object):
                 log_recipe_got_from_local_cache(reference)
                 recorder.recipe_fetched_from_cache(reference)
 
+        if self._retrieved is not None:
+            self._retrieved[key] = result
         return conanfile_path, status, remote, reference
 
     def _get_recipe(self, reference, check_updates, update, remote_name, recorder):
@@ -55,12 +77,14 @@ class ConanProxy(object):
         revisions_enabled = get_env("CONAN_CLIENT_REVISIONS_ENABLED", False)
         if revisions_enabled and reference.revision and cur_revision != reference.revision:
             output.info("Different revision requested, removing current local recipe...")
-            DiskRemover(self._client_cache).remove_recipe(reference)
+            DiskRemover(self._client_cache.writable_layer).remove_recipe(reference)
 
             output.info("Retrieving from remote '%s'..." % update_remote.name)
             new_ref = self._remote_manager.get_recipe(reference, update_remote)
             self._registry.refs.set(new_ref, update_remote.name)
             status = RECIPE_UPDATED
+            # Not the same path if the replaced recipe was in a lower store
+            conanfile_path = self._client_cache.conanfile(reference)
             return conanfile_path, status, update_remote, new_ref
 
         check_updates = check_updates or update
@@ -87,11 +111,12 @@ class ConanProxy(object):
         if upstream_manifest != read_manifest:
             if upstream_manifest.time > read_manifest.time:
                 if update:
-                    DiskRemover(self._client_cache).remove_recipe(reference)
+                    DiskRemover(self._client_cache.writable_layer).remove_recipe(reference)
                     output.info("Retrieving from remote '%s'..." % update_remote.name)
                     new_ref = self._remote_manager.get_recipe(reference, update_remote)
                     self._registry.refs.set(new_ref, update_remote.name)
                     status = RECIPE_UPDATED
+                    conanfile_path = self._client_cache.conanfile(reference)
                     return conanfile_path, status, update_remote, new_ref
                 else:
                     status = RECIPE_UPDATEABLE
@@ -104,6 +129,8 @@ class ConanProxy(object):
         return conanfile_path, status, update_remote, ref
 
     def _download_recipe(self, conan_reference, output, remote_name, recorder):
+        from requests.exceptions import RequestException
+
         def _retrieve_from_remote(the_remote):
             output.info("Trying with '%s'..." % the_remote.name)
             _new_ref = self._remote_manager.get_recipe(conan_reference, the_remote)
@@ -11,7 +11,7 @@ from conans.errors import ConanException
 from conans.model.conan_file import get_env_context_manager
 from conans.model.manifest import FileTreeManifest
 from conans.util.env_reader import get_env
-from conans.util.files import load, md5sum
+from conans.util.files import break_hardlink, load, md5sum
 
 IMPORTS_MANIFESTS = "conan_imports_manifest.txt"
 
@@ -68,13 +68,15 @@ def _make_files_writable(file_names):
         return
 
     for file_name in file_names:
+        break_hardlink(file_name)  # Do not make writable the file in the cache
         os.chmod(file_name, os.stat(file_name).st_mode | stat.S_IWRITE)
 
 
 def run_imports(conanfile, dest_folder, output):
     if not hasattr(conanfile, "imports"):
         return []
-    file_importer = _FileImporter(conanfile, dest_folder)
+    link_files = get_env("CONAN_LINK_COPIED_FILES", False)
+    file_importer = _FileImporter(conanfile, dest_folder, link_files=link_files)
     conanfile.copy = file_importer
     conanfile.imports_folder = dest_folder
     with get_env_context_manager(conanfile):
@@ -131,13 +133,15 @@ class _FileImporter(object):
     It can be also used for Golang projects, in which the packages are always
     source based and need to be copied to the user folder to be built
     """
-    def __init__(self, conanfile, dst_folder):
+    def __init__(self, conanfile, dst_folder, link_files=False):
         self._conanfile = conanfile
         self._dst_folder = dst_folder
+        self._link_files = link_files
+        self._walk_index = {}
         self.copied_files = set()
 
     def __call__(self, pattern, dst="", src="", root_package=None, folder=False,
-                 ignore_case=False, excludes=None, keep_path=True):
+                 ignore_case=False, excludes=None, keep_path=True, link_files=None):
         """
         param pattern: an fnmatch file pattern of the files that should be copied. Eg. *.dll
         param dst: the destination local folder, wrt to current conanfile dir, to which
@@ -146,7 +150,11 @@ class _FileImporter(object):
                    will be stripped from the dst name. Eg.: lib/Debug/x86
         param root_package: fnmatch pattern of the package name ("OpenCV", "Boost") from
                             which files will be copied. Default: all packages in deps
+        param link_files: True to reflink or hardlink the files instead of copying them,
+                          if in the same filesystem. None to use the importer default
         """
+        if link_files is None:
+            link_files = self._link_files
         if os.path.isabs(dst):
             real_dst_folder = dst
         else:
@@ -155,9 +163,9 @@ class _FileImporter(object):
         matching_paths = self._get_folders(root_package)
         for name, matching_path in matching_paths.items():
             final_dst_path = os.path.join(real_dst_folder, name) if folder else real_dst_folder
-            file_copier = FileCopier(matching_path, final_dst_path)
+            file_copier = FileCopier(matching_path, final_dst_path, walk_index=self._walk_index)
             files = file_copier(pattern, src=src, links=True, ignore_case=ignore_case,
-                                excludes=excludes, keep_path=keep_path)
+                                excludes=excludes, keep_path=keep_path, link_files=link_files)
             self.copied_files.update(files)
 
     def _get_folders(self, pattern):
@@ -25,7 +25,8 @@ from conans.model.ref import PackageReference
 from conans.model.user_info import UserInfo
 from conans.paths import BUILD_INFO, CONANINFO, RUN_LOG_NAME
 from conans.util.env_reader import get_env
-from conans.util.files import (clean_dirty, is_dirty, make_read_only, mkdir, rmdir, save, set_dirty)
+from conans.util.files import (clean_dirty, is_dirty, link_tree, make_read_only, mkdir, save,
+                               set_dirty)
 from conans.util.log import logger
 from conans.util.tracer import log_package_built, \
     log_package_got_from_local_cache
@@ -61,8 +62,9 @@ class _ConanPackageBuilder(object):
                                                 new_id) if new_id else package_reference
         self.build_folder = self._client_cache.build(self.build_reference,
                                                      self._conan_file.short_paths)
-        self.package_folder = self._client_cache.package(self._package_reference,
-                                                         self._conan_file.short_paths)
+        # Built in the cache also if the package is in a lower store, which are read-only
+        self.package_folder = self._client_cache.writable_layer.package(
+            self._package_reference, self._conan_file.short_paths)
         self.source_folder = self._client_cache.source(self._conan_ref, self._conan_file.short_paths)
 
     def prepare_build(self):
@@ -78,8 +80,9 @@ class _ConanPackageBuilder(object):
         conanfile_path = self._client_cache.conanfile(self._conan_ref)
 
         try:
-            rmdir(self.build_folder)
-            rmdir(self.package_folder)
+            trash = self._client_cache.trash  # Removed in background, not to wait for it
+            trash.discard(self.build_folder)
+            trash.discard(self.package_folder)
         except OSError as e:
             raise ConanException("%s\n\nCouldn't remove folder, might be busy or open\n"
                                  "Close any app using it, and retry" % str(e))
@@ -100,7 +103,11 @@ class _ConanPackageBuilder(object):
             else:
                 ignore = None
 
-            shutil.copytree(self.source_folder, self.build_folder, symlinks=True, ignore=ignore)
+            if get_env("CONAN_LINK_BUILD_SOURCES", False):
+                link_tree(self.source_folder, self.build_folder, ignore=ignore)
+            else:
+                shutil.copytree(self.source_folder, self.build_folder, symlinks=True,
+                                ignore=ignore)
             logger.debug("BUILD: Copied to %s", self.build_folder)
             logger.debug("BUILD: Files copied %s", ",".join(os.listdir(self.build_folder)))
             self._conan_file.source_folder = self.build_folder
@@ -265,6 +272,7 @@ class ConanInstaller(object):
         self._recorder = recorder
         self._workspace = workspace
         self._hook_manager = hook_manager
+        self._use_locks = []  # Of the installed packages, until release_packages()
 
     def install(self, deps_graph, keep_build=False, graph_info=None):
         # order by levels and separate the root node (conan_ref=None) from the rest
@@ -272,9 +280,24 @@ class ConanInstaller(object):
         root_level = nodes_by_level.pop()
         root_node = root_level[0]
         # Get the nodes in order and if we have to build them
-        self._build(nodes_by_level, deps_graph, keep_build, root_node, graph_info)
+        written_folders = []
+        installed = self._build(nodes_by_level, deps_graph, keep_build, root_node, graph_info,
+                                written_folders)
+
+        max_size = self._client_cache.conan_config.storage_max_size
+        if max_size is not None:
+            from conans.client.cache_gc import auto_cache_gc
+            auto_cache_gc(self._client_cache, max_size, self._out, installed, written_folders)
+
+    def release_packages(self):
+        """ Releases the packages used by the install, the cache_gc can remove them again. The
+        consumer has to call it after using them: building, importing or deploying them
+        """
+        while self._use_locks:
+            self._use_locks.pop().__exit__(None, None, None)
 
-    def _build(self, nodes_by_level, deps_graph, keep_build, root_node, graph_info):
+    def _build(self, nodes_by_level, deps_graph, keep_build, root_node, graph_info,
+               written_folders):
         inverse_levels = {n: i for i, level in enumerate(deps_graph.inverse_levels()) for n in level}
 
         processed_package_refs = set()
@@ -299,45 +322,64 @@ class ConanInstaller(object):
                 else:
                     package_ref = PackageReference(conan_ref, package_id)
                     _handle_system_requirements(conan_file, package_ref, self._client_cache, output)
-                    self._handle_node_cache(node, package_ref, keep_build, processed_package_refs)
+                    self._handle_node_cache(node, package_ref, keep_build, processed_package_refs,
+                                            written_folders)
 
         # Finally, propagate information to root node (conan_ref=None)
         self._propagate_info(root_node, inverse_levels, deps_graph, self._out)
+        return processed_package_refs
 
     def _node_concurrently_installed(self, node, package_folder):
         if node.binary == BINARY_DOWNLOAD and os.path.exists(package_folder):
             return True
-        elif node.binary == BINARY_UPDATE:
+        elif node.binary == BINARY_UPDATE and os.path.exists(package_folder):
             read_manifest = FileTreeManifest.load(package_folder)
             if node.update_manifest == read_manifest:
                 return True
 
-    def _handle_node_cache(self, node, package_ref, keep_build, processed_package_references):
+    def _handle_node_cache(self, node, package_ref, keep_build, processed_package_references,
+                           written_folders):
         conan_ref, conan_file = node.conan_ref, node.conanfile
         output = ScopedOutput(str(conan_ref), self._out)
         package_folder = self._client_cache.package(package_ref, conan_file.short_paths)
 
+        if package_ref not in processed_package_references:
+            # Held while this process uses the package, not to be removed by the cache_gc
+            use_lock = self._client_cache.package_use_lock(package_ref)
+            use_lock.__enter__()
+            self._use_locks.append(use_lock)
         with self._client_cache.package_lock(package_ref):
             if package_ref not in processed_package_references:
                 processed_package_references.add(package_ref)
-                set_dirty(package_folder)
-                if node.binary == BINARY_BUILD:
-                    self._build_package(node, package_ref, output, keep_build)
-                elif node.binary in (BINARY_UPDATE, BINARY_DOWNLOAD):
-                    if not self._node_concurrently_installed(node, package_folder):
-                        new_ref = self._remote_manager.get_package(package_ref, package_folder,
-                                                                   node.binary_remote, output,
-                                                                   self._recorder)
-                        self._registry.prefs.set(new_ref, node.binary_remote.name)
-                    else:
-                        output.success('Download skipped. Probable concurrent download')
-                        log_package_got_from_local_cache(package_ref)
-                        self._recorder.package_fetched_from_cache(package_ref)
-                elif node.binary == BINARY_CACHE:
+                if node.binary == BINARY_CACHE:  # Nothing is written, it can be in a lower store
+                    if not os.path.exists(package_folder):
+                        raise ConanException("%s was removed from the cache by other process, "
+                                             "please retry" % str(package_ref))
                     output.success('Already installed!')
                     log_package_got_from_local_cache(package_ref)
                     self._recorder.package_fetched_from_cache(package_ref)
-                clean_dirty(package_folder)
+                else:
+                    package_folder = self._client_cache.writable_layer.package(
+                        package_ref, conan_file.short_paths)
+                    set_dirty(package_folder)
+                    written_folders.append(package_folder)
+                    if node.binary == BINARY_BUILD:
+                        written_folders.append(self._client_cache.writable_layer.build(
+                            package_ref, conan_file.short_paths))
+                        self._build_package(node, package_ref, output, keep_build)
+                    elif node.binary in (BINARY_UPDATE, BINARY_DOWNLOAD):
+                        if not self._node_concurrently_installed(node, package_folder):
+                            new_ref = self._remote_manager.get_package(package_ref,
+                                                                       package_folder,
+                                                                       node.binary_remote, output,
+                                                                       self._recorder)
+                            self._registry.prefs.set(new_ref, node.binary_remote.name)
+                        else:
+                            output.success('Download skipped. Probable concurrent download')
+                            log_package_got_from_local_cache(package_ref)
+                            self._recorder.package_fetched_from_cache(package_ref)
+                    clean_dirty(package_folder)
+                self._client_cache.record_package_use(package_ref)
             # Call the info method
             self._call_package_info(conan_file, package_folder)
             self._recorder.package_cpp_info(package_ref, conan_file.cpp_info)
@@ -388,7 +430,7 @@ class ConanInstaller(object):
 
         if is_dirty(builder.build_folder):
             output.warn("Build folder is dirty, removing it: %s" % builder.build_folder)
-            rmdir(builder.build_folder)
+            self._client_cache.trash.discard(builder.build_folder)
 
         skip_build = conan_file.develop and keep_build
         if skip_build:
@@ -407,12 +449,17 @@ class ConanInstaller(object):
                                         conan_file, conan_ref)
                 builder.prepare_build()
 
+        phases = {"prepare": time.time() - t1}
         with self._client_cache.conanfile_read_lock(conan_ref):
             try:
                 if not skip_build:
+                    t2 = time.time()
                     builder.build()
                     clean_dirty(builder.build_folder)
+                    phases["build"] = time.time() - t2
+                t2 = time.time()
                 builder.package()
+                phases["package"] = time.time() - t2
             except ConanException as exc:
                 self._recorder.package_install_error(package_ref, INSTALL_ERROR_BUILDING,
                                                      str(exc), remote_name=None)
@@ -420,13 +467,13 @@ class ConanInstaller(object):
             else:
                 # Log build
                 self._log_built_package(builder.build_folder, package_ref.copy_clear_rev(),
-                                        time.time() - t1)
+                                        time.time() - t1, phases)
                 # FIXME: Conan 2.0 Clear the registry entry (package ref)
 
-    def _log_built_package(self, build_folder, package_ref, duration):
+    def _log_built_package(self, build_folder, package_ref, duration, phases=None):
         log_file = os.path.join(build_folder, RUN_LOG_NAME)
         log_file = log_file if os.path.exists(log_file) else None
-        log_package_built(package_ref, duration, log_file)
+        log_package_built(package_ref, duration, log_file, phases)
         self._recorder.package_built(package_ref)
 
     @staticmethod
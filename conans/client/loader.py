@@ -3,8 +3,8 @@ import inspect
 import os
 import sys
 import uuid
+from contextlib import contextmanager
 
-from conans.client.generators import registered_generators
 from conans.client.loader_txt import ConanFileTextLoader
 from conans.client.output import ScopedOutput
 from conans.client.tools.files import chdir
@@ -36,11 +36,27 @@ class ConanFileLoader(object):
         self._output = output
         self._python_requires = python_requires
         sys.modules["conans"].python_requires = self._python_requires
+        self._cached_classes = None  # {conanfile_path: ConanFile class}
+
+    @contextmanager
+    def reuse_classes(self):
+        """ The recipes parsed inside are not parsed again, e.g. computing the graphs of several
+        configurations. The recipes mustn't change meanwhile
+        """
+        self._cached_classes = {}
+        try:
+            yield
+        finally:
+            self._cached_classes = None
 
     def load_class(self, conanfile_path):
+        if self._cached_classes is not None and conanfile_path in self._cached_classes:
+            return self._cached_classes[conanfile_path]
         self._python_requires.valid = True
         _, conanfile = parse_conanfile(conanfile_path, self._python_requires)
         self._python_requires.valid = False
+        if self._cached_classes is not None:
+            self._cached_classes[conanfile_path] = conanfile
         return conanfile
 
     def load_name_version(self, conanfile_path, name, version):
@@ -202,6 +218,7 @@ def _parse_module(conanfile_module, module_id):
             else:
                 raise ConanException("More than 1 conanfile in the file")
         elif issubclass(attr, Generator) and attr != Generator:
+            from conans.client.generators import registered_generators
             registered_generators.add(attr.__name__, attr)
 
     if result is None:
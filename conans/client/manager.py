@@ -41,8 +41,11 @@ class ConanManager(object):
         installer = ConanInstaller(self._client_cache, output, self._remote_manager,
                                    recorder=self._recorder, workspace=workspace,
                                    hook_manager=self._hook_manager)
-        installer.install(deps_graph, keep_build=False, graph_info=graph_info)
-        workspace.generate()
+        try:
+            installer.install(deps_graph, keep_build=False, graph_info=graph_info)
+            workspace.generate()
+        finally:
+            installer.release_packages()
 
     def install(self, reference, install_folder, graph_info, remote_name=None, build_modes=None,
                 update=False, manifest_folder=None, manifest_verify=False,
@@ -97,42 +100,46 @@ class ConanManager(object):
         installer = ConanInstaller(self._client_cache, output, self._remote_manager,
                                    recorder=self._recorder, workspace=None,
                                    hook_manager=self._hook_manager)
-        installer.install(deps_graph, keep_build)
+        try:
+            installer.install(deps_graph, keep_build)
 
-        if manifest_folder:
-            manifest_manager = ManifestManager(manifest_folder, user_io=self._user_io,
-                                               client_cache=self._client_cache)
-            for node in deps_graph.nodes:
-                if not node.conan_ref:
-                    continue
-                complete_recipe_sources(self._remote_manager, self._client_cache,
-                                        node.conanfile, node.conan_ref)
-            manifest_manager.check_graph(deps_graph,
-                                         verify=manifest_verify,
-                                         interactive=manifest_interactive)
-            manifest_manager.print_log()
+            if manifest_folder:
+                manifest_manager = ManifestManager(manifest_folder, user_io=self._user_io,
+                                                   client_cache=self._client_cache)
+                for node in deps_graph.nodes:
+                    if not node.conan_ref:
+                        continue
+                    complete_recipe_sources(self._remote_manager, self._client_cache,
+                                            node.conanfile, node.conan_ref)
+                manifest_manager.check_graph(deps_graph,
+                                             verify=manifest_verify,
+                                             interactive=manifest_interactive)
+                manifest_manager.print_log()
 
-        if install_folder:
-            # Write generators
-            if generators is not False:
-                tmp = list(conanfile.generators)  # Add the command line specified generators
-                tmp.extend([g for g in generators if g not in tmp])
-                conanfile.generators = tmp
-                write_generators(conanfile, install_folder, output)
-            if not isinstance(reference, ConanFileReference):
-                # Write conaninfo
-                content = normalize(conanfile.info.dumps())
-                save(os.path.join(install_folder, CONANINFO), content)
-                output.info("Generated %s" % CONANINFO)
-                graph_info.save(install_folder)
-                output.info("Generated graphinfo")
-            if not no_imports:
-                run_imports(conanfile, install_folder, output)
-            call_system_requirements(conanfile, output)
+            if install_folder:
+                # Write generators
+                if generators is not False:
+                    tmp = list(conanfile.generators)  # Add the command line specified generators
+                    tmp.extend([g for g in generators if g not in tmp])
+                    conanfile.generators = tmp
+                    write_generators(conanfile, install_folder, output)
+                if not isinstance(reference, ConanFileReference):
+                    # Write conaninfo
+                    content = normalize(conanfile.info.dumps())
+                    save(os.path.join(install_folder, CONANINFO), content)
+                    output.info("Generated %s" % CONANINFO)
+                    graph_info.save(install_folder)
+                    output.info("Generated graphinfo")
+                if not no_imports:
+                    run_imports(conanfile, install_folder, output)
+                call_system_requirements(conanfile, output)
 
-            if not create_reference and isinstance(reference, ConanFileReference):
-                # The conanfile loaded is a virtual one. The one w deploy is the first level one
-                neighbours = deps_graph.root.neighbors()
-                deploy_conanfile = neighbours[0].conanfile
-                if hasattr(deploy_conanfile, "deploy") and callable(deploy_conanfile.deploy):
-                    run_deploy(deploy_conanfile, install_folder, output)
+                if not create_reference and isinstance(reference, ConanFileReference):
+                    # The conanfile loaded is a virtual one. The one w deploy is the first level one
+                    neighbours = deps_graph.root.neighbors()
+                    deploy_conanfile = neighbours[0].conanfile
+                    if hasattr(deploy_conanfile, "deploy") and callable(deploy_conanfile.deploy):
+                        run_deploy(deploy_conanfile, install_folder, output)
+        finally:
+            installer.release_packages()
+        return conanfile
@@ -33,7 +33,8 @@ class ManifestManager(object):
         export = self._client_cache.export(ref)
         exports_sources_folder = self._client_cache.export_sources(ref)
         read_manifest = FileTreeManifest.load(export)
-        expected_manifest = FileTreeManifest.create(export, exports_sources_folder)
+        expected_manifest = FileTreeManifest.create(export, exports_sources_folder,
+                                                    hashes_cache=self._client_cache.hashes_cache)
         self._check_not_corrupted(ref, read_manifest, expected_manifest)
         folder = self._paths.export(ref)
         self._handle_folder(folder, ref, read_manifest, interactive, node.remote, verify)
@@ -43,7 +44,8 @@ class ManifestManager(object):
         ref = PackageReference(ref, node.conanfile.info.package_id())
         package_folder = self._client_cache.package(ref)
         read_manifest = FileTreeManifest.load(package_folder)
-        expected_manifest = FileTreeManifest.create(package_folder)
+        expected_manifest = FileTreeManifest.create(package_folder,
+                                                    hashes_cache=self._client_cache.hashes_cache)
         self._check_not_corrupted(ref, read_manifest, expected_manifest)
         folder = self._paths.package(ref)
         self._handle_folder(folder, ref, read_manifest, interactive, node.remote, verify)
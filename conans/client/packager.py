@@ -8,7 +8,8 @@ from conans.errors import (ConanException, ConanExceptionInUserConanfileMethod,
                            conanfile_exception_formatter)
 from conans.model.manifest import FileTreeManifest
 from conans.paths import CONANINFO
-from conans.util.files import mkdir, rmdir, save
+from conans.util.env_reader import get_env
+from conans.util.files import FileLinker, mkdir, rmdir, save
 from conans.util.log import logger
 
 
@@ -63,8 +64,12 @@ def create_package(conanfile, pkg_id, source_folder, build_folder, package_folde
         def recipe_has(attribute):
             return attribute in conanfile.__class__.__dict__
 
+        link_files = get_env("CONAN_LINK_COPIED_FILES", False)
+        # The read-only package files can't share the inode with the build (and source) ones
+        linker = FileLinker(hardlink=False) if get_env("CONAN_READ_ONLY_CACHE", False) else None
         if source_folder != build_folder:
-            conanfile.copy = FileCopier(source_folder, package_folder, build_folder)
+            conanfile.copy = FileCopier(source_folder, package_folder, build_folder,
+                                        link_files=link_files, linker=linker)
             with conanfile_exception_formatter(str(conanfile), "package"):
                 with tools.chdir(source_folder):
                     conanfile.package()
@@ -72,7 +77,8 @@ def create_package(conanfile, pkg_id, source_folder, build_folder, package_folde
             if not copy_done and recipe_has("package"):
                 output.warn("No files copied from source folder!")
 
-        conanfile.copy = FileCopier(build_folder, package_folder)
+        conanfile.copy = FileCopier(build_folder, package_folder, link_files=link_files,
+                                    linker=linker)
         with tools.chdir(build_folder):
             with conanfile_exception_formatter(str(conanfile), "package"):
                 conanfile.package()
@@ -1,7 +1,6 @@
 import fnmatch
 from collections import OrderedDict
 
-from conans.client.installer import build_id
 from conans.client.output import Color
 from conans.model.options import OptionsValues
 from conans.model.ref import ConanFileReference, PackageReference
@@ -40,6 +39,7 @@ class Printer(object):
                 self._out.writeln("%s: %s" % (k, str(v)))
 
     def _print_paths(self, ref, conan, path_resolver, show):
+        from conans.client.installer import build_id
         if isinstance(ref, ConanFileReference):
             if show("export_folder"):
                 path = path_resolver.export(ref)
@@ -70,6 +70,7 @@ class Printer(object):
                                        in which case the project itself will not be part
                                        of the printed dependencies.
         """
+        from conans.client.installer import build_id
         if _info is None:  # No filter
             def show(_):
                 return True
@@ -5,15 +5,13 @@ import tarfile
 import time
 import traceback
 
-from requests.exceptions import ConnectionError
-
 from conans.client.cmd.uploader import UPLOAD_POLICY_SKIP
 from conans.client.remote_registry import Remote
 from conans.client.source import merge_directories
 from conans.errors import ConanConnectionError, ConanException, NotFoundException
 from conans.model.manifest import gather_files
 from conans.paths import CONANFILE, CONANINFO, CONAN_MANIFEST, EXPORT_SOURCES_DIR_OLD, \
-    EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME, PACKAGE_TGZ_NAME, rm_conandir
+    EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME, PACKAGE_TGZ_NAME
 from conans.search.search import filter_packages
 from conans.util import progress_bar
 from conans.util.env_reader import get_env
@@ -25,6 +23,9 @@ from conans.util.tracer import (log_compressed_files, log_package_download, log_
                                 log_recipe_download, log_recipe_sources_download, log_recipe_upload,
                                 log_uncompressed_file)
 
+# Number of references requested in each page of the remote recipes searches
+SEARCH_PAGE_SIZE = 500
+
 
 class RemoteManager(object):
     """ Will handle the remotes to get recipes, packages etc """
@@ -41,6 +42,8 @@ class RemoteManager(object):
                                    reference=conan_reference, remote=remote)
 
         t1 = time.time()
+        # The tgz files are written in the export folder, never in a lower store
+        self._client_cache.copy_up_recipe(conan_reference)
         export_folder = self._client_cache.export(conan_reference)
 
         for f in (EXPORT_TGZ_NAME, EXPORT_SOURCES_TGZ_NAME):
@@ -116,6 +119,8 @@ class RemoteManager(object):
                                    package_id=package_reference.package_id,
                                    remote=remote)
         t1 = time.time()
+        self._client_cache.copy_up_recipe(package_reference.conan)
+        self._client_cache.copy_up_package(package_reference)
         # existing package, will use short paths if defined
         package_folder = self._client_cache.package(package_reference, short_paths=None)
 
@@ -197,8 +202,9 @@ class RemoteManager(object):
 
         returns (dict relative_filepath:abs_path , remote_name)"""
         self._hook_manager.execute("pre_download_recipe", reference=conan_reference, remote=remote)
-        dest_folder = self._client_cache.export(conan_reference)
-        rmdir(dest_folder)
+        # A recipe in a lower store is replaced by the downloaded one in the cache
+        dest_folder = self._client_cache.writable_layer.export(conan_reference)
+        self._client_cache.trash.discard(dest_folder)
 
         t1 = time.time()
         tmp = self._call_remote(remote, "get_recipe", conan_reference, dest_folder)
@@ -208,7 +214,7 @@ class RemoteManager(object):
 
         unzip_and_get_files(zipped_files, dest_folder, EXPORT_TGZ_NAME, output=self._output)
         # Make sure that the source dir is deleted
-        rm_conandir(self._client_cache.source(conan_reference))
+        self._client_cache.trash.discard(self._client_cache.source(conan_reference))
         touch_folder(dest_folder)
         conanfile_path = self._client_cache.conanfile(conan_reference)
         self._hook_manager.execute("post_download_recipe", conanfile_path=conanfile_path,
@@ -249,7 +255,7 @@ class RemoteManager(object):
                                    reference=package_reference.conan, package_id=package_id,
                                    remote=remote)
         output.info("Retrieving package %s from remote '%s' " % (package_id, remote.name))
-        rm_conandir(dest_folder)  # Remove first the destination folder
+        self._client_cache.trash.discard(dest_folder)  # Remove first the destination folder
         t1 = time.time()
         try:
             zipped_files, new_ref, rev_time = self._call_remote(remote, "get_package",
@@ -292,7 +298,20 @@ class RemoteManager(object):
         Search exported conans information from remotes
 
         returns (dict str(conan_ref): {packages_info}"""
-        return self._call_remote(remote, "search", pattern, ignorecase)
+        return list(self.iter_search_recipes(remote, pattern, ignorecase))
+
+    def iter_search_recipes(self, remote, pattern=None, ignorecase=True):
+        """ Yields the references found in the remote, requesting the pages of results only when
+        they are consumed, so the callers can stop early
+        """
+        cursor = None
+        while True:
+            references, cursor = self._call_remote(remote, "search_page", pattern, ignorecase,
+                                                   cursor, SEARCH_PAGE_SIZE)
+            for reference in references:
+                yield reference
+            if not cursor or not references:
+                return
 
     def search_packages(self, remote, reference, query):
         packages = self._call_remote(remote, "search_packages", reference, query)
@@ -318,6 +337,7 @@ class RemoteManager(object):
         return self._call_remote(remote, 'authenticate', name, password)
 
     def _call_remote(self, remote, method, *argc, **argv):
+        from requests.exceptions import ConnectionError  # Not imported until it is needed
         assert(isinstance(remote, Remote))
         self._auth_manager.remote = remote
         try:
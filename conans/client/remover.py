@@ -3,7 +3,7 @@ import os
 from conans.client.remote_registry import Remote
 from conans.errors import ConanException
 from conans.model.ref import ConanFileReference, PackageReference
-from conans.paths import SYSTEM_REQS, rm_conandir
+from conans.paths import SYSTEM_REQS
 from conans.search.search import filter_outdated, search_packages, search_recipes
 from conans.util.log import logger
 
@@ -15,7 +15,7 @@ class DiskRemover(object):
     def _remove(self, path, conan_ref, msg=""):
         try:
             logger.debug("REMOVE: folder %s" % path)
-            rm_conandir(path)
+            self._paths.trash.discard(path)
         except OSError:
             error_msg = "Folder busy (open or some file open): %s" % path
             raise ConanException("%s: Unable to remove %s\n\t%s"
@@ -85,7 +85,7 @@ class ConanRemover(object):
 
     def __init__(self, client_cache, remote_manager, user_io):
         self._user_io = user_io
-        self._client_cache = client_cache
+        self._client_cache = client_cache.writable_layer  # Nothing is removed from lower stores
         self._remote_manager = remote_manager
         self._registry = client_cache.registry
 
@@ -167,6 +167,10 @@ class ConanApiAuthManager(object):
     def search(self, pattern, ignorecase):
         return self._rest_client.search(pattern, ignorecase)
 
+    @input_credentials_if_unauthorized
+    def search_page(self, pattern, ignorecase, cursor, limit):
+        return self._rest_client.search_page(pattern, ignorecase, cursor, limit)
+
     @input_credentials_if_unauthorized
     def search_packages(self, reference, query):
         return self._rest_client.search_packages(reference, query)
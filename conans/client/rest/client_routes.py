@@ -1,3 +1,5 @@
+from collections import OrderedDict
+
 from six.moves.urllib.parse import urlencode
 
 from conans.errors import ConanException
@@ -122,16 +124,20 @@ class ClientSearchRouterBuilder(ClientBaseRouterBuilder):
     def __init__(self, base_url):
         super(ClientSearchRouterBuilder, self).__init__(base_url + "/conans")
 
-    def search(self, pattern, ignorecase):
+    def search(self, pattern, ignorecase, cursor=None, limit=None):
         """URL search recipes"""
-        query = ''
+        params = OrderedDict()
         if pattern:
             if isinstance(pattern, ConanFileReference):
                 pattern = pattern.full_repr()
-            params = {"q": pattern}
+            params["q"] = pattern
             if not ignorecase:
                 params["ignorecase"] = "False"
-            query = "?%s" % urlencode(params)
+        if limit:
+            params["limit"] = limit
+            if cursor:
+                params["cursor"] = cursor
+        query = "?%s" % urlencode(params) if params else ""
         return "%s%s" % (self.routes.common_search, query)
 
     def search_packages(self, ref, query=None):
@@ -1,14 +1,16 @@
 import fnmatch
 import os
 import platform
+import threading
 import time
 
-import requests
-
 from conans import __version__ as client_version
 from conans.util.files import save
 from conans.util.tracer import log_client_rest_api_call
 
+_environ_lock = threading.Lock()
+_session_lock = threading.Lock()
+
 
 class ConanRequester(object):
 
@@ -24,7 +26,7 @@ class ConanRequester(object):
         if no_proxy:
             os.environ["NO_PROXY"] = no_proxy
 
-        self._requester = requester
+        self._session = requester
         self._client_cache = client_cache
 
         if not os.path.exists(self._client_cache.cacert_path):
@@ -42,6 +44,18 @@ class ConanRequester(object):
             else:
                 self._client_certificates = client_cache.client_cert_path
 
+    @property
+    def _requester(self):
+        """ Without a given requester, a requests session created in the first request, not
+        to import requests in the commands that don't use the network
+        """
+        if self._session is None:
+            with _session_lock:
+                if self._session is None:
+                    import requests
+                    self._session = requests.Session()
+        return self._session
+
     def _should_skip_proxy(self, url):
 
         for entry in self._no_proxy_match:
@@ -63,9 +77,10 @@ class ConanRequester(object):
             kwargs["timeout"] = self._timeout_seconds
         if not kwargs.get("headers"):
             kwargs["headers"] = {}
+        from requests.utils import default_user_agent
         kwargs["headers"]["User-Agent"] = "Conan/%s (Python %s) %s" % (client_version,
                                                                        platform.python_version(),
-                                                                       requests.utils.default_user_agent())
+                                                                       default_user_agent())
         return kwargs
 
     def get(self, url, **kwargs):
@@ -81,21 +96,32 @@ class ConanRequester(object):
         return self._call_method("post", url, **kwargs)
 
     def _call_method(self, method, url, **kwargs):
-        popped = False
-        if self.proxies or self._no_proxy_match:
+        if not (self.proxies or self._no_proxy_match):
+            return self._call_requester(method, url, **kwargs)
+
+        # The environment is shared by all the threads (concurrent transfers), so the
+        # calls that need to clean it have to be serialized
+        with _environ_lock:
+            popped = False
             old_env = dict(os.environ)
             # Clean the proxies from the environ and use the conan specified proxies
             for var_name in ("http_proxy", "https_proxy", "no_proxy"):
                 popped = popped or os.environ.pop(var_name, None)
                 popped = popped or os.environ.pop(var_name.upper(), None)
-        try:
-            t1 = time.time()
-            all_kwargs = self._add_kwargs(url, kwargs)
-            tmp = getattr(self._requester, method)(url, **all_kwargs)
-            duration = time.time() - t1
-            log_client_rest_api_call(url, method.upper(), duration, all_kwargs.get("headers"))
-            return tmp
-        finally:
-            if popped:
-                os.environ.clear()
-                os.environ.update(old_env)
+            try:
+                return self._call_requester(method, url, **kwargs)
+            finally:
+                if popped:
+                    os.environ.clear()
+                    os.environ.update(old_env)
+
+    def _call_requester(self, method, url, **kwargs):
+        t1 = time.time()
+        all_kwargs = self._add_kwargs(url, kwargs)
+        tmp = getattr(self._requester, method)(url, **all_kwargs)
+        duration = time.time() - t1
+        size = (getattr(tmp, "headers", None) or {}).get("Content-Length")
+        log_client_rest_api_call(url, method.upper(), duration, all_kwargs.get("headers"),
+                                 status=getattr(tmp, "status_code", None),
+                                 size=int(size) if size and size.isdigit() else None)
+        return tmp
@@ -1,8 +1,6 @@
 from collections import defaultdict
 
 from conans import CHECKSUM_DEPLOY, REVISIONS
-from conans.client.rest.rest_client_v1 import RestV1Methods
-from conans.client.rest.rest_client_v2 import RestV2Methods
 from conans.util.env_reader import get_env
 
 
@@ -11,7 +9,7 @@ class RestApiClient(object):
         Rest Api Client for handle remote.
     """
 
-    def __init__(self, output, requester, put_headers=None):
+    def __init__(self, output, requester, put_headers=None, validators_cache=None):
 
         # Set to instance
         self.token = None
@@ -22,27 +20,35 @@ class RestApiClient(object):
         # Remote manager will set it to True or False dynamically depending on the remote
         self.verify_ssl = True
         self._put_headers = put_headers
+        self._validators_cache = validators_cache
 
         self._cached_capabilities = defaultdict(list)
         self.block_v2 = get_env("CONAN_API_V2_BLOCKED", True)
 
     def _get_api(self):
+        # The REST implementations (and requests) are imported only by the commands using them
+        from conans.client.rest.rest_client_v1 import RestV1Methods
+        from conans.client.rest.rest_client_v2 import RestV2Methods
+
         if self.remote_url not in self._cached_capabilities:
             tmp = RestV1Methods(self.remote_url, self.token, self.custom_headers, self._output,
-                                self.requester, self.verify_ssl, self._put_headers)
+                                self.requester, self.verify_ssl, self._put_headers,
+                                self._validators_cache)
             _, _, cap = tmp.server_info()
             self._cached_capabilities[self.remote_url] = cap
 
         if not self.block_v2 and REVISIONS in self._cached_capabilities[self.remote_url]:
             checksum_deploy = CHECKSUM_DEPLOY in self._cached_capabilities[self.remote_url]
             revisions_enabled = get_env("CONAN_CLIENT_REVISIONS_ENABLED", False)
+            parallel_transfers = get_env("CONAN_PARALLEL_TRANSFERS", 4)
             self.custom_headers["V2_COMPATIBILITY_MODE"] = "1" if not revisions_enabled else "0"
             return RestV2Methods(self.remote_url, self.token, self.custom_headers, self._output,
                                  self.requester, self.verify_ssl, self._put_headers,
-                                 checksum_deploy)
+                                 checksum_deploy, parallel_transfers, self._validators_cache)
         else:
             return RestV1Methods(self.remote_url, self.token, self.custom_headers, self._output,
-                                 self.requester, self.verify_ssl, self._put_headers)
+                                 self.requester, self.verify_ssl, self._put_headers,
+                                 self._validators_cache)
 
     def get_conan_manifest(self, conan_reference):
         return self._get_api().get_conan_manifest(conan_reference)
@@ -82,6 +88,9 @@ class RestApiClient(object):
     def search(self, pattern=None, ignorecase=True):
         return self._get_api().search(pattern, ignorecase)
 
+    def search_page(self, pattern=None, ignorecase=True, cursor=None, limit=None):
+        return self._get_api().search_page(pattern, ignorecase, cursor, limit)
+
     def search_packages(self, reference, query):
         return self._get_api().search_packages(reference, query)
 
@@ -75,7 +75,7 @@ def handle_return_deserializer(deserializer=None):
 class RestCommonMethods(object):
 
     def __init__(self, remote_url, token, custom_headers, output, requester, verify_ssl,
-                 put_headers=None):
+                 put_headers=None, validators_cache=None):
 
         self.token = token
         self.remote_url = remote_url
@@ -84,6 +84,7 @@ class RestCommonMethods(object):
         self.requester = requester
         self.verify_ssl = verify_ssl
         self._put_headers = put_headers
+        self._validators_cache = validators_cache
 
     @property
     def auth(self):
@@ -269,6 +270,15 @@ class RestCommonMethods(object):
         response = self.get_json(url)["results"]
         return [ConanFileReference.loads(ref) for ref in response]
 
+    def search_page(self, pattern=None, ignorecase=True, cursor=None, limit=None):
+        """ Returns the (references, next_cursor) of a page of the recipes search. The servers
+        without paginated search return all the references and a None cursor
+        """
+        url = self.search_router.search(pattern, ignorecase, cursor, limit)
+        response = self.get_json(url)
+        references = [ConanFileReference.loads(ref) for ref in response["results"]]
+        return references, response.get("next")
+
     def search_packages(self, reference, query):
 
         if not query:
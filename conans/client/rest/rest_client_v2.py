@@ -6,7 +6,8 @@ from conans.client.remote_manager import check_compressed_files
 from conans.client.rest.client_routes import ClientV2ConanRouterBuilder
 from conans.client.rest.rest_client_common import RestCommonMethods
 from conans.client.rest.uploader_downloader import Downloader, Uploader
-from conans.errors import ConanException, NotFoundException
+from conans.errors import AuthenticationException, ConanException, ForbiddenException, \
+    NotFoundException
 from conans.model.info import ConanInfo
 from conans.model.manifest import FileTreeManifest
 from conans.model.ref import PackageReference, ConanFileReference
@@ -14,16 +15,19 @@ from conans.paths import EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME, \
     PACKAGE_TGZ_NAME
 from conans.util.files import decode_text
 from conans.util.log import logger
+from conans.util.parallel import run_in_parallel
 
 
 class RestV2Methods(RestCommonMethods):
 
     def __init__(self, remote_url, token, custom_headers, output, requester, verify_ssl,
-                 put_headers=None, checksum_deploy=False):
+                 put_headers=None, checksum_deploy=False, parallel_transfers=1,
+                 validators_cache=None):
 
         super(RestV2Methods, self).__init__(remote_url, token, custom_headers, output, requester,
-                                            verify_ssl, put_headers)
+                                            verify_ssl, put_headers, validators_cache)
         self._checksum_deploy = checksum_deploy
+        self._parallel_transfers = parallel_transfers
 
     @property
     def remote_api_url(self):
@@ -39,8 +43,10 @@ class RestV2Methods(RestCommonMethods):
         data["files"] = list(data["files"].keys())
         return data
 
-    def _get_remote_file_contents(self, url):
-        downloader = Downloader(self.requester, self._output, self.verify_ssl)
+    def _get_remote_file_contents(self, url, use_validators=False):
+        validators_cache = self._validators_cache if use_validators else None
+        downloader = Downloader(self.requester, self._output, self.verify_ssl,
+                                validators_cache=validators_cache)
         contents = downloader.download(url, auth=self.auth)
         return contents
 
@@ -72,17 +78,17 @@ class RestV2Methods(RestCommonMethods):
 
     def get_conan_manifest(self, conan_reference):
         url = self.conans_router.recipe_manifest(conan_reference)
-        content = self._get_remote_file_contents(url)
+        content = self._get_remote_file_contents(url, use_validators=True)
         return FileTreeManifest.loads(decode_text(content))
 
     def get_package_manifest(self, package_reference):
         url = self.conans_router.package_manifest(package_reference)
-        content = self._get_remote_file_contents(url)
+        content = self._get_remote_file_contents(url, use_validators=True)
         return FileTreeManifest.loads(decode_text(content))
 
     def get_package_info(self, package_reference):
         url = self.conans_router.package_info(package_reference)
-        content = self._get_remote_file_contents(url)
+        content = self._get_remote_file_contents(url, use_validators=True)
         return ConanInfo.loads(decode_text(content))
 
     def get_recipe(self, conan_reference, dest_folder):
@@ -187,27 +193,34 @@ class RestV2Methods(RestCommonMethods):
 
     def _upload_files(self, files, urls, retry, retry_wait):
         t1 = time.time()
-        failed = []
-        uploader = Uploader(self.requester, self._output, self.verify_ssl)
+        parallel = self._parallel_transfers > 1 and len(files) > 1
+        # Progress bars of concurrent transfers would be mixed, only the file names are printed
+        uploader = Uploader(self.requester, self._output if not parallel else None,
+                            self.verify_ssl)
         # Take advantage of filenames ordering, so that conan_package.tgz and conan_export.tgz
         # can be < conanfile, conaninfo, and sent always the last, so smaller files go first
-        for filename in sorted(files, reverse=True):
-            self._output.rewrite_line("Uploading %s" % filename)
-            resource_url = urls[filename]
-            try:
-                response = uploader.upload(resource_url, files[filename], auth=self.auth,
-                                           dedup=self._checksum_deploy, retry=retry,
-                                           retry_wait=retry_wait,
-                                           headers=self._put_headers)
+        filenames = sorted(files, reverse=True)
+
+        def upload_file(filename):
+            if not parallel:
+                self._output.rewrite_line("Uploading %s" % filename)
+            response = uploader.upload(urls[filename], files[filename], auth=self.auth,
+                                       dedup=self._checksum_deploy, retry=retry,
+                                       retry_wait=retry_wait, headers=self._put_headers)
+            if not parallel:
                 self._output.writeln("")
-                if not response.ok:
-                    self._output.error("\nError uploading file: %s, '%s'" % (filename,
-                                                                             response.content))
-                    failed.append(filename)
-                else:
-                    pass
-            except Exception as exc:
-                self._output.error("\nError uploading file: %s, '%s'" % (filename, exc))
+            if not response.ok:
+                raise ConanException(response.content)
+
+        if parallel:
+            for filename in filenames:
+                self._output.writeln("Uploading %s" % filename)
+
+        results = run_in_parallel(upload_file, filenames, self._parallel_transfers)
+        failed = []
+        for filename, result in zip(filenames, results):
+            if isinstance(result, Exception):
+                self._output.error("\nError uploading file: %s, '%s'" % (filename, result))
                 failed.append(filename)
 
         if failed:
@@ -217,15 +230,42 @@ class RestV2Methods(RestCommonMethods):
             logger.debug("\nUPLOAD: All uploaded! Total time: %s\n" % str(time.time() - t1))
 
     def _download_and_save_files(self, urls, dest_folder, files):
-        downloader = Downloader(self.requester, self._output, self.verify_ssl)
+        parallel = self._parallel_transfers > 1 and len(files) > 1
+        # Progress bars of concurrent transfers would be mixed, only the file names are printed
+        downloader = Downloader(self.requester, self._output if not parallel else None,
+                                self.verify_ssl)
         # Take advantage of filenames ordering, so that conan_package.tgz and conan_export.tgz
         # can be < conanfile, conaninfo, and sent always the last, so smaller files go first
-        for filename in sorted(files, reverse=True):
-            if self._output:
+        filenames = sorted(files, reverse=True)
+        if parallel and self._output:
+            for filename in filenames:
+                self._output.writeln("Downloading %s" % filename)
+
+        def download_file(filename):
+            queue_wait = time.time() - queued if parallel else None
+            if not parallel and self._output:
                 self._output.writeln("Downloading %s" % filename)
-            resource_url = urls[filename]
             abs_path = os.path.join(dest_folder, filename)
-            downloader.download(resource_url, abs_path, auth=self.auth)
+            downloader.download(urls[filename], abs_path, auth=self.auth, queue_wait=queue_wait)
+
+        queued = time.time()
+        results = run_in_parallel(download_file, filenames, self._parallel_transfers,
+                                  fail_fast=True)
+        failed = [(filename, result) for filename, result in zip(filenames, results)
+                  if isinstance(result, Exception)]
+        if len(failed) == 1:
+            # Keep the original exception, NotFound and Authentication errors are managed upstream
+            raise failed[0][1]
+        elif failed:
+            for filename, exc in failed:
+                if isinstance(exc, (AuthenticationException, ForbiddenException)):
+                    raise exc
+            if all(isinstance(exc, NotFoundException) for _, exc in failed):
+                raise failed[0][1]
+            raise ConanException("Error downloading files: %s\n%s"
+                                 % (", ".join(filename for filename, _ in failed),
+                                    "\n".join("%s: %s" % (filename, exc)
+                                               for filename, exc in failed)))
 
     def _remove_conanfile_files(self, conan_reference, files):
         # V2 === revisions, do not remove files, it will create a new revision if the files changed
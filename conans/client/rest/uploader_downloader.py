@@ -29,13 +29,14 @@ class Uploader(object):
                 return response
 
         headers = headers or {}
-        self.output.info("")
         # Actual transfer of the real content
         it = load_in_chunks(abs_path, self.chunk_size)
         # Now it is a chunked read file
         file_size = os.stat(abs_path).st_size
-        it = upload_with_progress(file_size, it, self.chunk_size, self.output)
-        # Now it will print progress in each iteration
+        if self.output:
+            self.output.info("")
+            it = upload_with_progress(file_size, it, self.chunk_size, self.output)
+            # Now it will print progress in each iteration
         iterable_to_file = IterableToFileAdapter(it, file_size)
         # Now it is prepared to work with request
         ret = call_with_retry(self.output, retry, retry_wait, self._upload_file, url,
@@ -109,14 +110,16 @@ def load_in_chunks(path, chunk_size=1024):
 
 class Downloader(object):
 
-    def __init__(self, requester, output, verify, chunk_size=1000):
+    def __init__(self, requester, output, verify, chunk_size=1000, validators_cache=None):
         self.chunk_size = chunk_size
         self.output = output
         self.requester = requester
         self.verify = verify
+        # The downloads in memory are requested with the cached ETag, if any
+        self.validators_cache = validators_cache
 
     def download(self, url, file_path=None, auth=None, retry=3, retry_wait=0, overwrite=False,
-                 headers=None):
+                 headers=None, queue_wait=None):
 
         if file_path and not os.path.isabs(file_path):
             file_path = os.path.abspath(file_path)
@@ -131,17 +134,29 @@ class Downloader(object):
                 raise ConanException("Error, the file to download already exists: '%s'" % file_path)
 
         return call_with_retry(self.output, retry, retry_wait, self._download_file, url, auth,
-                               headers, file_path)
+                               headers, file_path, queue_wait)
 
-    def _download_file(self, url, auth, headers, file_path):
+    def _download_file(self, url, auth, headers, file_path, queue_wait=None):
         t1 = time.time()
 
+        validators_cache = self.validators_cache if not file_path else None
+        cached = validators_cache.get(url) if validators_cache is not None else None
+        if cached:
+            headers = dict(headers or {})
+            headers["If-None-Match"] = cached[0]
+
         try:
             response = self.requester.get(url, stream=True, verify=self.verify, auth=auth,
                                           headers=headers)
         except Exception as exc:
             raise ConanException("Error downloading file %s: '%s'" % (url, exception_message_safe(exc)))
 
+        if cached and response.status_code == 304:
+            logger.debug("DOWNLOAD: %s not modified" % url)
+            validators_cache.touch(url)
+            log_download(url, time.time() - t1, len(cached[1]), queue_wait)
+            return cached[1]
+
         if not response.ok:
             if response.status_code == 404:
                 raise NotFoundException("Not found: %s" % url)
@@ -153,7 +168,11 @@ class Downloader(object):
             logger.debug("DOWNLOAD: %s" % url)
             data = self._download_data(response, file_path)
             duration = time.time() - t1
-            log_download(url, duration)
+            size = os.path.getsize(file_path) if file_path else len(data)
+            log_download(url, duration, size, queue_wait)
+            etag = response.headers.get("ETag")
+            if validators_cache is not None and etag and not etag.startswith("W/"):
+                validators_cache.set(url, etag, data)
             return data
         except Exception as e:
             logger.debug(e.__class__)
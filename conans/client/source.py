@@ -32,6 +32,9 @@ def complete_recipe_sources(remote_manager, client_cache, conanfile, conan_refer
         raise ConanException("Error while trying to get recipe sources for %s. "
                              "No remote defined" % str(conan_reference))
 
+    # The sources of a recipe of a lower store are downloaded in a copy of it
+    client_cache.copy_up_recipe(conan_reference)
+    sources_folder = client_cache.export_sources(conan_reference, conanfile.short_paths)
     export_path = client_cache.export(conan_reference)
     remote_manager.get_recipe_sources(conan_reference, export_path, sources_folder,
                                       current_remote)
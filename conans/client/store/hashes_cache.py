@@ -0,0 +1,88 @@
+import os
+import sqlite3
+import time
+
+from conans.util.files import md5sums
+from conans.util.log import logger
+
+HASHES_TABLE = "file_hashes"
+
+# Files modified this recently are not stored, they could be modified again within the
+# timestamp resolution of the filesystem without changing their stat
+_RACY_INTERVAL = 2
+
+
+def _stat_key(file_path):
+    st = os.stat(file_path)
+    mtime_ns = getattr(st, "st_mtime_ns", None) or int(st.st_mtime * 1e9)
+    ctime_ns = getattr(st, "st_ctime_ns", None) or int(st.st_ctime * 1e9)
+    return st.st_size, mtime_ns, ctime_ns, st.st_ino
+
+
+class HashesCache(object):
+    """ Persistent cache of the md5 of the files, keyed by their path and stat (size, mtime,
+    ctime and inode), so the manifests of unchanged folders are computed without reading the
+    files again. Any error accessing the database falls back to compute all the hashes.
+    """
+
+    def __init__(self, dbfile):
+        self.dbfile = dbfile
+
+    def _connect(self):
+        connection = sqlite3.connect(self.dbfile, timeout=10)
+        connection.text_factory = str
+        connection.execute("create table if not exists %s (path TEXT PRIMARY KEY, size INTEGER, "
+                           "mtime INTEGER, ctime INTEGER, inode INTEGER, md5 TEXT)"
+                           % HASHES_TABLE)
+        return connection
+
+    def md5sums(self, folder, file_paths):
+        """ Returns a {file_path: md5} of the files, all of them inside folder. The cached
+        entries of folder that no longer exist are removed
+        """
+        keys = {file_path: _stat_key(file_path) for file_path in file_paths}
+        # All the entries of the folder, by range of the primary key
+        prefix = os.path.join(folder, "")
+        prefix_end = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        try:
+            connection = self._connect()
+        except sqlite3.Error as e:
+            logger.debug("HASHES: Not using the hashes cache %s: %s" % (self.dbfile, str(e)))
+            return md5sums(file_paths)
+
+        try:
+            rows = connection.execute("select path, size, mtime, ctime, inode, md5 from %s "
+                                      "where path >= ? and path < ?" % HASHES_TABLE,
+                                      (prefix, prefix_end)).fetchall()
+            cached = {row[0]: (tuple(row[1:5]), row[5]) for row in rows}
+
+            result = {}
+            missing = []
+            for file_path, key in keys.items():
+                entry = cached.get(file_path)
+                if entry and entry[0] == key:
+                    result[file_path] = entry[1]
+                else:
+                    missing.append(file_path)
+            computed = md5sums(missing)
+            result.update(computed)
+
+            limit = (time.time() - _RACY_INTERVAL) * 1e9
+            new_entries = [(file_path, ) + keys[file_path] + (md5, )
+                           for file_path, md5 in computed.items()
+                           if max(keys[file_path][1], keys[file_path][2]) < limit]
+            removed = [(file_path, ) for file_path in cached if file_path not in keys]
+            if new_entries or removed:
+                with connection:
+                    connection.executemany("insert or replace into %s values (?, ?, ?, ?, ?, ?)"
+                                           % HASHES_TABLE, new_entries)
+                    connection.executemany("delete from %s where path = ?" % HASHES_TABLE,
+                                           removed)
+            logger.debug("HASHES: %s: %d cached, %d computed"
+                         % (folder, len(result) - len(computed), len(computed)))
+            return result
+        except sqlite3.Error as e:
+            logger.debug("HASHES: Error using the hashes cache %s: %s" % (self.dbfile, str(e)))
+            return md5sums(file_paths)
+        finally:
+            connection.close()
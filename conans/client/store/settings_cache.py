@@ -0,0 +1,57 @@
+import hashlib
+import os
+import pickle
+import sys
+import uuid
+
+from conans.util.log import logger
+
+# Change it if the format of the cached definition changes
+_CACHE_VERSION = 1
+
+
+class SettingsCache(object):
+    """ Persistent cache of the parsed settings.yml, keyed by the sha1 of its contents, so the
+    commands don't parse the YAML each time. Unpickling the definition is two orders of
+    magnitude faster than parsing it. Any error reading or writing the cache just parses the
+    file.
+    """
+
+    def __init__(self, cache_file):
+        self.cache_file = cache_file
+
+    def load(self, text):
+        """ Returns the definition {setting: values} of the settings.yml text
+        """
+        key = _CACHE_VERSION, sys.version_info[0], hashlib.sha1(text.encode("utf-8")).hexdigest()
+        try:
+            with open(self.cache_file, "rb") as handle:
+                cached_key, definition = pickle.load(handle)
+            if cached_key == key:
+                return definition
+        except Exception as e:  # Missing or corrupted, unpickling can raise almost anything
+            logger.debug("SETTINGS: Not using the settings cache %s: %s"
+                         % (self.cache_file, str(e)))
+
+        import yaml
+        definition = yaml.load(text) or {}
+        self._save(key, definition)
+        return definition
+
+    def _save(self, key, definition):
+        tmp = "%s.%s" % (self.cache_file, uuid.uuid4().hex)
+        try:
+            with open(tmp, "wb") as handle:
+                pickle.dump((key, definition), handle, protocol=2)
+            try:
+                os.rename(tmp, self.cache_file)
+            except OSError:  # Windows doesn't replace existing files
+                os.remove(self.cache_file)
+                os.rename(tmp, self.cache_file)
+        except (IOError, OSError, pickle.PicklingError) as e:
+            logger.debug("SETTINGS: Cannot save the settings cache %s: %s"
+                         % (self.cache_file, str(e)))
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
@@ -0,0 +1,78 @@
+import os
+import threading
+import uuid
+
+from conans.paths import rm_conandir
+from conans.util.files import mkdir, rmdir
+from conans.util.log import logger
+from conans.util.windows import CONAN_LINK
+
+# {trash folder: if more folders were discarded while its thread empties it}
+_emptying = {}
+_emptying_lock = threading.Lock()
+
+
+class Trash(object):
+    """ Deferred removal of the folders of the cache. They are renamed into the trash folder,
+    next to the store so it is a fast and atomic rename, and removed by a background thread.
+    The folders not removed when the process exits are removed by the next conan command.
+    """
+
+    def __init__(self, folder):
+        self.folder = folder
+
+    def discard(self, path):
+        """ Removes the folder, in background if it can be moved to the trash """
+        if not os.path.exists(path):
+            return
+        if os.path.exists(os.path.join(path, CONAN_LINK)):  # The short path is somewhere else
+            rm_conandir(path)
+            return
+        try:
+            mkdir(self.folder)
+            os.rename(path, os.path.join(self.folder, uuid.uuid4().hex))
+        except OSError as e:  # Other filesystem, or files open in Windows
+            logger.debug("TRASH: Cannot move %s to the trash: %s" % (path, str(e)))
+            rm_conandir(path)
+            return
+        self.empty(wait=False)
+
+    def _entries(self):
+        try:
+            return os.listdir(self.folder)
+        except OSError:
+            return []
+
+    def _remove_entries(self):
+        for entry in self._entries():
+            try:
+                rmdir(os.path.join(self.folder, entry))
+            except OSError as e:  # Files open in Windows, try again next time
+                logger.debug("TRASH: Cannot remove %s: %s" % (entry, str(e)))
+
+    def _empty_in_background(self):
+        while True:
+            self._remove_entries()
+            with _emptying_lock:
+                if not _emptying[self.folder]:
+                    del _emptying[self.folder]
+                    return
+                _emptying[self.folder] = False
+
+    def empty(self, wait=True):
+        """ Removes the discarded folders, in a background thread if not waiting. Other conan
+        processes could be removing them too
+        """
+        if wait:
+            self._remove_entries()
+            return
+        with _emptying_lock:
+            if self.folder in _emptying:
+                _emptying[self.folder] = True
+                return
+            if not self._entries():
+                return
+            _emptying[self.folder] = False
+        thread = threading.Thread(target=self._empty_in_background, name="conan-trash")
+        thread.daemon = True  # The remaining folders are removed by the next command
+        thread.start()
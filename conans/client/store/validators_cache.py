@@ -0,0 +1,83 @@
+import sqlite3
+import time
+
+from six.moves.urllib.parse import urlsplit, urlunsplit
+
+from conans.util.log import logger
+
+VALIDATORS_TABLE = "validators"
+# The entries are small files (manifests and conaninfo), the least recently used ones are
+# removed over this number
+_MAX_ENTRIES = 5000
+
+
+def _cache_key(url):
+    # Without the query, the v1 download urls are signed with a different token each time
+    tokens = urlsplit(url)
+    return urlunsplit((tokens.scheme, tokens.netloc, tokens.path, "", ""))
+
+
+class ValidatorsCache(object):
+    """ Persistent cache of the ETag and contents of the small files downloaded from the
+    remotes, so they can be requested with "If-None-Match" and not transferred again while they
+    don't change. Any error accessing the database just downloads the files again.
+    """
+
+    def __init__(self, dbfile, max_entries=_MAX_ENTRIES):
+        self.dbfile = dbfile
+        self._max_entries = max_entries
+
+    def _connect(self):
+        connection = sqlite3.connect(self.dbfile, timeout=10)
+        connection.text_factory = str
+        connection.execute("create table if not exists %s (url TEXT PRIMARY KEY, etag TEXT, "
+                           "contents BLOB, used REAL)" % VALIDATORS_TABLE)
+        return connection
+
+    def get(self, url):
+        """ Returns the (etag, contents) of the url, or None """
+        try:
+            connection = self._connect()
+        except sqlite3.Error as e:
+            logger.debug("VALIDATORS: Not using the validators cache %s: %s"
+                         % (self.dbfile, str(e)))
+            return None
+        try:
+            row = connection.execute("select etag, contents from %s where url = ?"
+                                     % VALIDATORS_TABLE, (_cache_key(url), )).fetchone()
+            return (row[0], bytes(row[1])) if row else None
+        except sqlite3.Error as e:
+            logger.debug("VALIDATORS: Error reading the validators cache %s: %s"
+                         % (self.dbfile, str(e)))
+            return None
+        finally:
+            connection.close()
+
+    def touch(self, url):
+        self._write("update %s set used = ? where url = ?" % VALIDATORS_TABLE,
+                    (time.time(), _cache_key(url)))
+
+    def set(self, url, etag, contents):
+        self._write("insert or replace into %s values (?, ?, ?, ?)" % VALIDATORS_TABLE,
+                    (_cache_key(url), etag, sqlite3.Binary(bytes(contents)), time.time()),
+                    prune=True)
+
+    def _write(self, statement, parameters, prune=False):
+        try:
+            connection = self._connect()
+        except sqlite3.Error as e:
+            logger.debug("VALIDATORS: Not using the validators cache %s: %s"
+                         % (self.dbfile, str(e)))
+            return
+        try:
+            with connection:
+                connection.execute(statement, parameters)
+                if prune:
+                    connection.execute("delete from {0} where url not in (select url from {0} "
+                                       "order by used desc limit ?)".format(VALIDATORS_TABLE),
+                                       (self._max_entries, ))
+        except sqlite3.Error as e:
+            logger.debug("VALIDATORS: Error writing the validators cache %s: %s"
+                         % (self.dbfile, str(e)))
+        finally:
+            connection.close()
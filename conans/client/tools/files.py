@@ -6,13 +6,12 @@ from contextlib import contextmanager
 from fnmatch import fnmatch
 
 import six
-from patch import fromfile, fromstring
 
 from conans.client.output import ConanOutput
 from conans.errors import ConanException
 from conans.unicode import get_cwd
 from conans.util.fallbacks import default_output
-from conans.util.files import (_generic_algorithm_sum, load, save)
+from conans.util.files import (_generic_algorithm_sum, break_hardlink, load, save)
 
 UNIT_SIZE = 1000.0
 
@@ -165,6 +164,7 @@ def check_sha256(file_path, signature):
 def patch(base_path=None, patch_file=None, patch_string=None, strip=0, output=None):
     """Applies a diff from file (patch_file)  or string (patch_string)
     in base_path directory or current dir if None"""
+    from patch import fromfile, fromstring
 
     class PatchLogHandler(logging.Handler):
         def __init__(self):
@@ -238,6 +238,7 @@ def replace_in_file(file_path, search, replace, strict=True, output=None):
         _manage_text_not_found(search, file_path, strict, "replace_in_file", output=output)
     content = content.replace(search, replace)
     content = content.encode("utf-8")
+    break_hardlink(file_path)
     with open(file_path, "wb") as handle:
         handle.write(content)
 
@@ -264,6 +265,7 @@ def replace_path_in_file(file_path, search, replace, strict=True, windows_paths=
         index = normalized_content.find(normalized_search)
 
     content = content.encode("utf-8")
+    break_hardlink(file_path)
     with open(file_path, "wb") as handle:
         handle.write(content)
 
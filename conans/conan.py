@@ -1,9 +1,14 @@
 import sys
 
-from conans.client.command import main
-
 
 def run():
+    # Forwarded to the conan daemon if it is running, without importing the conan client
+    from conans.client.daemon import forward_command
+    exit_code = forward_command(sys.argv[1:])
+    if exit_code is not None:
+        sys.exit(exit_code)
+
+    from conans.client.command import main
     main(sys.argv[1:])
 
 
@@ -0,0 +1,28 @@
+import argparse
+import sys
+
+from conans.client.daemon import ConanDaemon, stop_daemon
+from conans.paths import get_conan_user_home
+
+
+def run():
+    parser = argparse.ArgumentParser(description='Launch a daemon running the conan commands of '
+                                                 'the conan user home, not to start a new '
+                                                 'process for each command')
+    parser.add_argument('--stop', default=False, action='store_true',
+                        help='Stop the running daemon')
+    parser.add_argument('--idle-timeout', type=float, default=None,
+                        help='Seconds without commands to stop the daemon, by default it runs '
+                             'until stopped')
+    args = parser.parse_args()
+    if args.stop:
+        if not stop_daemon():
+            sys.stderr.write("The conan daemon is not running\n")
+            sys.exit(1)
+        return
+    daemon = ConanDaemon(get_conan_user_home(), idle_timeout=args.idle_timeout)
+    daemon.serve()
+
+
+if __name__ == '__main__':
+    run()
@@ -5,7 +5,7 @@ import time
 
 from conans.errors import ConanException
 from conans.paths import CONAN_MANIFEST, EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME, PACKAGE_TGZ_NAME
-from conans.util.files import load, md5, md5sum, save, walk
+from conans.util.files import load, md5, md5sums, save, walk
 
 
 def discarded_file(filename):
@@ -38,6 +38,16 @@ def gather_files(folder):
     return file_dict, symlinks
 
 
+def _files_md5(folder, files, hashes_cache):
+    """ files is a {name: abs_path} dict, returns a {name: md5} dict
+    """
+    if hashes_cache is not None:
+        sums = hashes_cache.md5sums(folder, files.values())
+    else:
+        sums = md5sums(files.values())
+    return {name: sums[filepath] for name, filepath in files.items()}
+
+
 class FileTreeManifest(object):
 
     def __init__(self, the_time, file_sums):
@@ -100,22 +110,22 @@ class FileTreeManifest(object):
         save(path, repr(self))
 
     @classmethod
-    def create(cls, folder, exports_sources_folder=None):
+    def create(cls, folder, exports_sources_folder=None, hashes_cache=None):
         """ Walks a folder and create a FileTreeManifest for it, reading file contents
         from disk, and capturing current time
+        :param hashes_cache: optional HashesCache, to avoid reading the unchanged files again
         """
         files, _ = gather_files(folder)
         for f in (PACKAGE_TGZ_NAME, EXPORT_TGZ_NAME, CONAN_MANIFEST, EXPORT_SOURCES_TGZ_NAME):
             files.pop(f, None)
 
-        file_dict = {}
-        for name, filepath in files.items():
-            file_dict[name] = md5sum(filepath)
+        file_dict = _files_md5(folder, files, hashes_cache)
 
         if exports_sources_folder:
             export_files, _ = gather_files(exports_sources_folder)
-            for name, filepath in export_files.items():
-                file_dict["export_source/%s" % name] = md5sum(filepath)
+            export_sums = _files_md5(exports_sources_folder, export_files, hashes_cache)
+            for name, file_md5 in export_sums.items():
+                file_dict["export_source/%s" % name] = file_md5
 
         date = calendar.timegm(time.gmtime())
 
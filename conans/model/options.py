@@ -2,7 +2,6 @@
 import fnmatch
 
 import six
-import yaml
 
 from conans.errors import ConanException
 from conans.util.sha import sha1
@@ -367,6 +366,7 @@ class PackageOptions(object):
 
     @staticmethod
     def loads(text):
+        import yaml
         return PackageOptions(yaml.load(text) or {})
 
     def get_safe(self, field):
@@ -1,5 +1,3 @@
-import yaml
-
 from conans.errors import ConanException
 from conans.model.values import Values
 
@@ -34,6 +32,7 @@ class SettingsItem(object):
     def __init__(self, definition, name):
         self._name = name  # settings.compiler
         self._value = None  # gcc
+        self._shared = set()  # children shared with copies, copied before modifying them
         if isinstance(definition, dict):
             self._definition = {}
             # recursive
@@ -50,16 +49,28 @@ class SettingsItem(object):
         return value in (self._value or "")
 
     def copy(self):
-        """ deepcopy, recursive
+        """ copy-on-write, the children are shared until one of the copies modifies them
         """
         result = SettingsItem({}, name=self._name)
         result._value = self._value
         if self.is_final:
             result._definition = self._definition[:]
         else:
-            result._definition = {k: v.copy() for k, v in self._definition.items()}
+            result._definition = self._definition.copy()
+            self._shared = set(self._definition)
+            result._shared = set(self._definition)
         return result
 
+    def _child(self, value):
+        """ the child Settings of the value, copied first if shared with other copies
+        """
+        child = self._definition[value]
+        if value in self._shared:
+            child = child.copy()
+            self._definition[value] = child
+            self._shared.discard(value)
+        return child
+
     def copy_values(self):
         if self._value is None and "None" not in self._definition:
             return None
@@ -114,6 +125,7 @@ class SettingsItem(object):
             v = str(v)
             if isinstance(self._definition, dict):
                 self._definition.pop(v, None)
+                self._shared.discard(v)
             elif self._definition != "ANY":
                 if v in self._definition:
                     self._definition.remove(v)
@@ -125,7 +137,7 @@ class SettingsItem(object):
             raise undefined_field(self._name, item, None, self._value)
         if self._value is None:
             raise undefined_value(self._name)
-        return self._definition[self._value]
+        return self._child(self._value)
 
     def __getattr__(self, item):
         item = str(item)
@@ -143,7 +155,7 @@ class SettingsItem(object):
     def __getitem__(self, value):
         value = str(value)
         try:
-            return self._definition[value]
+            return self._child(value)
         except:
             raise ConanException(bad_value_msg(self._name, value, self.values_range))
 
@@ -193,6 +205,7 @@ class Settings(object):
         definition = definition or {}
         self._name = name  # settings, settings.compiler
         self._parent_value = parent_value  # gcc, x86
+        self._shared = set()  # fields shared with copies, copied before modifying them
         self._data = {str(k): SettingsItem(v, "%s.%s" % (name, k))
                       for k, v in definition.items()}
 
@@ -208,11 +221,13 @@ class Settings(object):
         return None
 
     def copy(self):
-        """ deepcopy, recursive
+        """ copy-on-write, the fields are shared until one of the copies modifies them, so
+        copying is O(fields) and only the modified paths are copied later
         """
         result = Settings({}, name=self._name, parent_value=self._parent_value)
-        for k, v in self._data.items():
-            result._data[k] = v.copy()
+        result._data = self._data.copy()
+        self._shared = set(self._data)
+        result._shared = set(self._data)
         return result
 
     def copy_values(self):
@@ -227,6 +242,7 @@ class Settings(object):
 
     @staticmethod
     def loads(text):
+        import yaml
         return Settings(yaml.load(text) or {})
 
     def validate(self):
@@ -244,30 +260,43 @@ class Settings(object):
         for it in item:
             it = str(it)
             self._data.pop(it, None)
+            self._shared.discard(it)
 
     def clear(self):
         self._data = {}
+        self._shared = set()
 
     def _check_field(self, field):
         if field not in self._data:
             raise undefined_field(self._name, field, self.fields, self._parent_value)
 
+    def _item(self, field):
+        """ the SettingsItem of the field, copied first if shared with other copies
+        """
+        item = self._data[field]
+        if field in self._shared:
+            item = item.copy()
+            self._data[field] = item
+            self._shared.discard(field)
+        return item
+
     def __getattr__(self, field):
         assert field[0] != "_", "ERROR %s" % field
         self._check_field(field)
-        return self._data[field]
+        return self._item(field)
 
     def __delattr__(self, field):
         assert field[0] != "_", "ERROR %s" % field
         self._check_field(field)
         del self._data[field]
+        self._shared.discard(field)
 
     def __setattr__(self, field, value):
         if field[0] == "_" or field.startswith("values"):
             return super(Settings, self).__setattr__(field, value)
 
         self._check_field(field)
-        self._data[field].value = value
+        self._item(field).value = value
 
     @property
     def values(self):
@@ -316,7 +345,7 @@ class Settings(object):
             constraint_def = {str(k): v for k, v in constraint_def.items()}
 
         fields_to_remove = []
-        for field, config_item in self._data.items():
+        for field in list(self._data):
             if field not in constraint_def:
                 fields_to_remove.append(field)
                 continue
@@ -324,6 +353,7 @@ class Settings(object):
             other_field_def = constraint_def[field]
             if other_field_def is None:  # Means leave it as is
                 continue
+            config_item = self._item(field)
             if isinstance(other_field_def, str):
                 other_field_def = [other_field_def]
 
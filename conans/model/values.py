@@ -7,33 +7,43 @@ class Values(object):
         self._value = str(value)
         self._dict = {}  # {key: Values()}
         self._modified = {}  # {"compiler.version.arch": (old_value, old_reference)}
+        self._shared = set()  # keys shared with copies, copied before modifying them
 
     def __getattr__(self, attr):
         if attr not in self._dict:
             return None
-        return self._dict[attr]
+        child = self._dict[attr]
+        if attr in self._shared:
+            child = child.copy()
+            self._dict[attr] = child
+            self._shared.discard(attr)
+        return child
 
     def __delattr__(self, attr):
         if attr not in self._dict:
             return
         del self._dict[attr]
+        self._shared.discard(attr)
 
     def clear(self):
         # TODO: Test. DO not delete, might be used by package_id() to clear settings values
         self._dict.clear()
+        self._shared.clear()
         self._value = ""
 
     def __setattr__(self, attr, value):
         if attr[0] == "_":
             return super(Values, self).__setattr__(attr, value)
         self._dict[attr] = Values(value)
+        self._shared.discard(attr)
 
     def copy(self):
-        """ deepcopy, recursive
+        """ copy-on-write, the children are shared until one of the copies modifies them
         """
         result = Values(self._value)
-        for k, v in self._dict.items():
-            result._dict[k] = v.copy()
+        result._dict = self._dict.copy()
+        self._shared = set(self._dict)
+        result._shared = set(self._dict)
         return result
 
     @property
@@ -70,7 +80,7 @@ class Values(object):
     def as_list(self, list_all=True):
         result = []
         for field in self.fields:
-            value = getattr(self, field)
+            value = self._dict[field]
             if value or list_all:
                 result.append((field, str(value)))
                 child_lines = value.as_list()
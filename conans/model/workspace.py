@@ -2,8 +2,6 @@ import os
 import platform
 from collections import OrderedDict
 
-import yaml
-
 from conans.errors import ConanException
 from conans.model.ref import ConanFileReference
 from conans.util.files import load, mkdir, save
@@ -138,6 +136,7 @@ project({name} CXX)
         return self._root
 
     def _loads(self, text):
+        import yaml
         try:
             yml = yaml.load(text)
             self._generator = yml.pop("generator", None)
@@ -73,14 +73,16 @@ def evaluate(prop_name, prop_value, conan_vars_info):
 
 
 def search_recipes(paths, pattern=None, ignorecase=True):
-    # Conan references in main storage
+    # Conan references in main storage, and in the lower read-only ones of the client cache
     if pattern:
         if isinstance(pattern, ConanFileReference):
             pattern = str(pattern)
         pattern = translate(pattern)
         pattern = re.compile(pattern, re.IGNORECASE) if ignorecase else re.compile(pattern)
 
-    subdirs = list_folder_subdirs(basedir=paths.store, level=4)
+    subdirs = set(list_folder_subdirs(basedir=paths.store, level=4))
+    for lower in getattr(paths, "lower_stores", []):
+        subdirs.update(list_folder_subdirs(basedir=lower.store, level=4))
     if not pattern:
         return sorted([ConanFileReference(*folder.split("/")) for folder in subdirs])
     else:
@@ -116,7 +118,8 @@ def search_packages(client_cache, reference, query):
                            settings: {os: Windows}}}
     param conan_ref: ConanFileReference object
     """
-    if not os.path.exists(client_cache.conan(reference)):
+    if not os.path.exists(client_cache.conan(reference)) and \
+            not os.path.exists(client_cache.export(reference)):
         raise NotFoundException("Recipe not found: %s" % str(reference))
     infos = _get_local_infos_min(client_cache, reference)
     return filter_packages(query, infos)
@@ -124,9 +127,7 @@ def search_packages(client_cache, reference, query):
 
 def _get_local_infos_min(client_cache, reference):
     result = {}
-    packages_path = client_cache.packages(reference)
-    subdirs = list_folder_subdirs(packages_path, level=1)
-    for package_id in subdirs:
+    for package_id in client_cache.conan_packages(reference):
         # Read conaninfo
         try:
             package_reference = PackageReference(reference, package_id)
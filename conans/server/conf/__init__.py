@@ -14,6 +14,7 @@ from conans.client import tools
 from conans.errors import ConanException
 from conans.paths import conan_expand_user
 from conans.server.conf.default_server_conf import default_server_conf, default_server_conf
+from conans.server.store.dedup_disk_adapter import ServerDedupDiskAdapter
 from conans.server.store.disk_adapter import ServerDiskAdapter
 from conans.server.store.server_store import ServerStore
 from conans.util.env_reader import get_env
@@ -49,6 +50,28 @@ class ConanServerConfigParser(ConfigParser):
                            "public_port": get_env("CONAN_SERVER_PUBLIC_PORT", None, environment),
                            "host_name": get_env("CONAN_HOST_NAME", None, environment),
                            "custom_authenticator": get_env("CONAN_CUSTOM_AUTHENTICATOR", None, environment),
+                           "workers": get_env("CONAN_SERVER_WORKERS", None, environment),
+                           "request_timeout": get_env("CONAN_SERVER_REQUEST_TIMEOUT", None,
+                                                      environment),
+                           "download_mode": get_env("CONAN_SERVER_DOWNLOAD_MODE", None,
+                                                    environment),
+                           "disk_storage_dedup": get_env("CONAN_SERVER_DISK_STORAGE_DEDUP", None,
+                                                         environment),
+                           "memory_cache_mb": get_env("CONAN_SERVER_MEMORY_CACHE_MB", None,
+                                                      environment),
+                           "checksums_scrub_hours": get_env("CONAN_SERVER_CHECKSUMS_SCRUB_HOURS",
+                                                            None, environment),
+                           "download_redirect_location":
+                               get_env("CONAN_SERVER_DOWNLOAD_REDIRECT_LOCATION", None,
+                                       environment),
+                           "upstream_url": get_env("CONAN_SERVER_UPSTREAM_URL", None, environment),
+                           "upstream_user": get_env("CONAN_SERVER_UPSTREAM_USER", None,
+                                                    environment),
+                           "upstream_password": get_env("CONAN_SERVER_UPSTREAM_PASSWORD", None,
+                                                        environment),
+                           "upstream_ttl": get_env("CONAN_SERVER_UPSTREAM_TTL", None, environment),
+                           "upstream_timeout": get_env("CONAN_SERVER_UPSTREAM_TIMEOUT", None,
+                                                       environment),
                            # "user:pass,user2:pass2"
                            "users": get_env("CONAN_SERVER_USERS", None, environment)}
 
@@ -103,6 +126,91 @@ class ConanServerConfigParser(ConfigParser):
         except ConanException:
             return self.port
 
+    @property
+    def workers(self):
+        try:
+            return int(self._get_conf_server_string("workers"))
+        except ConanException:
+            return 1
+
+    @property
+    def request_timeout(self):
+        try:
+            return float(self._get_conf_server_string("request_timeout"))
+        except ConanException:
+            return None
+
+    @property
+    def disk_storage_dedup(self):
+        try:
+            dedup = self._get_conf_server_string("disk_storage_dedup").lower()
+            return dedup == "true" or dedup == "1"
+        except ConanException:
+            return False
+
+    @property
+    def memory_cache_mb(self):
+        try:
+            return float(self._get_conf_server_string("memory_cache_mb"))
+        except ConanException:
+            return 0
+
+    @property
+    def checksums_scrub_hours(self):
+        try:
+            return float(self._get_conf_server_string("checksums_scrub_hours"))
+        except ConanException:
+            return None
+
+    @property
+    def download_mode(self):
+        try:
+            return self._get_conf_server_string("download_mode")
+        except ConanException:
+            return None
+
+    @property
+    def download_redirect_location(self):
+        try:
+            return self._get_conf_server_string("download_redirect_location")
+        except ConanException:
+            return None
+
+    @property
+    def upstream_url(self):
+        try:
+            return self._get_conf_server_string("upstream_url")
+        except ConanException:
+            return None
+
+    @property
+    def upstream_user(self):
+        try:
+            return self._get_conf_server_string("upstream_user")
+        except ConanException:
+            return None
+
+    @property
+    def upstream_password(self):
+        try:
+            return self._get_conf_server_string("upstream_password")
+        except ConanException:
+            return None
+
+    @property
+    def upstream_ttl(self):
+        try:
+            return float(self._get_conf_server_string("upstream_ttl"))
+        except ConanException:
+            return 60
+
+    @property
+    def upstream_timeout(self):
+        try:
+            return float(self._get_conf_server_string("upstream_timeout"))
+        except ConanException:
+            return 30
+
     @property
     def host_name(self):
         try:
@@ -216,9 +324,15 @@ class ConanServerConfigParser(ConfigParser):
         return timedelta(minutes=float(self._get_conf_server_string("jwt_expire_minutes")))
 
 
-def get_server_store(disk_storage_path, public_url, updown_auth_manager):
+def get_server_store(disk_storage_path, public_url, updown_auth_manager, dedup=False,
+                     upstream=None):
+    """ With an 'upstream' (proxy_store.UpstreamRemote), a pull-through proxy store """
     disk_controller_url = "%s/%s" % (public_url, "files")
     if not updown_auth_manager:
         raise Exception("Updown auth manager needed for disk controller (not s3)")
-    adapter = ServerDiskAdapter(disk_controller_url, disk_storage_path, updown_auth_manager)
+    adapter_class = ServerDedupDiskAdapter if dedup else ServerDiskAdapter
+    adapter = adapter_class(disk_controller_url, disk_storage_path, updown_auth_manager)
+    if upstream:
+        from conans.server.store.proxy_store import ProxyServerStore
+        return ProxyServerStore(adapter, upstream)
     return ServerStore(adapter)
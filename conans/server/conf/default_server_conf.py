@@ -10,6 +10,33 @@ port: 9300
 # Public port where files will be served. If empty will be used "port"
 public_port:
 host_name: localhost
+# Requests attended concurrently, each one in its own thread. With 1 they are attended one by one
+workers: 1
+# Seconds a read or write of a request can take before closing the connection. Empty: no timeout
+request_timeout:
+# How the downloaded files are sent:
+#   python: read and written by the server (default)
+#   sendfile: copied from the file to the socket by the kernel (Python 3)
+#   x-accel-redirect: by a fronting nginx, from the internal location download_redirect_location
+#                     that maps to disk_storage_path
+#   x-sendfile: by a fronting apache (mod_xsendfile) or lighttpd
+download_mode: python
+download_redirect_location:
+# Megabytes of memory to serve the small files (manifests, conaninfo.txt...) downloaded in
+# "python" and "sendfile" download modes. 0: disabled
+memory_cache_mb: 64
+# Hours between the verifications of the stored files against the checksums saved when they were
+# uploaded, logging the corrupted ones. Empty: never
+checksums_scrub_hours:
+# Pull-through proxy of another conan_server: the recipes, packages and searches not found in
+# this server are requested to the upstream, and the fetched recipes and packages are stored.
+# The upstream latest revisions and search results are reused upstream_ttl seconds. The
+# requests to the upstream fail after upstream_timeout seconds without answer
+upstream_url:
+upstream_user:
+upstream_password:
+upstream_ttl: 60
+upstream_timeout: 30
 
 # Authorize timeout are seconds the client has to upload/download files until authorization expires
 authorize_timeout: 1800
@@ -19,6 +46,9 @@ authorize_timeout: 1800
 disk_storage_path: ~/.conan_server/data
 disk_authorize_timeout: 1800
 updown_secret: {updown_secret}
+# Store a single copy of the files with the same contents (hardlinks to a file per checksum),
+# the clients don't upload the files already stored. Changing it doesn't affect the stored files
+disk_storage_dedup: False
 
 
 # Check docs.conan.io to implement a different authenticator plugin for conan_server
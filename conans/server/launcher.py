@@ -2,7 +2,7 @@
 import argparse
 import os
 
-from conans import SERVER_CAPABILITIES
+from conans import CHECKSUM_DEPLOY, SERVER_CAPABILITIES
 from conans import __version__ as SERVER_VERSION, REVISIONS
 from conans.model.version import Version
 from conans.paths import conan_expand_user
@@ -14,6 +14,9 @@ from conans.server.crypto.jwt.jwt_updown_manager import JWTUpDownAuthManager
 from conans.server.migrate import migrate_and_get_server_config
 from conans.server.plugin_loader import load_authentication_plugin
 from conans.server.rest.server import ConanServer
+from conans.server.service.file_sender import DOWNLOAD_SENDFILE, FileSender
+from conans.server.service.files_cache import SmallFilesCache
+from conans.server.store.checksums import ChecksumsScrubber
 
 from conans.server.service.authorize import BasicAuthorizer, BasicAuthenticator
 
@@ -39,25 +42,54 @@ class ServerLauncher(object):
         updown_auth_manager = JWTUpDownAuthManager(server_config.updown_secret,
                                                    server_config.authorize_timeout)
 
+        upstream = None
+        if server_config.upstream_url:
+            from conans.server.store.proxy_store import UpstreamRemote
+            upstream = UpstreamRemote(server_config.upstream_url, server_config.upstream_user,
+                                      server_config.upstream_password,
+                                      server_config.upstream_ttl,
+                                      timeout=server_config.upstream_timeout)
         server_store = get_server_store(server_config.disk_storage_path,
                                         server_config.public_url,
-                                        updown_auth_manager=updown_auth_manager)
+                                        updown_auth_manager=updown_auth_manager,
+                                        dedup=server_config.disk_storage_dedup,
+                                        upstream=upstream)
 
         server_capabilities = SERVER_CAPABILITIES
         server_capabilities.append(REVISIONS)
+        if server_config.disk_storage_dedup:
+            server_capabilities.append(CHECKSUM_DEPLOY)
 
+        files_cache = None
+        if server_config.memory_cache_mb:
+            files_cache = SmallFilesCache(int(server_config.memory_cache_mb * 1024 * 1024))
+        file_sender = FileSender(server_config.download_mode, server_config.disk_storage_path,
+                                 server_config.download_redirect_location, files_cache)
         self.server = ConanServer(server_config.port, credentials_manager, updown_auth_manager,
                                   authorizer, authenticator, server_store,
                                   Version(SERVER_VERSION), Version(MIN_CLIENT_COMPATIBLE_VERSION),
-                                  server_capabilities)
+                                  server_capabilities, file_sender)
+        self.workers = server_config.workers
+        self.request_timeout = server_config.request_timeout
+        self.sendfile = file_sender.mode == DOWNLOAD_SENDFILE
+        self.scrubber = None
+        if server_config.checksums_scrub_hours:
+            self.scrubber = ChecksumsScrubber(server_config.disk_storage_path,
+                                              server_config.checksums_scrub_hours * 3600)
         if not self.force_migration:
             print("***********************")
             print("Using config: %s" % server_config.config_filename)
             print("Storage: %s" % server_config.disk_storage_path)
             print("Public URL: %s" % server_config.public_url)
             print("PORT: %s" % server_config.port)
+            if upstream:
+                print("Upstream: %s" % upstream.url)
+            print("WORKERS: %s" % self.workers)
             print("***********************")
 
     def launch(self):
         if not self.force_migration:
-            self.server.run(host="0.0.0.0")
+            if self.scrubber:
+                self.scrubber.start()
+            self.server.run(host="0.0.0.0", workers=self.workers,
+                            request_timeout=self.request_timeout, sendfile=self.sendfile)
@@ -4,6 +4,10 @@ Abstact class dor define attach_to method
 '''
 from abc import ABCMeta, abstractmethod
 
+from bottle import request
+
+from conans.errors import RequestErrorException
+
 
 class Controller(object):
     __metaclass__ = ABCMeta
@@ -14,3 +18,32 @@ class Controller(object):
     @abstractmethod
     def attach_to(self, app):
         raise NotImplemented()
+
+
+def get_upload_stream():
+    """ The request body and its size. Read directly from the connection when possible, instead
+    of bottle's request.body, that buffers the whole body in memory or in a temporary file
+    """
+    if request.chunked or request.content_length < 0 or "bottle.request.body" in request.environ:
+        body = request.body
+        body.seek(0, 2)
+        size = body.tell()
+        body.seek(0)
+        return body, size
+    return request.environ["wsgi.input"], request.content_length
+
+
+def get_search_page():
+    """ The (cursor, limit) of the paginated recipes search, (None, None) for the clients
+    requesting all the results at once
+    """
+    limit = request.params.get("limit", None)
+    if limit is None:
+        return None, None
+    try:
+        limit = int(limit)
+    except ValueError:
+        limit = 0
+    if limit < 1:
+        raise RequestErrorException("Invalid search limit: %s" % request.params.get("limit"))
+    return request.params.get("cursor", None), limit
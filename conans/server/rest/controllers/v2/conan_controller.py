@@ -1,9 +1,8 @@
-from bottle import request
+from bottle import request, response
 
-from conans.errors import NotFoundException
 from conans.model.ref import ConanFileReference
 from conans.server.rest.bottle_routes import BottleRoutes
-from conans.server.rest.controllers.controller import Controller
+from conans.server.rest.controllers.controller import Controller, get_upload_stream
 from conans.server.rest.controllers.v2 import get_package_ref
 from conans.server.service.service_v2 import ConanServiceV2
 
@@ -12,7 +11,7 @@ class ConanControllerV2(Controller):
 
     def attach_to(self, app):
 
-        conan_service = ConanServiceV2(app.authorizer, app.server_store)
+        conan_service = ConanServiceV2(app.authorizer, app.server_store, app.file_sender)
         r = BottleRoutes(self.route)
 
         @app.route(r.package_files, method=["GET"])
@@ -39,12 +38,14 @@ class ConanControllerV2(Controller):
         def upload_package_file(name, version, username, channel, package_id,
                                 the_path, auth_user, revision=None, p_revision=None):
 
-            if "X-Checksum-Deploy" in request.headers:
-                raise NotFoundException("Non checksum storage")
+            deploy_sha1 = _deploy_sha1()
             package_reference = get_package_ref(name, version, username, channel, package_id,
                                                 revision, p_revision)
-            conan_service.upload_package_file(request.body, request.headers, package_reference,
-                                              the_path, auth_user)
+            body, size = get_upload_stream()
+            conan_service.upload_package_file(body, size, package_reference, the_path, auth_user,
+                                              deploy_sha1)
+            if deploy_sha1 is not None:
+                response.status = 201
 
         @app.route(r.recipe_files, method=["GET"])
         @app.route(r.recipe_revision_files, method=["GET"])
@@ -64,9 +65,19 @@ class ConanControllerV2(Controller):
         @app.route(r.recipe_revision_file, method=["PUT"])
         def upload_recipe_file(name, version, username, channel, the_path, auth_user,
                                revision=None):
-            if "X-Checksum-Deploy" in request.headers:
-                raise NotFoundException("Not a checksum storage")
+            deploy_sha1 = _deploy_sha1()
             reference = ConanFileReference(name, version, username, channel, revision)
-            conan_service.upload_recipe_file(request.body, request.headers, reference, the_path,
-                                             auth_user)
+            body, size = get_upload_stream()
+            conan_service.upload_recipe_file(body, size, reference, the_path, auth_user,
+                                             deploy_sha1)
+            if deploy_sha1 is not None:
+                response.status = 201
 
+
+def _deploy_sha1():
+    """ The sha1 of the file to store without uploading it, from the X-Checksum-Deploy
+    requests of Uploader.upload()
+    """
+    if "X-Checksum-Deploy" not in request.headers:
+        return None
+    return request.headers.get("X-Checksum-Sha1", "")
@@ -2,7 +2,7 @@ from bottle import request
 
 from conans.model.ref import ConanFileReference
 from conans.server.rest.bottle_routes import BottleRoutes
-from conans.server.rest.controllers.controller import Controller
+from conans.server.rest.controllers.controller import Controller, get_search_page
 from conans.server.service.service import SearchService
 
 
@@ -20,9 +20,14 @@ class SearchControllerV2(Controller):
             ignorecase = request.params.get("ignorecase", True)
             if isinstance(ignorecase, str):
                 ignorecase = False if 'false' == ignorecase.lower() else True
+            cursor, limit = get_search_page()
             search_service = SearchService(app.authorizer, app.server_store, auth_user)
-            references = [ref.full_repr() for ref in search_service.search(pattern, ignorecase)]
-            return {"results": references}
+            if limit is None:
+                references = [ref.full_repr() for ref in search_service.search(pattern, ignorecase)]
+                return {"results": references}
+            references, next_cursor = search_service.search_page(pattern, ignorecase, cursor,
+                                                                 limit)
+            return {"results": [ref.full_repr() for ref in references], "next": next_cursor}
 
         @app.route('%s/search' % r.recipe, method=["GET"])
         @app.route('%s/search' % r.recipe_revision, method=["GET"])
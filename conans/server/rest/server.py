@@ -1,8 +1,103 @@
+import socket
+import sys
+import threading
+from wsgiref.simple_server import ServerHandler, WSGIRequestHandler, WSGIServer, make_server
+
 import bottle
+from six.moves.socketserver import ThreadingMixIn
 
 from conans.model.version import Version
 from conans.server.rest.api_v1 import ApiV1
 from conans.server.rest.api_v2 import ApiV2
+from conans.server.service.file_sender import FileSender
+from conans.util.log import logger
+
+
+class _SendfileServerHandler(ServerHandler):
+
+    def sendfile(self):
+        """ Sends the file responses with socket.sendfile(), that copies the file to the socket
+        in the kernel if the OS supports it. Not available in Python 2
+        """
+        connection = self.request_handler.connection
+        content_length = self.headers.get("Content-Length")
+        if not hasattr(connection, "sendfile") or content_length is None:
+            return False
+        filelike = self.result.filelike
+        try:
+            offset = filelike.tell()
+            filelike.fileno()
+        except (AttributeError, IOError, OSError):
+            return False
+        self.send_headers()
+        self._flush()
+        self.bytes_sent = connection.sendfile(filelike, offset, int(content_length))
+        return True
+
+
+class ThreadedWSGIRefServer(bottle.ServerAdapter):
+    """ wsgiref server attending each request in its own thread, up to 'workers' requests
+    at the same time (the next connections wait in the listen queue). The connections are
+    closed if a read or write takes more than 'request_timeout' seconds. With 'sendfile' the
+    file responses are sent with socket.sendfile()
+    """
+    srv = None
+
+    def run(self, app):
+        workers = threading.BoundedSemaphore(self.options.get("workers") or 1)
+        quiet = self.quiet
+        sendfile = self.options.get("sendfile")
+
+        class RequestHandler(WSGIRequestHandler):
+            timeout = self.options.get("request_timeout")
+
+            def handle(self):
+                if not sendfile:
+                    return WSGIRequestHandler.handle(self)
+                # Same than WSGIRequestHandler.handle(), with a different ServerHandler
+                self.raw_requestline = self.rfile.readline(65537)
+                if len(self.raw_requestline) > 65536:
+                    self.requestline = ''
+                    self.request_version = ''
+                    self.command = ''
+                    self.send_error(414)
+                    return
+                if not self.parse_request():  # An error code has been sent, just exit
+                    return
+                handler = _SendfileServerHandler(self.rfile, self.wfile, self.get_stderr(),
+                                                 self.get_environ())
+                handler.request_handler = self
+                handler.run(self.server.get_app())
+
+            def log_request(self, *args, **kwargs):
+                if not quiet:
+                    return WSGIRequestHandler.log_request(self, *args, **kwargs)
+
+        class Server(ThreadingMixIn, WSGIServer):
+            daemon_threads = True
+
+            def handle_error(self, request, client_address):
+                if isinstance(sys.exc_info()[1], socket.timeout):
+                    logger.debug("SERVER: Request timeout from %s" % str(client_address))
+                    return
+                WSGIServer.handle_error(self, request, client_address)
+
+            def process_request(self, request, client_address):
+                workers.acquire()
+                try:
+                    ThreadingMixIn.process_request(self, request, client_address)
+                except Exception:
+                    workers.release()
+                    raise
+
+            def process_request_thread(self, request, client_address):
+                try:
+                    ThreadingMixIn.process_request_thread(self, request, client_address)
+                finally:
+                    workers.release()
+
+        self.srv = make_server(self.host, self.port, app, Server, RequestHandler)
+        self.srv.serve_forever()
 
 
 class ConanServer(object):
@@ -17,7 +112,7 @@ class ConanServer(object):
     def __init__(self, run_port, credentials_manager,
                  updown_auth_manager, authorizer, authenticator,
                  server_store, server_version, min_client_compatible_version,
-                 server_capabilities):
+                 server_capabilities, file_sender=None):
 
         self.run_port = run_port
 
@@ -25,6 +120,7 @@ class ConanServer(object):
         assert(isinstance(min_client_compatible_version, Version))
 
         server_capabilities = server_capabilities or []
+        file_sender = file_sender or FileSender()
         self.root_app = bottle.Bottle()
 
         self.api_v1 = ApiV1(credentials_manager, updown_auth_manager,
@@ -33,6 +129,7 @@ class ConanServer(object):
         self.api_v1.authorizer = authorizer
         self.api_v1.authenticator = authenticator
         self.api_v1.server_store = server_store
+        self.api_v1.file_sender = file_sender
         self.api_v1.setup()
 
         self.root_app.mount("/v1/", self.api_v1)
@@ -42,6 +139,7 @@ class ConanServer(object):
         self.api_v2.authorizer = authorizer
         self.api_v2.authenticator = authenticator
         self.api_v2.server_store = server_store
+        self.api_v2.file_sender = file_sender
         self.api_v2.setup()
         self.root_app.mount("/v2/", self.api_v2)
 
@@ -49,5 +147,13 @@ class ConanServer(object):
         port = kwargs.pop("port", self.run_port)
         debug_set = kwargs.pop("debug", False)
         host = kwargs.pop("host", "localhost")
-        bottle.Bottle.run(self.root_app, host=host,
+        workers = kwargs.pop("workers", 1)
+        request_timeout = kwargs.pop("request_timeout", None)
+        sendfile = kwargs.pop("sendfile", False)
+        if workers > 1 or request_timeout or sendfile:
+            server = ThreadedWSGIRefServer(host=host, port=port, workers=workers,
+                                           request_timeout=request_timeout, sendfile=sendfile)
+        else:
+            server = "wsgiref"
+        bottle.Bottle.run(self.root_app, server=server, host=host,
                           port=port, debug=debug_set, reloader=False)
@@ -1,6 +1,6 @@
 import json
 import time
-from collections import namedtuple
+from collections import OrderedDict, namedtuple
 
 _RevisionEntry = namedtuple("RevisionEntry", "revision time")
 
@@ -8,58 +8,44 @@ _RevisionEntry = namedtuple("RevisionEntry", "revision time")
 class RevisionList(object):
 
     def __init__(self):
-        self._data = []
+        self._data = OrderedDict()  # {revision: time}, the latest at the end
 
     @staticmethod
     def loads(contents):
         ret = RevisionList()
-        ret._data = [_RevisionEntry(e["revision"], e["time"])
-                     for e in json.loads(contents)["revisions"]]
+        for e in json.loads(contents)["revisions"]:
+            ret._data[e["revision"]] = e["time"]
         return ret
 
     def dumps(self):
-        return json.dumps({"revisions": [{"revision": e.revision,
-                                          "time": e.time} for e in self._data]})
+        return json.dumps({"revisions": [{"revision": revision,
+                                          "time": the_time}
+                                         for revision, the_time in self._data.items()]})
 
     def add_revision(self, revision_id):
         lt = self.latest_revision()
         if lt and lt.revision == revision_id:
             # Each uploaded file calls to update the revision
             return
-        index = self._find_revision_index(revision_id)
-        if index:
-            self._data.pop(index)
-
+        self._data.pop(revision_id, None)
         now = time.time()
-        self._data.append(_RevisionEntry(revision_id, now))
+        self._data[revision_id] = now
 
     def latest_revision(self):
         if not self._data:
             return None
-        return self._data[-1]
+        revision = next(reversed(self._data))
+        return _RevisionEntry(revision, self._data[revision])
 
     def get_time(self, revision):
-        tmp = self._find_revision_index(revision)
-        if tmp is None:
-            return None
-        return self._data[tmp].time
+        return self._data.get(revision)
 
     def items(self):
-        return reversed(self._data)
+        return (_RevisionEntry(revision, self._data[revision])
+                for revision in reversed(self._data))
 
     def remove_revision(self, revision_id):
-        index = self._find_revision_index(revision_id)
-        if index is None:
-            return
-        self._data.pop(index)
-
-    def _find_revision_index(self, revision_id):
-        for i, rev in enumerate(self._data):
-            if rev.revision == revision_id:
-                return i
-        return None
+        self._data.pop(revision_id, None)
 
     def __eq__(self, other):
         return self.dumps() == other.dumps()
-
-
@@ -0,0 +1,103 @@
+import mimetypes
+import os
+
+from bottle import HTTPError, HTTPResponse, request, static_file
+from six.moves.urllib.parse import quote
+
+from conans.errors import ConanException
+from conans.server.service.mime import get_mime_type
+from conans.server.store.checksums import load_checksums
+
+DOWNLOAD_PYTHON = "python"
+DOWNLOAD_SENDFILE = "sendfile"
+DOWNLOAD_X_ACCEL_REDIRECT = "x-accel-redirect"
+DOWNLOAD_X_SENDFILE = "x-sendfile"
+DOWNLOAD_MODES = (DOWNLOAD_PYTHON, DOWNLOAD_SENDFILE, DOWNLOAD_X_ACCEL_REDIRECT,
+                  DOWNLOAD_X_SENDFILE)
+
+
+def _etag(path):
+    """ Strong ETag of the file, from its saved checksums. None for the files without them
+    (stored before the checksums were saved), not hashed in the request, the scrubber saves them
+    """
+    checksums = load_checksums(path)
+    return '"%s"' % checksums["sha1"] if checksums else None
+
+
+def _etag_matches(etag):
+    if_none_match = request.environ.get("HTTP_IF_NONE_MATCH")
+    if not etag or not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+class FileSender(object):
+    """ Builds the responses of the file downloads. The contents are sent by the server ("python"
+    and "sendfile" modes, the later copying them in the kernel when the server supports it),
+    or by the fronting web server ("x-accel-redirect" for nginx, "x-sendfile" for apache or
+    lighttpd), answering with an empty response with the header pointing to the file.
+    The responses have the ETag of the file, and are 304 without body if it matches the
+    If-None-Match of the request
+    """
+
+    def __init__(self, mode=None, storage_path=None, redirect_location=None, files_cache=None):
+        """
+        param storage_path: The server storage folder, for x-accel-redirect
+        param redirect_location: The internal location of the fronting server that maps to the
+                                 storage folder, for x-accel-redirect
+        param files_cache: SmallFilesCache to serve the small files from memory
+        """
+        self.mode = mode or DOWNLOAD_PYTHON
+        if self.mode not in DOWNLOAD_MODES:
+            raise ConanException("Invalid download mode '%s', allowed: %s"
+                                 % (self.mode, ", ".join(DOWNLOAD_MODES)))
+        if self.mode == DOWNLOAD_X_ACCEL_REDIRECT and not (storage_path and redirect_location):
+            raise ConanException("The '%s' download mode needs a redirect location"
+                                 % DOWNLOAD_X_ACCEL_REDIRECT)
+        self._storage_path = storage_path
+        self._redirect_location = (redirect_location or "").rstrip("/")
+        self.files_cache = files_cache
+
+    def __call__(self, path):
+        if self.files_cache is not None and self.mode in (DOWNLOAD_PYTHON, DOWNLOAD_SENDFILE) \
+                and request.environ.get("REQUEST_METHOD", "GET") == "GET" \
+                and "HTTP_RANGE" not in request.environ:
+            cached = self.files_cache.get(path)
+            if cached:
+                contents, etag = cached
+                if _etag_matches(etag):
+                    return HTTPResponse(status=304, ETag=etag)
+                mimetype = get_mime_type(path)
+                if mimetype == "auto":  # Same than static_file()
+                    mimetype = mimetypes.guess_type(path)[0] or "application/octet-stream"
+                headers = {"ETag": etag, "Content-Length": str(len(contents)),
+                           "Content-Type": mimetype}
+                return HTTPResponse(status=200, body=contents, **headers)
+
+        etag = _etag(path)
+        if _etag_matches(etag):
+            return HTTPResponse(status=304, ETag=etag)
+
+        mimetype = get_mime_type(path)
+        if self.mode in (DOWNLOAD_PYTHON, DOWNLOAD_SENDFILE):
+            response = static_file(os.path.basename(path), root=os.path.dirname(path),
+                                   mimetype=mimetype)
+            if etag and response.status_code == 200:
+                response.set_header("ETag", etag)
+            return response
+
+        if not os.path.isfile(path):
+            return HTTPError(404, "File does not exist.")
+        headers = {"ETag": etag} if etag else {}
+        if mimetype != "auto":
+            headers["Content-Type"] = mimetype
+        if self.mode == DOWNLOAD_X_ACCEL_REDIRECT:
+            relative_path = os.path.relpath(path, self._storage_path).replace("\\", "/")
+            if relative_path.startswith(".."):
+                return HTTPError(403, "Access denied.")
+            headers["X-Accel-Redirect"] = "%s/%s" % (self._redirect_location,
+                                                     quote(relative_path))
+        else:
+            headers["X-Sendfile"] = os.path.abspath(path)
+        return HTTPResponse(status=200, body="", **headers)
@@ -0,0 +1,94 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from conans.util.log import logger
+
+# The hit rate is logged after this number of lookups
+_STATS_INTERVAL = 1000
+
+
+def _stamp(stat):
+    # The uploads replace the files with a rename, changing the inode
+    return stat.st_ino, stat.st_size, getattr(stat, "st_mtime_ns", stat.st_mtime)
+
+
+class SmallFilesCache(object):
+    """ LRU cache in memory of the contents and ETag of the small downloaded files (manifests,
+    conaninfo.txt, conanfile.py...), up to max_size bytes. Each hit checks the stat of the file,
+    so the uploaded, modified and removed files, also by other server processes, are never
+    served from memory.
+    """
+
+    def __init__(self, max_size, max_file_size=256 * 1024):
+        self._max_size = max_size
+        self._max_file_size = max_file_size
+        self._entries = OrderedDict()  # {path: (stamp, contents, etag)}, the LRU first
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path):
+        """ Returns the (contents, etag) of the file, reading and caching it if needed, or None
+        if the file doesn't exist or is too big
+        """
+        try:
+            stamp = _stamp(os.stat(path))
+        except OSError:
+            self._remove(path)
+            return None
+        if stamp[1] > self._max_file_size:
+            return None
+
+        with self._lock:
+            entry = self._entries.pop(path, None)
+            if entry and entry[0] == stamp:
+                self._entries[path] = entry
+                self._count(hit=True)
+                return entry[1], entry[2]
+            if entry:
+                self._size -= len(entry[1])
+            self._count(hit=False)
+
+        try:
+            with open(path, "rb") as handle:
+                stamp = _stamp(os.fstat(handle.fileno()))
+                contents = handle.read(self._max_file_size + 1)
+        except (IOError, OSError):
+            return None
+        if len(contents) > self._max_file_size:
+            return None
+        etag = '"%s"' % hashlib.sha1(contents).hexdigest()
+
+        with self._lock:
+            previous = self._entries.pop(path, None)
+            if previous:
+                self._size -= len(previous[1])
+            self._entries[path] = stamp, contents, etag
+            self._size += len(contents)
+            while self._size > self._max_size:
+                _, (_, evicted, _) = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+        return contents, etag
+
+    def _remove(self, path):
+        with self._lock:
+            entry = self._entries.pop(path, None)
+            if entry:
+                self._size -= len(entry[1])
+
+    def _count(self, hit):
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        if (self.hits + self.misses) % _STATS_INTERVAL == 0:
+            logger.info("Small files cache: %s" % self.stats())
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        hit_rate = 100.0 * self.hits / lookups if lookups else 0
+        return ("%.1f%% hits (%d hits, %d misses), %d files, %d bytes"
+                % (hit_rate, self.hits, self.misses, len(self._entries), self._size))
@@ -1,26 +1,29 @@
+import heapq
 import os
 import re
 from fnmatch import translate
+from itertools import islice
 
 import jwt
 
-from conans import load
+from conans import DEFAULT_REVISION_V1, load
 from conans.errors import ConanException, ForbiddenException, NotFoundException, \
     RequestErrorException
 from conans.model.info import ConanInfo
 from conans.model.ref import ConanFileReference, PackageReference
 from conans.paths import CONANINFO
 from conans.search.search import _partial_match, filter_packages
-from conans.util.files import list_folder_subdirs, mkdir
+from conans.util.files import list_folder_subdirs
 from conans.util.log import logger
 
 
 class FileUploadDownloadService(object):
     """Handles authorization from token and upload and download files"""
 
-    def __init__(self, updown_auth_manager, base_store_folder):
+    def __init__(self, updown_auth_manager, server_store):
         self.updown_auth_manager = updown_auth_manager
-        self.base_store_folder = base_store_folder
+        self.base_store_folder = server_store.store
+        self._server_store = server_store
 
     def get_file_path(self, filepath, token):
         try:
@@ -34,9 +37,9 @@ class FileUploadDownloadService(object):
         except (jwt.ExpiredSignature, jwt.DecodeError, AttributeError):
             raise NotFoundException("File not found")
 
-    def put_file(self, file_saver, abs_filepath, token, upload_size):
+    def put_file(self, body, abs_filepath, token, upload_size):
         """
-        file_saver is an object with the save() method without parameters
+        body is the file-like object with the upload_size bytes of the file
         """
         try:
             encoded_path, filesize, user = self.updown_auth_manager.get_resource_info(token)
@@ -49,10 +52,7 @@ class FileUploadDownloadService(object):
             if not self._valid_path(abs_filepath, abs_encoded_path):
                 raise NotFoundException("File not found")
             logger.debug("Put file: %s: %s" % (user, abs_filepath))
-            mkdir(os.path.dirname(abs_filepath))
-            if os.path.exists(abs_filepath):
-                os.remove(abs_filepath)
-            file_saver.save(os.path.dirname(abs_filepath))
+            self._server_store.write_file(abs_filepath, body, upload_size)
 
         except (jwt.ExpiredSignature, jwt.DecodeError, AttributeError):
             raise NotFoundException("File not found")
@@ -78,10 +78,25 @@ class SearchService(object):
 
     def search_packages(self, reference, query, v2_compatibility_mode):
         self._authorizer.check_read_conan(self._auth_user, reference)
-        info = search_packages(self._server_store, reference, query, v2_compatibility_mode)
+        upstream_info = self._server_store.upstream_packages(reference, query,
+                                                             v2_compatibility_mode)
+        try:
+            info = search_packages(self._server_store, reference, query, v2_compatibility_mode)
+        except NotFoundException:
+            if upstream_info is None:
+                raise
+            info = {}
+        if upstream_info:
+            info = dict(upstream_info, **info)
         return info
 
     def search_recipes(self, pattern=None, ignorecase=True):
+        return list(self._iter_recipes(pattern, ignorecase))
+
+    def _iter_recipes(self, pattern=None, ignorecase=True, cursor=None):
+        """ Yields, sorted, the references in the store matching the pattern, and after the
+        'cursor' one if given (a reference folder, as returned by search_page())
+        """
 
         def get_ref(_pattern):
             if not isinstance(_pattern, ConanFileReference):
@@ -99,42 +114,117 @@ class SearchService(object):
             # Avoid resolve latest revision if a version range is passed or we are performing a
             # package remove (all revisions)
             path = self._server_store.conan(ref, resolve_latest=False)
-            if self._server_store.path_exists(path):
-                return [ref]
+            if self._server_store.path_exists(path) or \
+                    self._server_store.upstream_recipes(str(ref), ignorecase):
+                if not cursor:
+                    yield ref
+                return
 
         # Conan references in main storage
+        name_filter = None
         if pattern:
             pattern = str(pattern)
             b_pattern = translate(pattern)
             b_pattern = re.compile(b_pattern, re.IGNORECASE) if ignorecase else re.compile(b_pattern)
-
-        subdirs = list_folder_subdirs(basedir=self._server_store.store, level=5)
-        if not pattern:
-            return sorted([ConanFileReference(*folder.split("/")) for folder in subdirs])
-        else:
-            ret = []
-            for subdir in subdirs:
-                conan_ref = ConanFileReference(*subdir.split("/"))
-                if _partial_match(b_pattern, conan_ref):
-                    ret.append(conan_ref)
-
-            return sorted(ret)
+            name_filter = _name_filter(pattern, ignorecase)
+
+        after = _load_cursor(cursor) if cursor else None
+        folders = _iter_reference_folders(self._server_store.store, name_filter, after)
+        upstream = self._server_store.upstream_recipes(pattern, ignorecase)
+        if upstream:
+            upstream = sorted(set(_reference_folder(ref) for ref in upstream))
+            folders = _merge_folders(folders, [f for f in upstream if not after or f > after])
+        for folder in folders:
+            conan_ref = ConanFileReference(*folder)
+            if not pattern or _partial_match(b_pattern, conan_ref):
+                yield conan_ref
+
+    def _iter_readable(self, pattern, ignorecase, cursor=None):
+        for conan_ref in self._iter_recipes(pattern, ignorecase, cursor):
+            try:
+                self._authorizer.check_read_conan(self._auth_user, conan_ref)
+                yield conan_ref
+            except ForbiddenException:
+                pass
 
     def search(self, pattern=None, ignorecase=True):
         """ Get all the info about any package
             Attributes:
                 pattern = wildcards like opencv/*
         """
-        references = self.search_recipes(pattern, ignorecase)
-        filtered = []
         # Filter out restricted items
-        for conan_ref in references:
-            try:
-                self._authorizer.check_read_conan(self._auth_user, conan_ref)
-                filtered.append(conan_ref)
-            except ForbiddenException:
-                pass
-        return filtered
+        return list(self._iter_readable(pattern, ignorecase))
+
+    def search_page(self, pattern=None, ignorecase=True, cursor=None, limit=None):
+        """ Like search(), but returning only the first 'limit' references after the 'cursor',
+        and the cursor of the next page (None if there are no more references). The store is only
+        walked up to the first reference of the next page
+        """
+        readable = self._iter_readable(pattern, ignorecase, cursor)
+        references = list(islice(readable, limit))
+        if len(references) < limit or next(readable, None) is None:
+            return references, None
+        return references, "/".join(str(item) for item in references[-1])
+
+
+def _name_filter(pattern, ignorecase):
+    """ The patterns match the beginning of the references, the name folders that can't contain
+    any match are not walked, e.g. all but "zlib" for "zlib/*@conan/stable" (version ranges)
+    """
+    prefix = re.split(r"[*?\[]", pattern, 1)[0]
+    if ignorecase:
+        prefix = prefix.lower()
+
+    def accepts(name):
+        name = (name.lower() if ignorecase else name) + "/"
+        return name.startswith(prefix) or prefix.startswith(name)
+    return accepts
+
+
+def _load_cursor(cursor):
+    folder = tuple(cursor.split("/"))
+    if len(folder) != 5:
+        raise RequestErrorException("Invalid search cursor: %s" % cursor)
+    return folder
+
+
+def _reference_folder(reference):
+    return tuple(reference[:4]) + (reference.revision or DEFAULT_REVISION_V1, )
+
+
+def _merge_folders(folders, other_folders):
+    """ Merges two sorted iterables of reference folders, without repeating them """
+    last = None
+    for folder in heapq.merge(folders, other_folders):
+        if folder != last:
+            yield folder
+        last = folder
+
+
+def _iter_reference_folders(store, name_filter=None, after=None, parents=()):
+    """ Yields the (name, version, user, channel, revision) folders of the store, sorted, and
+    greater than 'after'. Unlike list_folder_subdirs(), the store is walked lazily, skipping
+    the subfolders out of the requested range
+    """
+    level = len(parents)
+    try:
+        children = sorted(os.listdir(store))
+    except OSError:
+        return
+    for child in children:
+        folder = parents + (child, )
+        if after and folder < after[:level + 1]:
+            continue
+        if level == 0 and name_filter and not name_filter(child):
+            continue
+        path = os.path.join(store, child)
+        if not os.path.isdir(path):
+            continue
+        if level < 4:
+            for ref_folder in _iter_reference_folders(path, name_filter, after, folder):
+                yield ref_folder
+        elif not after or folder > after:
+            yield folder
 
 
 class ConanService(object):
@@ -151,6 +241,7 @@ class ConanService(object):
             {filename: md5}
         """
         self._authorizer.check_read_conan(self._auth_user, reference)
+        reference = self._server_store.proxy_recipe(reference)
         snap = self._server_store.get_recipe_snapshot(reference)
         if not snap:
             raise NotFoundException("conanfile not found")
@@ -161,6 +252,7 @@ class ConanService(object):
             {filename: url}
         """
         self._authorizer.check_read_conan(self._auth_user, reference)
+        reference = self._server_store.proxy_recipe(reference)
         urls = self._server_store.get_download_conanfile_urls(reference,
                                                               files_subset,
                                                               self._auth_user)
@@ -238,6 +330,7 @@ class ConanService(object):
             [filename: {'url': url, 'md5': md5}]
         """
         self._authorizer.check_read_package(self._auth_user, package_reference)
+        package_reference = self._server_store.proxy_package(package_reference)
         snap = self._server_store.get_package_snapshot(package_reference)
         return snap
 
@@ -246,6 +339,7 @@ class ConanService(object):
             [filename: {'url': url, 'md5': md5}]
         """
         self._authorizer.check_read_package(self._auth_user, package_reference)
+        package_reference = self._server_store.proxy_package(package_reference)
         urls = self._server_store.get_download_package_urls(package_reference,
                                                             files_subset=files_subset)
         return urls
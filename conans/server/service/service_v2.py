@@ -1,23 +1,22 @@
 import os
 
-from bottle import FileUpload, static_file
-
 from conans.errors import NotFoundException
-from conans.server.service.mime import get_mime_type
+from conans.server.service.file_sender import FileSender
 from conans.server.store.server_store import ServerStore
-from conans.util.files import mkdir
 
 
 class ConanServiceV2(object):
 
-    def __init__(self, authorizer, server_store):
+    def __init__(self, authorizer, server_store, file_sender=None):
         assert(isinstance(server_store, ServerStore))
         self._authorizer = authorizer
         self._server_store = server_store
+        self._file_sender = file_sender or FileSender()
 
     # RECIPE METHODS
     def get_recipe_file_list(self, reference,  auth_user):
         self._authorizer.check_read_conan(auth_user, reference)
+        reference = self._server_store.proxy_recipe(reference)
         reference = self._server_store.ref_with_rev(reference)
         the_time = self._server_store.get_revision_time(reference)
         file_list = self._server_store.get_recipe_file_list(reference)
@@ -31,15 +30,15 @@ class ConanServiceV2(object):
 
     def get_conanfile_file(self, reference, filename, auth_user):
         self._authorizer.check_read_conan(auth_user, reference)
+        reference = self._server_store.proxy_recipe(reference)
         path = self._server_store.get_conanfile_file_path(reference, filename)
-        return static_file(os.path.basename(path), root=os.path.dirname(path),
-                           mimetype=get_mime_type(path))
+        return self._file_sender(path)
 
-    def upload_recipe_file(self, body, headers, reference, filename, auth_user):
+    def upload_recipe_file(self, body, size, reference, filename, auth_user, deploy_sha1=None):
         self._authorizer.check_write_conan(auth_user, reference)
         # FIXME: Check that reference contains revision (MANDATORY TO UPLOAD)
         path = self._server_store.get_conanfile_file_path(reference, filename)
-        self._upload_to_path(body, headers, path)
+        self._upload_to_path(body, size, path, deploy_sha1)
 
         # If the upload was ok, update the pointer to the latest
         self._server_store.update_last_revision(reference)
@@ -47,6 +46,7 @@ class ConanServiceV2(object):
     # PACKAGE METHODS
     def get_package_file_list(self, p_reference, auth_user):
         self._authorizer.check_read_conan(auth_user, p_reference.conan)
+        p_reference = self._server_store.proxy_package(p_reference)
         file_list = self._server_store.get_package_file_list(p_reference)
         if not file_list:
             raise NotFoundException("conanfile not found")
@@ -60,11 +60,12 @@ class ConanServiceV2(object):
 
     def get_package_file(self, p_reference, filename, auth_user):
         self._authorizer.check_read_conan(auth_user, p_reference.conan)
+        p_reference = self._server_store.proxy_package(p_reference)
         path = self._server_store.get_package_file_path(p_reference, filename)
-        return static_file(os.path.basename(path), root=os.path.dirname(path),
-                           mimetype=get_mime_type(path))
+        return self._file_sender(path)
 
-    def upload_package_file(self, body, headers, p_reference, filename, auth_user):
+    def upload_package_file(self, body, size, p_reference, filename, auth_user,
+                            deploy_sha1=None):
         self._authorizer.check_write_conan(auth_user, p_reference.conan)
         # FIXME: Check that reference contains revisions (MANDATORY TO UPLOAD)
 
@@ -76,19 +77,17 @@ class ConanServiceV2(object):
                                     "remote" % (str(p_reference.conan),
                                                 str(p_reference.conan.revision)))
         path = self._server_store.get_package_file_path(p_reference, filename)
-        self._upload_to_path(body, headers, path)
+        self._upload_to_path(body, size, path, deploy_sha1)
 
         # If the upload was ok, update the pointer to the latest
         self._server_store.update_last_package_revision(p_reference)
 
     # Misc
-    @staticmethod
-    def _upload_to_path(body, headers, path):
-        file_saver = FileUpload(body, None,
-                                filename=os.path.basename(path),
-                                headers=headers)
-        if os.path.exists(path):
-            os.unlink(path)
-        if not os.path.exists(os.path.dirname(path)):
-            mkdir(os.path.dirname(path))
-        file_saver.save(os.path.dirname(path))
+    def _upload_to_path(self, body, size, path, deploy_sha1):
+        """ With deploy_sha1 (X-Checksum-Sha1 header), the file is not uploaded, it is stored from
+        the contents with that sha1 if the server has them, raising NotFoundException if not
+        """
+        if deploy_sha1 is None:
+            self._server_store.write_file(path, body, size)
+        elif not self._server_store.deploy_file_checksum(path, deploy_sha1):
+            raise NotFoundException("Checksum not found: %s" % deploy_sha1)
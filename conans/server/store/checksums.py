@@ -0,0 +1,199 @@
+import hashlib
+import json
+import os
+import threading
+import uuid
+
+from conans.errors import RequestErrorException
+from conans.server.store.server_store import REVISIONS_FILE
+from conans.util.files import load, mkdir, walk
+from conans.util.log import logger
+
+# The checksums of each stored file are saved next to it, in "<file>.checksums"
+CHECKSUMS_EXTENSION = ".checksums"
+_UPLOAD_EXTENSION = ".upload"
+_BLOCK_SIZE = 1024 * 1024
+
+
+def is_storage_file(path):
+    """ False for the checksums files and the uploads in progress """
+    return not path.endswith((CHECKSUMS_EXTENSION, _UPLOAD_EXTENSION))
+
+
+def checksums_path(path):
+    return path + CHECKSUMS_EXTENSION
+
+
+def load_checksums(path):
+    """ The saved {"md5": .., "sha1": .., "size": .., "mtime": ..} of the file, None if not
+    available or saved for a different version of the file (changed size or mtime)
+    """
+    try:
+        checksums = json.loads(load(checksums_path(path)))
+        stat = os.stat(path)
+    except (IOError, OSError, ValueError):
+        return None
+    if checksums.get("size") != stat.st_size or checksums.get("mtime") != stat.st_mtime:
+        return None
+    return checksums
+
+
+def save_checksums(path, md5, sha1, stat):
+    """ stat is the os.stat() of the file taken before computing the checksums, if the file is
+    replaced meanwhile, the saved checksums won't be valid for the new one
+    """
+    checksums = {"md5": md5, "sha1": sha1, "size": stat.st_size, "mtime": stat.st_mtime}
+    contents = json.dumps(checksums).encode()
+    _write_atomic(checksums_path(path), lambda handle: handle.write(contents))
+    return checksums
+
+
+def compute_checksums(path):
+    """ md5 and sha1 of the file, reading it once """
+    md5, sha1 = hashlib.md5(), hashlib.sha1()
+    with open(path, "rb") as handle:
+        while True:
+            block = handle.read(_BLOCK_SIZE)
+            if not block:
+                break
+            md5.update(block)
+            sha1.update(block)
+    return md5.hexdigest(), sha1.hexdigest()
+
+
+def get_checksums(path):
+    """ The saved checksums of the file, computing and saving them if not available, for the
+    files stored before the checksums were saved or modified out of the server
+    """
+    checksums = load_checksums(path)
+    if checksums is None:
+        stat = os.stat(path)
+        md5, sha1 = compute_checksums(path)
+        checksums = save_checksums(path, md5, sha1, stat)
+    return checksums
+
+
+def remove_checksums(path):
+    try:
+        os.remove(checksums_path(path))
+    except OSError:
+        pass
+
+
+def _rename(src, dst):
+    try:
+        os.rename(src, dst)
+    except OSError:  # Windows doesn't replace existing files
+        if not os.path.exists(dst):
+            raise
+        os.remove(dst)
+        os.rename(src, dst)
+
+
+def _write_atomic(path, write):
+    folder = os.path.dirname(path)
+    mkdir(folder)
+    tmp_path = os.path.join(folder, ".%s.%s%s" % (os.path.basename(path), uuid.uuid4().hex,
+                                                  _UPLOAD_EXTENSION))
+    # Not mkstemp(), the files have to keep the default permissions
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0),
+                 0o666)
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            result = write(handle)
+        _rename(tmp_path, path)
+        return result
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_stream(stream, path, size=None):
+    """ Writes the stream to the file in blocks, computing the md5 and sha1 while writing, and
+    saves them next to the file. The file is replaced atomically, a failed or in progress
+    upload never leaves a partial file. With 'size', only that amount of bytes is read, and
+    RequestErrorException is raised if the stream ends before.
+    :return: the checksums dict
+    """
+    def write(handle):
+        md5, sha1 = hashlib.md5(), hashlib.sha1()
+        written = 0
+        while size is None or written < size:
+            block_size = _BLOCK_SIZE if size is None else min(_BLOCK_SIZE, size - written)
+            block = stream.read(block_size)
+            if not block:
+                break
+            handle.write(block)
+            md5.update(block)
+            sha1.update(block)
+            written += len(block)
+        if size is not None and written != size:
+            raise RequestErrorException("Incomplete upload of '%s', received %d of %d bytes"
+                                        % (os.path.basename(path), written, size))
+        remove_checksums(path)  # The ones of the file being replaced
+        return md5.hexdigest(), sha1.hexdigest()
+
+    md5, sha1 = _write_atomic(path, write)
+    return save_checksums(path, md5, sha1, os.stat(path))
+
+
+def _is_artifact(filename):
+    """ The revisions files and the locks are rewritten in place, they are not checksummed """
+    return filename != REVISIONS_FILE and not filename.endswith(".lock")
+
+
+def scrub_checksums(storage_path):
+    """ Verifies the saved checksums of the stored artifacts (recipe and package files), reading
+    them again, and saves the missing ones. The files deduplicated as hardlinks of the same blob
+    are read once.
+    :return: the list of corrupted files, whose contents don't match their saved checksums
+    """
+    corrupted = []
+    scrubbed = set()  # (device, inode) of the read files
+    for root, _, filenames in walk(storage_path):
+        for filename in filenames:
+            path = os.path.join(root, filename)
+            if not is_storage_file(path) or not _is_artifact(filename):
+                continue
+            try:
+                stat = os.stat(path)
+                if stat.st_nlink > 1:
+                    if (stat.st_dev, stat.st_ino) in scrubbed:
+                        continue
+                    scrubbed.add((stat.st_dev, stat.st_ino))
+                checksums = load_checksums(path)
+                if checksums is None:
+                    get_checksums(path)
+                    continue
+                md5, sha1 = compute_checksums(path)
+                if (md5, sha1) != (checksums["md5"], checksums["sha1"]) and \
+                        load_checksums(path) == checksums:  # Not replaced while reading
+                    logger.error("Corrupted file in the storage, checksums don't match: %s"
+                                 % path)
+                    corrupted.append(path)
+            except (IOError, OSError):  # Removed while scrubbing
+                continue
+    return corrupted
+
+
+class ChecksumsScrubber(threading.Thread):
+    """ Runs scrub_checksums() over the storage every 'interval' seconds, in the background """
+
+    def __init__(self, storage_path, interval):
+        super(ChecksumsScrubber, self).__init__(name="ChecksumsScrubber")
+        self.daemon = True
+        self.storage_path = storage_path
+        self.interval = interval
+        self.corrupted = []
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.corrupted = scrub_checksums(self.storage_path)
+            except Exception as exc:
+                logger.error("Error scrubbing the storage checksums: %s" % str(exc))
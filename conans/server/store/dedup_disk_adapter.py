@@ -0,0 +1,107 @@
+import errno
+import os
+import re
+import uuid
+
+from conans.errors import NotFoundException
+from conans.server.store.checksums import get_checksums, is_storage_file, load_checksums, \
+    remove_checksums, save_checksums
+from conans.server.store.disk_adapter import ServerDiskAdapter
+from conans.util.files import mkdir, path_exists, walk
+from conans.util.log import logger
+
+BLOBS_FOLDER = ".blobs"
+_SHA1_PATTERN = re.compile(r"^[0-9a-f]{40}$")
+
+
+class ServerDedupDiskAdapter(ServerDiskAdapter):
+    """ Disk storage that keeps a single copy of each different file content. The stored files
+    are hardlinks to a blob named by the sha1 of the contents (.blobs/<sha1[:2]>/<sha1>), the
+    number of links of the blob is its reference count: the blobs are removed when no stored
+    file points to them anymore.
+    Files with a content already stored can be deployed just with their sha1, without uploading
+    them again.
+    """
+
+    def _blob_path(self, sha1):
+        return os.path.join(self._store_folder, BLOBS_FOLDER, sha1[:2], sha1)
+
+    def _link(self, src, dst):
+        """ Replaces dst by a hardlink to src, atomically """
+        tmp = "%s.%s.upload" % (dst, uuid.uuid4().hex)
+        os.link(src, tmp)
+        try:
+            os.rename(tmp, dst)
+        except OSError:
+            if os.path.exists(dst):  # Windows doesn't replace existing files
+                os.remove(dst)
+                os.rename(tmp, dst)
+            else:
+                os.remove(tmp)
+                raise
+
+    def write_stream(self, stream, path, size=None):
+        checksums = super(ServerDedupDiskAdapter, self).write_stream(stream, path, size)
+        blob = self._blob_path(checksums["sha1"])
+        mkdir(os.path.dirname(blob))
+        try:
+            try:
+                os.link(path, blob)  # New contents, the uploaded file is the blob
+                save_checksums(blob, checksums["md5"], checksums["sha1"], os.stat(blob))
+                return checksums
+            except OSError as e:
+                if e.errno != errno.EEXIST:
+                    raise
+            self._link(blob, path)
+            return save_checksums(path, checksums["md5"], checksums["sha1"], os.stat(path))
+        except (OSError, AttributeError) as e:  # No hardlinks (AttributeError: py2 in Windows)
+            logger.warning("Cannot deduplicate '%s': %s" % (path, str(e)))
+            return checksums
+
+    def deploy_checksum(self, path, sha1):
+        sha1 = (sha1 or "").lower()
+        if not _SHA1_PATTERN.match(sha1):
+            return False
+        blob = self._blob_path(sha1)
+        try:
+            checksums = get_checksums(blob)
+            mkdir(os.path.dirname(path))
+            remove_checksums(path)
+            self._link(blob, path)
+            save_checksums(path, checksums["md5"], sha1, os.stat(path))
+            return True
+        except (IOError, OSError, AttributeError):  # Not stored (or removed meanwhile)
+            return False
+
+    def _stored_blobs(self, paths):
+        blobs = set()
+        for path in paths:
+            checksums = load_checksums(path)  # The linked files always have them
+            if checksums:
+                blobs.add(self._blob_path(checksums["sha1"]))
+        return blobs
+
+    def _release_blobs(self, blobs):
+        for blob in blobs:
+            try:
+                if os.stat(blob).st_nlink == 1:
+                    os.remove(blob)
+                    remove_checksums(blob)
+            except OSError:
+                pass
+
+    def delete_folder(self, path):
+        if not path_exists(path, self._store_folder):
+            raise NotFoundException("")
+        paths = [os.path.join(root, filename) for root, _, filenames in walk(path)
+                 for filename in filenames if is_storage_file(filename)]
+        blobs = self._stored_blobs(paths)
+        super(ServerDedupDiskAdapter, self).delete_folder(path)
+        self._release_blobs(blobs)
+
+    def delete_file(self, path):
+        if not path_exists(path, self._store_folder):
+            raise NotFoundException("")
+        blobs = self._stored_blobs([path])
+        super(ServerDedupDiskAdapter, self).delete_file(path)
+        self._release_blobs(blobs)
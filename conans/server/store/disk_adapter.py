@@ -1,12 +1,28 @@
 import os
+import threading
+from contextlib import contextmanager
 
 import fasteners
 
-from conans.client.tools.env import no_op
 from conans.errors import NotFoundException
 from conans.paths import SimplePaths
+from conans.server.store.checksums import get_checksums, is_storage_file, remove_checksums, \
+    write_stream
 from conans.server.store.server_store import REVISIONS_FILE
-from conans.util.files import decode_text, md5sum, path_exists, relative_dirs, rmdir
+from conans.util.files import decode_text, path_exists, relative_dirs, rmdir
+
+# The interprocess locks do not exclude the threads of the same process
+_thread_locks = [threading.Lock() for _ in range(64)]
+
+
+@contextmanager
+def _file_lock(lock_file):
+    if not lock_file:
+        yield
+        return
+    with _thread_locks[hash(lock_file) % len(_thread_locks)]:
+        with fasteners.InterProcessLock(lock_file):
+            yield
 
 
 class ServerDiskAdapter(object):
@@ -61,21 +77,31 @@ class ServerDiskAdapter(object):
     def _get_paths(self, absolute_path, files_subset):
         if not path_exists(absolute_path, self._store_folder):
             raise NotFoundException("")
-        paths = relative_dirs(absolute_path)
+        paths = [path for path in relative_dirs(absolute_path) if is_storage_file(path)]
         if files_subset is not None:
             paths = set(paths).intersection(set(files_subset))
         abs_paths = [os.path.join(absolute_path, relpath) for relpath in paths]
         return abs_paths
 
     def get_snapshot(self, absolute_path="", files_subset=None):
-        """returns a dict with the filepaths and md5"""
+        """returns a dict with the filepaths and md5, the ones saved with the files"""
         abs_paths = self._get_paths(absolute_path, files_subset)
-        return {filepath: md5sum(filepath) for filepath in abs_paths}
+        return {filepath: get_checksums(filepath)["md5"] for filepath in abs_paths}
 
     def get_file_list(self, absolute_path="", files_subset=None):
         abs_paths = self._get_paths(absolute_path, files_subset)
         return abs_paths
 
+    def write_stream(self, stream, path, size=None):
+        """ Stores the contents of the stream in path, see checksums.write_stream() """
+        return write_stream(stream, path, size)
+
+    def deploy_checksum(self, path, sha1):
+        """ Stores in path the already stored contents with that sha1, returning False if there
+        aren't. Only for storages that index the files by their checksum
+        """
+        return False
+
     def delete_folder(self, path):
         '''Delete folder from disk. Path already contains base dir'''
         if not path_exists(path, self._store_folder):
@@ -87,6 +113,7 @@ class ServerDiskAdapter(object):
         if not path_exists(path, self._store_folder):
             raise NotFoundException("")
         os.remove(path)
+        remove_checksums(path)
 
     def delete_empty_dirs(self, deleted_refs):
         paths = SimplePaths(self._store_folder)
@@ -107,15 +134,38 @@ class ServerDiskAdapter(object):
     def path_exists(self, path):
         return os.path.exists(path)
 
+    def get_file_stamp(self, path):
+        """ (mtime in nanoseconds, size), that changes when the file is modified, None if it
+        doesn't exist """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return getattr(stat, "st_mtime_ns", None) or int(stat.st_mtime * 1e9), stat.st_size
+
     def read_file(self, path, lock_file):
-        with fasteners.InterProcessLock(lock_file) if lock_file else no_op():
+        with _file_lock(lock_file):
             with open(path) as f:
                 return f.read()
 
     def write_file(self, path, contents, lock_file):
-        with fasteners.InterProcessLock(lock_file) if lock_file else no_op():
+        with _file_lock(lock_file):
             with open(path, "w") as f:
                 f.write(contents)
 
+    def update_file(self, path, update, lock_file):
+        """ Writes update(contents) to the file, contents being None if the file doesn't exist,
+        without other reads or writes in between. Nothing is written if update returns None
+        """
+        with _file_lock(lock_file):
+            contents = None
+            if os.path.exists(path):
+                with open(path) as f:
+                    contents = f.read()
+            contents = update(contents)
+            if contents is not None:
+                with open(path, "w") as f:
+                    f.write(contents)
+
     def base_storage_folder(self):
         return self._store_folder
@@ -0,0 +1,258 @@
+""" Pull-through proxy mode of conan_server: the recipes, packages and searches that are not in
+the storage are requested to an upstream conan_server, and the fetched recipes and packages are
+stored to serve the next requests without asking the upstream again.
+"""
+import os
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+import requests
+
+from conans.client.rest.rest_client_v2 import RestV2Methods
+from conans.errors import AuthenticationException, ConanConnectionError, ConanException, \
+    ForbiddenException, NotFoundException
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.server.store.server_store import ServerStore
+from conans.util.files import rmdir
+from conans.util.log import logger
+
+# Expired answers are purged when there are more than these
+_MAX_ANSWERS = 10000
+
+
+class _TimeoutRequester(object):
+    """ Adds the timeout to all the requests of the session, as the ConanRequester of the client
+    """
+
+    def __init__(self, requester, timeout):
+        self._requester = requester
+        self._timeout = timeout
+
+    def get(self, url, **kwargs):
+        return self._call("get", url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self._call("put", url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self._call("delete", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self._call("post", url, **kwargs)
+
+    def _call(self, method, url, **kwargs):
+        if self._timeout:
+            kwargs.setdefault("timeout", self._timeout)
+        return getattr(self._requester, method)(url, **kwargs)
+
+
+class _KeyedLocks(object):
+    """ A lock per key, existing while some thread holds it or waits for it """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._locks = {}  # {key: [lock, holders and waiters]}
+
+    @contextmanager
+    def hold(self, key):
+        with self._lock:
+            entry = self._locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._locks[key]
+
+
+class UpstreamRemote(object):
+    """ The conan_server the proxy fetches from, with the REST API v2 of the client (the upstream
+    has to support revisions). The mutable answers, latest revisions and searches, are reused
+    'ttl' seconds, the negative ones too. The concurrent requests for the same answer wait for a
+    single upstream request. After a failure (the upstream is down, or doesn't answer in
+    'timeout' seconds), the requests fail without asking the upstream for 'failure_ttl' seconds
+    """
+
+    def __init__(self, url, user=None, password=None, ttl=60, requester=None, verify_ssl=True,
+                 timeout=30, failure_ttl=5):
+        self.url = url
+        self._user = user
+        self._password = password
+        self._ttl = ttl
+        self._failure_ttl = failure_ttl
+        self._requester = _TimeoutRequester(requester or requests.Session(), timeout)
+        self._verify_ssl = verify_ssl
+        self._token = None
+        self._answers = {}  # {key: (time, answer)}
+        self._locks = _KeyedLocks()
+        self._failure = None  # (time, error message) of the last failed request
+
+    def _call(self, method, v2_compatibility_mode=False):
+        """ Returns method(api), failing without requesting the upstream if it failed recently """
+        failure = self._failure
+        if failure and time.time() - failure[0] < self._failure_ttl:
+            raise ConanConnectionError("Upstream %s failed %.1f seconds ago: %s"
+                                       % (self.url, time.time() - failure[0], failure[1]))
+        try:
+            return self._authenticated_call(method, v2_compatibility_mode)
+        except (NotFoundException, AuthenticationException, ForbiddenException):
+            raise  # Answers of the upstream
+        except (ConanException, requests.exceptions.RequestException) as e:
+            self._failure = time.time(), str(e)
+            raise
+
+    def _authenticated_call(self, method, v2_compatibility_mode):
+        """ Returns method(api), authenticating if the upstream requires it """
+        def api():
+            headers = {"V2_COMPATIBILITY_MODE": "1" if v2_compatibility_mode else "0"}
+            return RestV2Methods(self.url, self._token, headers, None, self._requester,
+                                 self._verify_ssl, parallel_transfers=4)
+        try:
+            return method(api())
+        except AuthenticationException:
+            if not self._user:
+                raise
+            self._token = api().authenticate(self._user, self._password)
+            return method(api())
+
+    def _cached(self, key, method, v2_compatibility_mode=False):
+        """ The answer of method(api), None if not found, reused 'ttl' seconds """
+        with self._locks.hold(key):
+            now = time.time()
+            answer = self._answers.get(key)
+            if answer and now - answer[0] < self._ttl:
+                return answer[1]
+            try:
+                result = self._call(method, v2_compatibility_mode)
+            except NotFoundException:
+                result = None
+            if len(self._answers) > _MAX_ANSWERS:
+                self._answers = {k: v for k, v in self._answers.items()
+                                 if now - v[0] < self._ttl}
+            self._answers[key] = now, result
+            return result
+
+    def latest_recipe(self, reference):
+        """ The reference with the revision of the upstream, the latest one if not specified """
+        def method(api):
+            data = api.get_json(api.conans_router.recipe_snapshot(reference))
+            return ConanFileReference.loads(data["reference"])
+        return self._cached(("recipe", reference.full_repr()), method)
+
+    def latest_package(self, p_reference):
+        """ The package reference with the revisions of the upstream, the latest ones if not
+        specified """
+        def method(api):
+            data = api.get_json(api.conans_router.package_snapshot(p_reference))
+            return PackageReference.loads(data["reference"])
+        return self._cached(("package", p_reference.full_repr()), method)
+
+    def search(self, pattern, ignorecase):
+        return self._cached(("search", pattern, ignorecase),
+                            lambda api: api.search(pattern, ignorecase))
+
+    def search_packages(self, reference, query, v2_compatibility_mode):
+        return self._cached(("packages", reference.full_repr(), query, v2_compatibility_mode),
+                            lambda api: api.search_packages(reference, query),
+                            v2_compatibility_mode)
+
+    def get_recipe(self, reference, dest_folder):
+        """ Downloads all the files of the recipe revision, also the sources """
+        def method(api):
+            api.get_recipe(reference, dest_folder)
+            api.get_recipe_sources(reference, dest_folder)
+        self._call(method)
+
+    def get_package(self, p_reference, dest_folder):
+        self._call(lambda api: api.get_package(p_reference, dest_folder))
+
+
+class ProxyServerStore(ServerStore):
+    """ ServerStore that fetches the recipes and packages not in the storage from the upstream
+    when they are read. The latest revisions are the upstream ones, or the stored ones if the
+    upstream doesn't have the reference or can't be reached. Each recipe or package revision is
+    fetched once, the concurrent requests for it wait for the first one.
+    """
+
+    def __init__(self, storage_adapter, upstream):
+        super(ProxyServerStore, self).__init__(storage_adapter)
+        self.upstream = upstream
+        self._fetching = _KeyedLocks()
+
+    def _ask_upstream(self, method, *args):
+        try:
+            return method(*args)
+        except (ConanException, requests.exceptions.RequestException) as e:
+            logger.warning("PROXY: Error requesting %s: %s" % (self.upstream.url, str(e)))
+            return None
+
+    def proxy_recipe(self, reference):
+        if reference.revision and self.path_exists(self.export(reference)):
+            return reference  # The revisions don't change
+        upstream_ref = self._ask_upstream(self.upstream.latest_recipe, reference)
+        if upstream_ref is None:
+            return reference
+        self._store_recipe(upstream_ref, latest=not reference.revision)
+        return upstream_ref
+
+    def _store_recipe(self, reference, latest):
+        """ Fetches the recipe revision if not stored. Only the latest revisions of the upstream
+        are recorded as the latest ones, not the pinned revisions requested by the clients
+        """
+        if self._fetch(self.export(reference), self.upstream.get_recipe, reference) and latest:
+            self.update_last_revision(reference)
+
+    def proxy_package(self, p_reference):
+        if p_reference.revision and p_reference.conan.revision and \
+                self.path_exists(self.package(p_reference)):
+            return p_reference
+        upstream_pref = self._ask_upstream(self.upstream.latest_package, p_reference)
+        if upstream_pref is None:
+            return p_reference
+        self._store_recipe(upstream_pref.conan, latest=not p_reference.conan.revision)
+        if self._fetch(self.package(upstream_pref), self.upstream.get_package, upstream_pref) \
+                and not p_reference.revision:
+            self.update_last_package_revision(upstream_pref)
+        return upstream_pref
+
+    def upstream_recipes(self, pattern, ignorecase):
+        return self._ask_upstream(self.upstream.search, pattern, ignorecase) or []
+
+    def upstream_packages(self, reference, query, v2_compatibility_mode):
+        return self._ask_upstream(self.upstream.search_packages, reference, query,
+                                  v2_compatibility_mode)
+
+    def _fetch(self, folder, download, reference):
+        """ Stores the files of the reference in the folder, if it doesn't exist. They are written
+        through the storage adapter in a temporary folder renamed at the end, so the requests
+        never see a partial recipe or package. Returns if the folder exists
+        """
+        if self.path_exists(folder):
+            return True
+        with self._fetching.hold(folder):
+            if self.path_exists(folder):  # Fetched by a concurrent request
+                return True
+            download_folder = tempfile.mkdtemp(suffix="conan_proxy")
+            tmp_folder = "%s.proxy-%s" % (folder, uuid.uuid4().hex)
+            try:
+                download(reference, download_folder)
+                for filename in os.listdir(download_folder):
+                    with open(os.path.join(download_folder, filename), "rb") as stream:
+                        self.write_file(os.path.join(tmp_folder, filename), stream)
+                os.rename(tmp_folder, folder)
+            except (ConanException, requests.exceptions.RequestException) as e:
+                logger.warning("PROXY: Error fetching %s from %s: %s"
+                               % (reference.full_repr(), self.upstream.url, str(e)))
+                return False
+            finally:
+                rmdir(download_folder)
+                if os.path.exists(tmp_folder):
+                    rmdir(tmp_folder)
+            logger.info("PROXY: Fetched %s from %s" % (reference.full_repr(), self.upstream.url))
+            return True
@@ -1,4 +1,7 @@
 import os
+import threading
+import time
+from collections import OrderedDict
 from os.path import join, normpath, relpath
 
 from conans import DEFAULT_REVISION_V1
@@ -8,6 +11,11 @@ from conans.paths import EXPORT_FOLDER, PACKAGES_FOLDER, SimplePaths
 from conans.server.revision_list import RevisionList
 
 REVISIONS_FILE = "revisions.txt"
+# Revisions files modified this recently are not cached, they could be rewritten within the
+# timestamp resolution of the filesystem without changing their size and mtime
+_RACY_INTERVAL = 2
+# Maximum number of parsed revisions files cached, the least recently used are evicted
+_REVISIONS_CACHE_ENTRIES = 4096
 
 
 class ServerStore(SimplePaths):
@@ -15,6 +23,10 @@ class ServerStore(SimplePaths):
     def __init__(self, storage_adapter):
         super(ServerStore, self).__init__(storage_adapter.base_storage_folder())
         self._storage_adapter = storage_adapter
+        # {rev_file_path: (file_stamp, RevisionList)}, the LRU first, the parsed revisions files
+        # while they don't change in disk, also by other processes
+        self._revisions_cache = OrderedDict()
+        self._revisions_lock = threading.Lock()
 
     def conan(self, reference, resolve_latest=True):
         reference = self.ref_with_rev(reference) if resolve_latest else reference
@@ -47,6 +59,33 @@ class ServerStore(SimplePaths):
     def path_exists(self, path):
         return self._storage_adapter.path_exists(path)
 
+    # ############ PULL-THROUGH PROXY (see proxy_store.ProxyServerStore)
+    upstream = None
+
+    def proxy_recipe(self, reference):
+        """ Called before reading a recipe, returns the reference to read. The proxy stores
+        fetch it from the upstream if it is not stored """
+        return reference
+
+    def proxy_package(self, p_reference):
+        """ Called before reading a package, returns the package reference to read """
+        return p_reference
+
+    def upstream_recipes(self, pattern, ignorecase):
+        """ The references of the upstream matching the pattern """
+        return []
+
+    def upstream_packages(self, reference, query, v2_compatibility_mode):
+        """ The upstream packages of the reference as search_packages(), None if not found """
+        return None
+
+    def write_file(self, path, stream, size=None):
+        return self._storage_adapter.write_stream(stream, path, size)
+
+    def deploy_file_checksum(self, path, sha1):
+        """ Stores the file from the already stored contents with that sha1, if possible """
+        return self._storage_adapter.deploy_checksum(path, sha1)
+
     # ############ SNAPSHOTS (APIv1)
     def get_recipe_snapshot(self, reference):
         """Returns a {filepath: md5} """
@@ -236,17 +275,26 @@ class ServerStore(SimplePaths):
         self._update_last_revision(rev_file_path, p_reference)
 
     def _update_last_revision(self, rev_file_path, reference):
-        if self._storage_adapter.path_exists(rev_file_path):
-            rev_file = self._storage_adapter.read_file(rev_file_path,
-                                                       lock_file=rev_file_path + ".lock")
-            rev_list = RevisionList.loads(rev_file)
-        else:
-            rev_list = RevisionList()
         if reference.revision is None:
             raise ConanException("Invalid revision for: %s" % reference.full_repr())
-        rev_list.add_revision(reference.revision)
-        self._storage_adapter.write_file(rev_file_path, rev_list.dumps(),
-                                         lock_file=rev_file_path + ".lock")
+
+        # Each uploaded file updates the revision, only the first one has to write it
+        rev_list = self._get_revisions(rev_file_path)
+        latest = rev_list.latest_revision() if rev_list else None
+        if latest and latest.revision == reference.revision:
+            return
+
+        def add_revision(rev_file):
+            rev_list = RevisionList.loads(rev_file) if rev_file else RevisionList()
+            latest = rev_list.latest_revision()
+            if latest and latest.revision == reference.revision:
+                return None
+            rev_list.add_revision(reference.revision)
+            return rev_list.dumps()
+
+        self._storage_adapter.update_file(rev_file_path, add_revision,
+                                          lock_file=rev_file_path + ".lock")
+        self._forget_revisions(rev_file_path)
 
     def get_package_revisions(self, p_reference):
         assert p_reference.conan.revision is not None
@@ -255,13 +303,34 @@ class ServerStore(SimplePaths):
         return ret.items()
 
     def _get_revisions(self, rev_file_path):
-        if self._storage_adapter.path_exists(rev_file_path):
+        """ The returned RevisionList can be cached, it must not be modified """
+        stamp = self._storage_adapter.get_file_stamp(rev_file_path)
+        if stamp is None:
+            return None
+        with self._revisions_lock:
+            cached = self._revisions_cache.pop(rev_file_path, None)
+            if cached:
+                self._revisions_cache[rev_file_path] = cached  # Now the most recently used
+        if cached and cached[0] == stamp:
+            return cached[1]
+        try:
             rev_file = self._storage_adapter.read_file(rev_file_path,
                                                        lock_file=rev_file_path + ".lock")
-            rev_list = RevisionList.loads(rev_file)
-            return rev_list
-        else:
+        except (IOError, OSError):  # Removed meanwhile
             return None
+        rev_list = RevisionList.loads(rev_file)
+        # A write between the stamp and the read just makes the next call read it again
+        if stamp[0] < (time.time() - _RACY_INTERVAL) * 1e9:
+            with self._revisions_lock:
+                self._revisions_cache.pop(rev_file_path, None)
+                self._revisions_cache[rev_file_path] = stamp, rev_list
+                while len(self._revisions_cache) > _REVISIONS_CACHE_ENTRIES:
+                    self._revisions_cache.popitem(last=False)
+        return rev_list
+
+    def _forget_revisions(self, rev_file_path):
+        with self._revisions_lock:
+            self._revisions_cache.pop(rev_file_path, None)
 
     def _get_latest_revision(self, rev_file_path):
         rev_list = self._get_revisions(rev_file_path)
@@ -273,6 +342,7 @@ class ServerStore(SimplePaths):
                 rev_list.add_revision(DEFAULT_REVISION_V1)
                 self._storage_adapter.write_file(rev_file_path, rev_list.dumps(),
                                                  lock_file=rev_file_path + ".lock")
+                self._forget_revisions(rev_file_path)
                 return DEFAULT_REVISION_V1
             else:
                 return None
@@ -299,18 +369,15 @@ class ServerStore(SimplePaths):
         return reference.copy_with_rev(latest.revision)
 
     def get_revision_time(self, reference):
-        try:
-            rev_list = self._load_revision_list(reference)
-        except IOError:
+        rev_list = self._get_revisions(self._recipe_revisions_file(reference))
+        if rev_list is None:
             return None
         return rev_list.get_time(reference.revision)
 
     def get_package_revision_time(self, pref):
-        try:
-            rev_list = self._load_package_revision_list(pref)
-        except FileNotFoundError:
+        rev_list = self._get_revisions(self._package_revisions_file(pref))
+        if rev_list is None:
             return None
-
         return rev_list.get_time(pref.revision)
 
     def p_ref_with_rev(self, p_reference):
@@ -332,29 +399,21 @@ class ServerStore(SimplePaths):
         return ret.copy_with_revs(reference.revision, latest_p.revision)
 
     def _remove_revision_from_index(self, reference):
-        rev_list = self._load_revision_list(reference)
-        rev_list.remove_revision(reference.revision)
-        self._save_revision_list(rev_list, reference)
-
-    def _remove_package_revision_from_index(self, p_reference):
-        rev_list = self._load_package_revision_list(p_reference)
-        rev_list.remove_revision(p_reference.revision)
-        self._save_package_revision_list(rev_list, p_reference)
-
-    def _load_revision_list(self, reference):
-        path = self._recipe_revisions_file(reference)
-        rev_file = self._storage_adapter.read_file(path, lock_file=path + ".lock")
-        return RevisionList.loads(rev_file)
-
-    def _save_revision_list(self, rev_list, reference):
         path = self._recipe_revisions_file(reference)
-        self._storage_adapter.write_file(path, rev_list.dumps(), lock_file=path + ".lock")
+        self._remove_revision_from_file(path, reference.revision)
 
-    def _save_package_revision_list(self, rev_list, p_reference):
+    def _remove_package_revision_from_index(self, p_reference):
         path = self._package_revisions_file(p_reference)
-        self._storage_adapter.write_file(path, rev_list.dumps(), lock_file=path + ".lock")
+        self._remove_revision_from_file(path, p_reference.revision)
+
+    def _remove_revision_from_file(self, rev_file_path, revision):
+        def remove_revision(rev_file):
+            if rev_file is None:
+                raise NotFoundException("Revision not found: '%s'" % revision)
+            rev_list = RevisionList.loads(rev_file)
+            rev_list.remove_revision(revision)
+            return rev_list.dumps()
 
-    def _load_package_revision_list(self, pref):
-        path = self._package_revisions_file(pref)
-        rev_file = self._storage_adapter.read_file(path, lock_file=path + ".lock")
-        return RevisionList.loads(rev_file)
+        self._storage_adapter.update_file(rev_file_path, remove_revision,
+                                          lock_file=rev_file_path + ".lock")
+        self._forget_revisions(rev_file_path)
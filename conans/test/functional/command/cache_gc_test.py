@@ -0,0 +1,165 @@
+import json
+import os
+import subprocess
+import sys
+import time
+import unittest
+
+from mock import patch
+
+from conans.client import cache_gc
+import conans
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.test.utils.test_files import temp_folder
+from conans.test.utils.tools import TestClient
+from conans.util.files import load, save
+
+conanfile = """import os
+from conans import ConanFile
+from conans.tools import save
+
+class Pkg(ConanFile):
+    settings = "build_type"
+
+    def build(self):
+        save("build.bin", "b" * 1000)
+
+    def package(self):
+        save(os.path.join(self.package_folder, "package.bin"), "p" * 100000)
+"""
+
+
+class CacheGCTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = TestClient()
+        self.client.save({"conanfile.py": conanfile})
+        self.prefs = []
+        for index, version in enumerate(("1.0", "1.1", "1.2")):
+            ref = ConanFileReference.loads("lib/%s@lasote/testing" % version)
+            self.client.run("create . %s -s build_type=Release" % str(ref))
+            package_id = self.client.client_cache.conan_packages(ref)[0]
+            pref = PackageReference(ref, package_id)
+            # lib/1.0 is the least recently used
+            used = time.time() - 1000 + index * 100
+            os.utime(self.client.client_cache.package(pref), (used, used))
+            os.utime(self.client.client_cache.build(pref), (used - 1, used - 1))
+            self.prefs.append(pref)
+
+    def _exists(self, pref):
+        return os.path.exists(self.client.client_cache.package(pref))
+
+    def gc_test(self):
+        self.client.run("cache gc --max-size=1G")
+        self.assertNotIn("Removed", self.client.out)
+
+        self.client.run("cache gc --max-size=250K")
+        self.assertIn("removing the least recently used packages", self.client.out)
+        self.assertIn("Removed build lib/1.0@lasote/testing:", self.client.out)
+        self.assertIn("Removed package lib/1.0@lasote/testing:", self.client.out)
+        self.assertFalse(self._exists(self.prefs[0]))
+        self.assertTrue(self._exists(self.prefs[1]))
+        self.assertTrue(self._exists(self.prefs[2]))
+
+        self.client.run("cache gc -s 1M")
+        self.assertNotIn("Removed", self.client.out)
+        self.client.run("cache gc -s 1X", assert_error=True)
+        self.assertIn("Invalid size '1X'", self.client.out)
+        self.client.run("cache gc", assert_error=True)
+        self.assertIn("Specify the max size", self.client.out)
+
+    def used_packages_test(self):
+        # Installing it is a use
+        self.client.run("install lib/1.0@lasote/testing")
+        self.client.run("cache gc -s 250K")
+        self.assertTrue(self._exists(self.prefs[0]))
+        self.assertFalse(self._exists(self.prefs[1]))
+
+        # Used by other process, e.g. building it
+        with self.client.client_cache.conanfile_read_lock(self.prefs[2].conan):
+            self.client.run("cache gc -s 150K")
+        self.assertTrue(self._exists(self.prefs[2]))
+        self.assertFalse(self._exists(self.prefs[0]))
+
+    def used_by_concurrent_build_test(self):
+        # Other process builds a consumer of lib/1.0, it doesn't hold any lock of lib/1.0
+        cwd = temp_folder()
+        started, release = os.path.join(cwd, "started"), os.path.join(cwd, "release")
+        save(os.path.join(cwd, "conanfile.py"), """import os, time
+from conans import ConanFile
+
+class Consumer(ConanFile):
+    requires = "lib/1.0@lasote/testing"
+    settings = "build_type"
+
+    def build(self):
+        open(os.environ["STARTED_FILE"], "w").close()
+        while not os.path.exists(os.environ["RELEASE_FILE"]):
+            time.sleep(0.1)
+""")
+        env = dict(os.environ)
+        env.update({"CONAN_USER_HOME": self.client.base_folder, "CONAN_NON_INTERACTIVE": "1",
+                    "STARTED_FILE": started, "RELEASE_FILE": release,
+                    "PYTHONPATH": os.path.dirname(os.path.dirname(
+                        os.path.abspath(conans.__file__)))})
+        proc = subprocess.Popen([sys.executable, "-c", "from conans.conan import run; run()",
+                                 "create", ".", "consumer/1.0@lasote/testing",
+                                 "-s", "build_type=Release"], cwd=cwd, env=env,
+                                stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        try:
+            for _ in range(600):
+                if os.path.exists(started) or proc.poll() is not None:
+                    break
+                time.sleep(0.1)
+            self.assertTrue(os.path.exists(started))
+            self.client.run("cache gc -s 150K")
+            self.assertTrue(self._exists(self.prefs[0]))
+            self.assertFalse(self._exists(self.prefs[1]))
+        finally:
+            save(release, "")
+            output = proc.communicate()[0].decode()
+        self.assertEqual(proc.returncode, 0, output)
+
+        # Released when the install ends
+        package_folder = self.client.client_cache.package(self.prefs[0])
+        os.utime(package_folder, (0, 0))
+        self.client.run("cache gc -s 50K")
+        self.assertFalse(self._exists(self.prefs[0]))
+
+    def max_size_conf_test(self):
+        self.client.run("config set storage.max_size=150K")
+        self.client.run("install lib/1.0@lasote/testing")
+        self.assertIn("removing the least recently used packages", self.client.out)
+        # The installed packages are kept
+        self.assertTrue(self._exists(self.prefs[0]))
+        self.assertFalse(self._exists(self.prefs[1]))
+        self.assertFalse(self._exists(self.prefs[2]))
+        self.client.run("cache gc")
+        self.assertNotIn("Removed package", self.client.out)
+
+    def size_estimate_test(self):
+        estimate_path = self.client.client_cache.store + cache_gc.SIZE_SUFFIX
+        self.client.run("config set storage.max_size=1G")
+        self.client.run("install lib/1.0@lasote/testing")
+        estimate = json.loads(load(estimate_path))
+        size, walked = estimate["size"], estimate["walked"]
+        self.assertGreater(size, 300000)
+
+        # The next installs only add the sizes of the written folders to the estimate
+        with patch.object(cache_gc, "cache_gc", wraps=cache_gc.cache_gc) as gc:
+            self.client.run("install lib/1.0@lasote/testing -s build_type=Debug --build")
+            self.assertEqual(gc.call_count, 0)
+            self.assertGreater(json.loads(load(estimate_path))["size"], size + 100000)
+
+            # Over the max size, walked and collected
+            save(estimate_path, json.dumps({"size": 2 * 1024 ** 3, "walked": walked - 600}))
+            self.client.run("install lib/1.0@lasote/testing")
+            self.assertEqual(gc.call_count, 1)
+            self.assertNotIn("Removed", self.client.out)
+            # Corrected by the walk
+            self.assertLess(json.loads(load(estimate_path))["size"], 1024 ** 3)
+
+            # Walked once a day to correct the estimate
+            save(estimate_path, json.dumps({"size": size, "walked": walked - 25 * 3600}))
+            self.client.run("install lib/1.0@lasote/testing")
+            self.assertEqual(gc.call_count, 2)
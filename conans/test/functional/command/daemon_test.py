@@ -0,0 +1,182 @@
+import os
+import socket
+import struct
+import subprocess
+import sys
+import threading
+import time
+import unittest
+
+from mock import patch
+
+import conans
+from conans.client import daemon as daemon_module
+from conans.client.daemon import ConanDaemon, daemon_file_path, forward_command, stop_daemon
+from conans.client.tools import environment_append
+from conans.test.utils.test_files import temp_folder
+from conans.util.files import load, save
+
+conanfile = """import os
+from conans import ConanFile
+
+class Pkg(ConanFile):
+    def source(self):
+        self.output.info("Daemon command: %s" % os.getenv("CONAN_NO_DAEMON"))
+        self.run('python -c "print(\\'Output of run\\')"')
+"""
+
+
+class DaemonTest(unittest.TestCase):
+
+    def setUp(self):
+        self.user_home = temp_folder()
+        self.env = {"CONAN_USER_HOME": self.user_home, "CONAN_NON_INTERACTIVE": "1"}
+
+    def _start_daemon(self):
+        daemon = ConanDaemon(self.user_home)
+        ready = threading.Event()
+        thread = threading.Thread(target=daemon.serve, kwargs={"on_ready": ready.set})
+        thread.daemon = True
+        thread.start()
+        self.assertTrue(ready.wait(60))
+        return thread
+
+    def _conan(self, args, cwd):
+        env = dict(os.environ)
+        env.update(self.env)
+        env["PYTHONPATH"] = os.path.dirname(os.path.dirname(os.path.abspath(conans.__file__)))
+        env.pop("CONAN_NO_DAEMON", None)
+        proc = subprocess.Popen([sys.executable, "-c", "from conans.conan import run; run()"]
+                                + args, cwd=cwd, env=env, stdout=subprocess.PIPE,
+                                stderr=subprocess.STDOUT)
+        output = proc.communicate()[0].decode()
+        return proc.returncode, output
+
+    def forwarded_commands_test(self):
+        thread = self._start_daemon()
+        cwd = temp_folder()
+        save(os.path.join(cwd, "conanfile.py"), conanfile)
+
+        exit_code, output = self._conan(["source", "."], cwd)
+        self.assertEqual(exit_code, 0)
+        self.assertIn("Daemon command: 1", output)
+        self.assertIn("Output of run", output)
+
+        exit_code, output = self._conan(["new", "hello/0.1", "--bare"], temp_folder())
+        self.assertEqual(exit_code, 0)
+        self.assertIn("File saved: conanfile.py", output)
+
+        exit_code, output = self._conan(["install", "missing/0.1@user/channel"], cwd)
+        self.assertEqual(exit_code, 1)
+        self.assertIn("ERROR: ", output)
+
+        exit_code, output = self._conan(["install", "--wrong-argument"], cwd)
+        self.assertEqual(exit_code, 2)
+
+        with environment_append(self.env):
+            self.assertTrue(stop_daemon())
+        thread.join(10)
+        self.assertFalse(thread.is_alive())
+        self.assertFalse(os.path.exists(daemon_file_path(self.user_home)))
+
+    def not_running_test(self):
+        with environment_append(self.env):
+            self.assertIsNone(forward_command(["--version"]))
+            self.assertFalse(stop_daemon())
+
+            # Killed without removing the file
+            save(daemon_file_path(self.user_home), '{"port": 1, "token": "token"}')
+            self.assertIsNone(forward_command(["--version"]))
+
+    def wrong_token_test(self):
+        thread = self._start_daemon()
+        daemon_file = daemon_file_path(self.user_home)
+        contents = load(daemon_file)
+        save(daemon_file, contents.replace('"token": "', '"token": "wrong'))
+        cwd = temp_folder()
+
+        with environment_append(self.env):
+            self.assertIsNone(forward_command(["new", "hello/0.1", "--bare"]))
+        self.assertEqual(os.listdir(cwd), [])
+
+        save(daemon_file, contents)
+        with environment_append(self.env):
+            self.assertTrue(stop_daemon())
+        thread.join(10)
+
+    def stalled_clients_test(self):
+        with patch.object(daemon_module, "_REQUEST_TIMEOUT", 0.2):
+            thread = self._start_daemon()
+            port = int(load(daemon_file_path(self.user_home)).split('"port": ')[1].split(",")[0])
+            silent = socket.create_connection(("127.0.0.1", port))
+            huge = socket.create_connection(("127.0.0.1", port))
+            huge.sendall(struct.pack(">cI", b"r", 4 * 1024 ** 3 - 1))
+            try:
+                with environment_append(self.env):
+                    self.assertTrue(stop_daemon())
+                thread.join(10)
+                self.assertFalse(thread.is_alive())
+            finally:
+                silent.close()
+                huge.close()
+
+    def busy_daemon_test(self):
+        # A daemon that never attends the requests, the command runs in the client process
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.bind(("127.0.0.1", 0))
+        server.listen(1)
+        try:
+            save(daemon_file_path(self.user_home),
+                 '{"port": %d, "token": "token"}' % server.getsockname()[1])
+            with patch.object(daemon_module, "_REQUEST_TIMEOUT", 0.2):
+                with environment_append(self.env):
+                    start = time.time()
+                    self.assertIsNone(forward_command(["--version"]))
+                    self.assertLess(time.time() - start, 5)
+        finally:
+            server.close()
+
+    def interrupted_client_test(self):
+        thread = self._start_daemon()
+        cwd = temp_folder()
+        save(os.path.join(cwd, "conanfile.py"), """import os, time
+from conans import ConanFile
+
+class Pkg(ConanFile):
+    def source(self):
+        open("started", "w").close()
+        for _ in range(600):
+            time.sleep(0.1)
+        open("finished", "w").close()
+""")
+        env = dict(os.environ)
+        env.update(self.env)
+        env["PYTHONPATH"] = os.path.dirname(os.path.dirname(os.path.abspath(conans.__file__)))
+        env.pop("CONAN_NO_DAEMON", None)
+        proc = subprocess.Popen([sys.executable, "-c", "from conans.conan import run; run()",
+                                 "source", "."], cwd=cwd, env=env, stdout=subprocess.PIPE,
+                                stderr=subprocess.STDOUT)
+        try:
+            for _ in range(600):
+                if os.path.exists(os.path.join(cwd, "started")):
+                    break
+                time.sleep(0.1)
+            self.assertTrue(os.path.exists(os.path.join(cwd, "started")))
+        finally:
+            proc.kill()
+            proc.communicate()
+
+        # The command of the killed client is interrupted, the daemon runs the next one
+        cwd2 = temp_folder()
+        save(os.path.join(cwd2, "conanfile.py"), conanfile)
+        start = time.time()
+        exit_code, output = self._conan(["source", "."], cwd2)
+        self.assertEqual(exit_code, 0)
+        self.assertIn("Daemon command: 1", output)
+        self.assertLess(time.time() - start, 30)
+        self.assertFalse(os.path.exists(os.path.join(cwd, "finished")))
+
+        with environment_append(self.env):
+            self.assertTrue(stop_daemon())
+        thread.join(10)
+        self.assertFalse(thread.is_alive())
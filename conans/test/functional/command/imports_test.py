@@ -1,10 +1,17 @@
 import os
+import platform
+import stat
 import unittest
 
+from mock import patch
+
+from conans.client import tools
 from conans.client.importer import IMPORTS_MANIFESTS
 from conans.model.manifest import FileTreeManifest
+from conans.model.ref import ConanFileReference
 from conans.test.utils.test_files import temp_folder
 from conans.test.utils.tools import TestClient
+from conans.util import files
 from conans.util.files import load, mkdir
 
 conanfile = """
@@ -212,3 +219,58 @@ class ConanLib(ConanFile):
         self.client.run("imports ./conanfile.txt")
         self.assertIn("file1.txt", os.listdir(self.client.current_folder))
         self.assertIn("file2.txt", os.listdir(self.client.current_folder))
+
+    @unittest.skipIf(platform.system() == "Windows", "Needs hardlinks")
+    def imports_link_files_test(self):
+        conanfile2 = """
+from conans import ConanFile
+
+class HelloReuseConan(ConanFile):
+    requires = "Hello/0.1@lasote/stable"
+
+    def imports(self):
+        self.copy("*1.txt")
+        self.copy("*2.txt", link_files=False)
+"""
+        self.client.save({"conanfile.py": conanfile2}, clean_first=True)
+        with tools.environment_append({"CONAN_LINK_COPIED_FILES": "1"}):
+            with patch.object(files, "_reflink", side_effect=OSError("Not supported")):
+                self.client.run("install . --build=missing")
+
+        ref = ConanFileReference.loads("Hello/0.1@lasote/stable")
+        packages = self.client.client_cache.packages(ref)
+        package_folder = os.path.join(packages, os.listdir(packages)[0])
+        builds = self.client.client_cache.builds(ref)
+        build_folder = os.path.join(builds, os.listdir(builds)[0])
+
+        def inode(folder, name):
+            return os.stat(os.path.join(folder, name)).st_ino
+
+        # package() and imports() hardlinked the files, except the one copied with link_files=False
+        self.assertEqual(inode(build_folder, "file1.txt"), inode(package_folder, "file1.txt"))
+        self.assertEqual(inode(build_folder, "file2.txt"), inode(package_folder, "file2.txt"))
+        self.assertEqual(inode(self.client.current_folder, "file1.txt"),
+                         inode(package_folder, "file1.txt"))
+        self.assertNotEqual(inode(self.client.current_folder, "file2.txt"),
+                            inode(package_folder, "file2.txt"))
+        self.assertEqual("World", load(os.path.join(self.client.current_folder, "file2.txt")))
+
+    @unittest.skipIf(platform.system() == "Windows", "Needs hardlinks")
+    def read_only_cache_link_files_test(self):
+        with tools.environment_append({"CONAN_LINK_COPIED_FILES": "1",
+                                       "CONAN_READ_ONLY_CACHE": "1"}):
+            with patch.object(files, "_reflink", side_effect=OSError("Not supported")):
+                self.client.run("install Hello/0.1@lasote/stable --build=missing")
+
+        ref = ConanFileReference.loads("Hello/0.1@lasote/stable")
+        packages = self.client.client_cache.packages(ref)
+        package_folder = os.path.join(packages, os.listdir(packages)[0])
+        builds = self.client.client_cache.builds(ref)
+        build_folder = os.path.join(builds, os.listdir(builds)[0])
+
+        # The read-only package files are copies, not hardlinks of the build ones
+        package_file = os.stat(os.path.join(package_folder, "file1.txt"))
+        build_file = os.stat(os.path.join(build_folder, "file1.txt"))
+        self.assertNotEqual(package_file.st_ino, build_file.st_ino)
+        self.assertFalse(package_file.st_mode & stat.S_IWRITE)
+        self.assertTrue(build_file.st_mode & stat.S_IWRITE)
@@ -0,0 +1,76 @@
+import os
+import unittest
+
+from mock import patch
+
+from conans.client import loader
+from conans.errors import ConanException
+from conans.model.ref import ConanFileReference
+from conans.test.utils.tools import TestClient, TestServer
+from conans.util.files import load
+
+conanfile = """from conans import ConanFile
+
+class Pkg(ConanFile):
+    settings = "build_type"
+
+    def package_info(self):
+        self.cpp_info.libs = ["lib_%s" % self.settings.build_type]
+"""
+
+
+class InstallProfilesTest(unittest.TestCase):
+
+    def setUp(self):
+        servers = {"default": TestServer()}
+        client = TestClient(servers=servers, users={"default": [("lasote", "mypass")]})
+        client.save({"conanfile.py": conanfile})
+        for version in ("1.0", "1.1", "2.0"):
+            client.run("create . lib/%s@lasote/testing -s build_type=Release" % version)
+        client.run("upload lib/* --all --confirm")
+
+        self.client = TestClient(servers=servers, users={"default": [("lasote", "mypass")]})
+        self.client.save({"conanfile.txt": "[requires]\nlib/[<2.0]@lasote/testing",
+                          "debug": "[settings]\nbuild_type=Debug",
+                          "release": "[settings]\nbuild_type=Release"})
+
+    def install_test(self):
+        api = self.client.get_conan_api()
+        with patch.object(loader, "parse_conanfile", wraps=loader.parse_conanfile) as parsed:
+            api.install(cwd=self.client.current_folder, build=["missing"],
+                        profile_names=["./debug", "./release"], install_folder="build")
+        out = str(self.client.user_io.out)
+        self.assertEqual(out.count("Trying with 'default'..."), 1)
+        self.assertEqual(out.count("Version range '<2.0' required by 'None' resolved to "
+                                   "'lib/1.1@lasote/testing'"), 2)
+        self.assertEqual(parsed.call_count, 1)
+        self.assertIn("lib/1.1@lasote/testing: Building your package", out)
+        self.assertIn("lib/1.1@lasote/testing: Retrieving package", out)
+
+        for build_type in ("debug", "release"):
+            folder = os.path.join(self.client.current_folder, "build", build_type)
+            self.assertIn("lib_%s" % build_type.capitalize(),
+                          load(os.path.join(folder, "conanbuildinfo.txt")))
+            self.assertIn("build_type=%s" % build_type.capitalize(),
+                          load(os.path.join(folder, "conaninfo.txt")))
+
+    def install_reference_test(self):
+        api = self.client.get_conan_api()
+        reference = ConanFileReference.loads("lib/2.0@lasote/testing")
+        api.install_reference(reference, cwd=self.client.current_folder,
+                              build=["missing"], update=True,
+                              profile_names=["./debug", "./release"])
+        out = str(self.client.user_io.out)
+        self.assertEqual(out.count("Trying with 'default'..."), 1)
+        self.assertIn("lib/2.0@lasote/testing: Building your package", out)
+        self.client.run("search lib/2.0@lasote/testing")
+        self.assertIn("build_type: Debug", self.client.out)
+        self.assertIn("build_type: Release", self.client.out)
+
+    def wrong_profiles_test(self):
+        api = self.client.get_conan_api()
+        with self.assertRaisesRegexp(ConanException, "Do not specify both"):
+            api.install(cwd=self.client.current_folder, profile_name="./debug",
+                        profile_names=["./release"])
+        with self.assertRaisesRegexp(ConanException, "same name can't be installed together"):
+            api.install(cwd=self.client.current_folder, profile_names=["./debug", "debug"])
@@ -0,0 +1,117 @@
+import os
+import unittest
+
+from conans.model.ref import ConanFileReference
+from conans.paths import EXPORT_SOURCES_TGZ_NAME, PACKAGE_TGZ_NAME
+from conans.test.utils.tools import TestClient, TestServer
+from conans.util.files import load
+
+conanfile = """from conans import ConanFile
+
+class Pkg(ConanFile):
+    settings = "build_type"
+    exports_sources = "*.h"
+
+    def package(self):
+        self.copy("*.h")
+"""
+
+
+def _files(folder):
+    return sorted(os.path.join(root, f) for root, _, files in os.walk(folder) for f in files)
+
+
+class LowerCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        # The lower store has the recipe and the Debug package, the remote the Release one
+        self.ref = ConanFileReference.loads("lib/1.0@lasote/testing")
+        servers = {"default": TestServer()}
+        lower = TestClient(servers=servers, users={"default": [("lasote", "mypass")]})
+        lower.save({"conanfile.py": conanfile, "header.h": "header"})
+        lower.run("create . lib/1.0@lasote/testing -s build_type=Release")
+        lower.run("upload lib/1.0@lasote/testing --all")
+        lower.run("remove lib/1.0@lasote/testing -p -f")
+        lower.run("create . lib/1.0@lasote/testing -s build_type=Debug")
+        self.lower = lower
+        self.lower_store = lower.client_cache.store
+        self.lower_files = _files(self.lower_store)
+
+        self.client = TestClient(servers=servers, users={"default": [("lasote", "mypass")]})
+        self.client.run("config set storage.lower_paths=\"%s\"" % self.lower_store)
+        self.packages = self.client.client_cache.writable_layer.packages(self.ref)
+
+    def tearDown(self):
+        # Nothing is ever written in the lower store
+        self.assertEqual(self.lower_files, _files(self.lower_store))
+
+    def install_from_lower_test(self):
+        self.client.run("install lib/1.0@lasote/testing -s build_type=Debug")
+        self.assertIn("lib/1.0@lasote/testing: Already installed!", self.client.out)
+        self.assertNotIn("Downloading", self.client.out)
+        self.assertIn(self.lower_store, self.client.client_cache.conanfile(self.ref))
+        self.assertFalse(os.path.exists(self.client.client_cache.writable_layer.export(self.ref)))
+
+        self.client.run("search")
+        self.assertIn("lib/1.0@lasote/testing", self.client.out)
+        self.client.run("search lib/1.0@lasote/testing")
+        self.assertIn("build_type: Debug", self.client.out)
+
+        # Only the cache is removed, not the lower store
+        self.client.run("remove lib* -f")
+        self.client.run("search lib/1.0@lasote/testing")
+        self.assertIn("build_type: Debug", self.client.out)
+
+    def install_in_cache_test(self):
+        self.client.run("install lib/1.0@lasote/testing -s build_type=Release")
+        self.assertIn("lib/1.0@lasote/testing: Retrieving package", self.client.out)
+        self.assertEqual(len(os.listdir(self.packages)), 1)
+        self.assertIn(self.lower_store, self.client.client_cache.conanfile(self.ref))
+
+        self.client.run("install lib/1.0@lasote/testing -s build_type=Debug --build")
+        self.assertIn("lib/1.0@lasote/testing: Building your package", self.client.out)
+        self.assertEqual(len(os.listdir(self.packages)), 2)
+        for package_id in os.listdir(self.packages):
+            self.assertEqual("header", load(os.path.join(self.packages, package_id, "header.h")))
+
+        self.client.run("search lib/1.0@lasote/testing")
+        self.assertIn("build_type: Debug", self.client.out)
+        self.assertIn("build_type: Release", self.client.out)
+
+    def copy_up_recipe_test(self):
+        self.client.client_cache.copy_up_recipe(self.ref)
+        conanfile_path = self.client.client_cache.conanfile(self.ref)
+        self.assertTrue(conanfile_path.startswith(self.client.client_cache.store))
+        self.assertEqual(conanfile, load(conanfile_path))
+        self.assertTrue(os.path.exists(self.client.client_cache.package_metadata(self.ref)))
+        # The packages of the lower store are still used, they are of the same recipe
+        self.client.run("install lib/1.0@lasote/testing -s build_type=Debug")
+        self.assertIn("lib/1.0@lasote/testing: Already installed!", self.client.out)
+
+        # Not the ones of other recipe
+        self.client.save({"conanfile.py": conanfile + "\n# Changed", "header.h": "header"})
+        self.client.run("export . lib/1.0@lasote/testing")
+        self.client.run("install lib/1.0@lasote/testing -s build_type=Debug", assert_error=True)
+        self.assertIn("Missing prebuilt package", self.client.out)
+
+    def upload_from_lower_test(self):
+        # The tgz files are written in copies of the recipe and package in the cache
+        self.client.run("remove lib/1.0@lasote/testing -f -r=default")
+        self.client.run("upload lib/1.0@lasote/testing --all -c")
+        self.assertIn("Uploading package 1/1", self.client.out)
+        writable_layer = self.client.client_cache.writable_layer
+        self.assertTrue(os.path.exists(os.path.join(writable_layer.export(self.ref),
+                                                    EXPORT_SOURCES_TGZ_NAME)))
+        package_id = os.listdir(self.packages)[0]
+        self.assertTrue(os.path.exists(os.path.join(self.packages, package_id, PACKAGE_TGZ_NAME)))
+
+    def copy_from_lower_test(self):
+        # The copies are written in the cache, also if the destination is in the lower store
+        self.lower.run("copy lib/1.0@lasote/testing lasote/stable --all")
+        self.lower_files = _files(self.lower_store)
+        self.client.run("copy lib/1.0@lasote/testing lasote/stable --all --force")
+        self.assertIn("Copied lib/1.0@lasote/testing to lib/1.0@lasote/stable", self.client.out)
+        stable = ConanFileReference.loads("lib/1.0@lasote/stable")
+        writable_layer = self.client.client_cache.writable_layer
+        self.assertEqual(conanfile, load(writable_layer.conanfile(stable)))
+        self.assertEqual(len(os.listdir(writable_layer.packages(stable))), 1)
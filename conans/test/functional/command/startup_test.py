@@ -0,0 +1,80 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+import six
+
+import conans
+from conans.test.utils.test_files import temp_folder
+from conans.util.env_reader import get_env
+
+# Expected time to import the conan command and to create the ConanAPI (ConanAPIV1.factory),
+# checked by the startup benchmark, enabled with CONAN_STARTUP_BENCHMARK=1
+IMPORT_TARGET_SECONDS = 0.4
+FACTORY_TARGET_SECONDS = 0.1
+
+_STARTUP_SCRIPT = """
+import json, sys, time
+start = time.time()
+from conans.client.command import main
+from conans.client.conan_api import Conan
+imported = time.time()
+Conan.factory()
+created = time.time()
+print(json.dumps({"import": imported - start, "factory": created - imported,
+                  "modules": sorted(sys.modules)}))
+"""
+
+
+def _run_startup():
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.path.dirname(os.path.dirname(os.path.abspath(conans.__file__)))
+    env["CONAN_USER_HOME"] = temp_folder()
+    output = subprocess.check_output([sys.executable, "-c", _STARTUP_SCRIPT], env=env)
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+class StartupTest(unittest.TestCase):
+
+    def lazy_imports_test(self):
+        modules = _run_startup()["modules"]
+        deferred = ["requests", "yaml", "tqdm", "patch", "conans.client.generators",
+                    "conans.client.installer", "conans.server"]
+        if six.PY3:  # Python 2 imports the build helpers with conans
+            deferred.extend(["conans.client.build.cmake", "conans.client.build.meson"])
+        self.assertEqual([module for module in deferred if module in modules], [])
+
+    def build_helpers_test(self):
+        from conans import CMake, MSBuild, tools
+        from conans.client.build.cmake import CMake as CMakeHelper
+        self.assertIs(CMake, CMakeHelper)
+        self.assertIn("MSBuild", dir(conans))
+        self.assertEqual(MSBuild.__name__, "MSBuild")
+        self.assertTrue(hasattr(tools.requests, "Session"))
+        with self.assertRaises(ImportError):
+            from conans import NotAHelper  # @UnusedImport
+
+    def star_import_test(self):
+        namespace = {}
+        exec("from conans import *", namespace)
+        for name in ("ConanFile", "Options", "Settings", "load", "AutoToolsBuildEnvironment",
+                     "CMake", "Meson", "MSBuild", "VisualStudioBuildEnvironment",
+                     "RunEnvironment"):
+            self.assertIn(name, namespace)
+        self.assertNotIn("_lazy_attributes", namespace)
+        self.assertNotIn("lazy_attributes", namespace)
+        from conans.client.build.cmake import CMake as CMakeHelper
+        self.assertIs(namespace["CMake"], CMakeHelper)
+
+    @unittest.skipUnless(get_env("CONAN_STARTUP_BENCHMARK", False), "Startup benchmark")
+    def startup_time_test(self):
+        _run_startup()  # Warm up the filesystem and the .pyc files
+        times = [_run_startup() for _ in range(5)]
+        import_time = min(t["import"] for t in times)
+        factory_time = min(t["factory"] for t in times)
+        print("Startup: import %.3fs (target %.3fs), factory %.3fs (target %.3fs)"
+              % (import_time, IMPORT_TARGET_SECONDS, factory_time, FACTORY_TARGET_SECONDS))
+        self.assertLess(import_time, IMPORT_TARGET_SECONDS)
+        self.assertLess(factory_time, FACTORY_TARGET_SECONDS)
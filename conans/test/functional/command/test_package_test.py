@@ -160,3 +160,31 @@ class TestConanLib(ConanFile):
         client.run("test -tbf=test_package/build_folder test_package Hello/0.1@lasote/stable")
         self.assertTrue(os.path.exists(os.path.join(client.current_folder, "test_package", "build_folder")))
         self.assertFalse(os.path.exists(default_build_dir))
+
+    def reuse_install_graph_test(self):
+        lib_conanfile = '''
+from conans import ConanFile
+
+class ConanLib(ConanFile):
+    def package_info(self):
+        self.cpp_info.libs = ["hello"]
+        self.user_info.var = "value"
+'''
+        test_conanfile = '''
+from conans import ConanFile
+
+class TestConanLib(ConanFile):
+    def configure(self):
+        self.output.info("Configuring test package")
+
+    def test(self):
+        self.output.info("LIBS: %s" % self.deps_cpp_info["Hello"].libs)
+        self.output.info("VAR: %s" % self.deps_user_info["Hello"].var)
+'''
+        client = TestClient()
+        client.save({CONANFILE: lib_conanfile,
+                     "test_package/conanfile.py": test_conanfile})
+        client.run("create . Hello/0.1@lasote/stable")
+        self.assertEqual(str(client.out).count("Configuring test package"), 1)
+        self.assertIn("Hello/0.1@lasote/stable (test package): LIBS: ['hello']", client.out)
+        self.assertIn("Hello/0.1@lasote/stable (test package): VAR: value", client.out)
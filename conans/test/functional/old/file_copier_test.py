@@ -1,10 +1,14 @@
 import os
 import platform
+import time
 import unittest
 
+from mock import patch
+
+from conans.client import file_copier
 from conans.client.file_copier import FileCopier
 from conans.test.utils.test_files import temp_folder
-from conans.util.files import load, save
+from conans.util.files import FileLinker, load, save
 
 
 class FileCopierTest(unittest.TestCase):
@@ -139,3 +143,107 @@ class FileCopierTest(unittest.TestCase):
         copier = FileCopier(folder1, folder2)
         copier("*.txt", excludes=("*Test*.txt", "*Impl*"))
         self.assertEqual(['MyLib.txt'], os.listdir(folder2))
+
+    @unittest.skipUnless(platform.system() != "Windows", "Requires hardlinks")
+    def link_files_test(self):
+        folder1 = temp_folder()
+        save(os.path.join(folder1, "lib", "mylib.a"), "library")
+        save(os.path.join(folder1, "include", "mylib.h"), "header")
+        folder2 = temp_folder()
+        save(os.path.join(folder2, "lib", "mylib.a"), "previous library")
+
+        copier = FileCopier(folder1, folder2, link_files=True)
+        copier._linker = FileLinker(reflink=False)
+        copier("*.a")
+        copier("*.h", link_files=False)
+
+        def same_file(name):
+            return os.stat(os.path.join(folder1, name)).st_ino == \
+                   os.stat(os.path.join(folder2, name)).st_ino
+
+        self.assertTrue(same_file("lib/mylib.a"))
+        self.assertEqual("library", load(os.path.join(folder2, "lib/mylib.a")))
+        self.assertFalse(same_file("include/mylib.h"))
+        self.assertEqual("header", load(os.path.join(folder2, "include/mylib.h")))
+
+    def walk_reused_test(self):
+        folder1 = temp_folder()
+        save(os.path.join(folder1, "include", "mylib.h"), "header")
+        save(os.path.join(folder1, "lib", "mylib.a"), "library")
+        save(os.path.join(folder1, ".git", "config"), "git")
+        save(os.path.join(folder1, "test_package", "build", "file.h"), "test build")
+        folder2 = temp_folder()
+
+        copier = FileCopier(folder1, folder2)
+        with patch.object(file_copier, "_RACY_INTERVAL", -10), \
+                patch.object(file_copier, "_FINE_RACY_INTERVAL", -10), \
+                patch.object(file_copier, "_list_folder", wraps=file_copier._list_folder) as list_:
+            def listed():
+                result = sorted(os.path.relpath(call[0][0], folder1)
+                                for call in list_.call_args_list)
+                list_.reset_mock()
+                return result
+
+            self.assertEqual(copier("*.h"), [os.path.join(folder2, "include", "mylib.h")])
+            self.assertEqual(copier("*.a", "lib", keep_path=False),
+                             [os.path.join(folder2, "lib", "mylib.a")])
+            self.assertEqual(copier("*", excludes="include"),
+                             [os.path.join(folder2, "lib", "mylib.a")])
+            self.assertEqual(listed(), [".", "include", "lib", "test_package"])
+
+            # Copying into the walked folder invalidates the walk
+            copier("*.h", dst=os.path.join(folder1, "copied"))
+            self.assertEqual(sorted(copier("*.h", keep_path=False)),
+                             [os.path.join(folder2, "mylib.h")] * 2)
+            self.assertEqual(listed(), [".", "copied", "copied/include", "include", "lib",
+                                        "test_package"])
+            # Adding files lists again only the modified folder
+            save(os.path.join(folder1, "lib", "other.a"), "other library")
+            os.utime(os.path.join(folder1, "lib"), (0, 0))
+            self.assertEqual(sorted(copier("*.a")), [os.path.join(folder2, "lib", "mylib.a"),
+                                                     os.path.join(folder2, "lib", "other.a")])
+            self.assertEqual(listed(), ["lib"])
+
+    def walk_recently_modified_test(self):
+        folder1 = temp_folder()
+        save(os.path.join(folder1, "include", "mylib.h"), "header")
+        folder2 = temp_folder()
+
+        copier = FileCopier(folder1, folder2)
+        with patch.object(file_copier, "_list_folder", wraps=file_copier._list_folder) as list_:
+            self.assertEqual(copier("*.h"), [os.path.join(folder2, "include", "mylib.h")])
+            # In the same timestamp tick, the folder mtime might not change
+            include = os.path.join(folder1, "include")
+            stat = os.stat(include)
+            save(os.path.join(include, "other.h"), "other header")
+            os.utime(include, (stat.st_atime, stat.st_mtime))
+            self.assertEqual(sorted(copier("*.h")),
+                             [os.path.join(folder2, "include", "mylib.h"),
+                              os.path.join(folder2, "include", "other.h")])
+            self.assertIn(((include, ), {}), list_.call_args_list[2:])
+
+    def walk_fresh_tree_test(self):
+        # The package() copies right after the build, the tree was modified a moment ago
+        folder1 = temp_folder()
+        for name in ("include/mylib.h", "src/mylib.cpp", "lib/mylib.a", "bin/mylib.dll",
+                     "lib/cmake/mylib.cmake", "res/data.txt"):
+            save(os.path.join(folder1, name), "contents")
+        folders = [root for root, _, _ in os.walk(folder1)]
+        fresh = time.time() - 1
+        for folder in folders:
+            os.utime(folder, (fresh, fresh))
+        folder2 = temp_folder()
+
+        copier = FileCopier(folder1, folder2)
+        with patch.object(file_copier, "_list_folder", wraps=file_copier._list_folder) as list_:
+            copier("*.h", dst="include", src="include")
+            copier("*.lib", dst="lib", keep_path=False)
+            copier("*.a", dst="lib", keep_path=False)
+            copier("*.dll", dst="bin", keep_path=False)
+            copier("*.cmake")
+            copier("*.txt", dst="res", src="res")
+            copier("*.h", dst="include", keep_path=False)
+            listed = [os.path.normpath(call[0][0]) for call in list_.call_args_list]
+            self.assertEqual(sorted(listed),
+                             sorted(folders + [os.path.join(folder1, "include"),
+                                               os.path.join(folder1, "res")]))
@@ -0,0 +1,48 @@
+import os
+import unittest
+
+from conans.client import tools
+from conans.model.ref import ConanFileReference
+from conans.test.utils.tools import TestClient
+from conans.util.files import load
+
+
+class LinkBuildSourcesTest(unittest.TestCase):
+
+    def test_basic(self):
+        conanfile = '''
+from conans import ConanFile, tools
+from conans.util.files import load
+
+class Pkg(ConanFile):
+    exports_sources = "*.h", "*.cpp"
+
+    def build(self):
+        tools.replace_in_file("file.cpp", "original", "modified")
+        self.output.info("Header: %s" % load("file.h"))
+
+    def package(self):
+        self.copy("*")
+'''
+        client = TestClient()
+        client.save({"conanfile.py": conanfile,
+                     "file.h": "myfile.h contents",
+                     "file.cpp": "original source"})
+        with tools.environment_append({"CONAN_LINK_BUILD_SOURCES": "1"}):
+            client.run("create . Pkg/0.1@lasote/testing")
+        self.assertIn("Pkg/0.1@lasote/testing: Header: myfile.h contents", client.out)
+
+        ref = ConanFileReference.loads("Pkg/0.1@lasote/testing")
+        source_folder = client.client_cache.source(ref)
+        self.assertEqual(load(os.path.join(source_folder, "file.cpp")), "original source")
+        builds = client.client_cache.builds(ref)
+        build_folder = os.path.join(builds, os.listdir(builds)[0])
+        self.assertEqual(load(os.path.join(build_folder, "file.cpp")), "modified source")
+        packages = client.client_cache.packages(ref)
+        package_folder = os.path.join(packages, os.listdir(packages)[0])
+        self.assertEqual(load(os.path.join(package_folder, "file.h")), "myfile.h contents")
+
+        # The sources are not modified, so the next build starts from the original ones
+        with tools.environment_append({"CONAN_LINK_BUILD_SOURCES": "1"}):
+            client.run("install Pkg/0.1@lasote/testing --build")
+        self.assertEqual(load(os.path.join(build_folder, "file.cpp")), "modified source")
@@ -17,16 +17,15 @@ class PackageIngrityTest(unittest.TestCase):
         ref = ConanFileReference.loads("Hello/0.1@lasote/testing")
         conan_folder = client.client_cache.conan(ref)
         self.assertIn("locks", os.listdir(conan_folder))
-        self.assertTrue(os.path.exists(conan_folder + ".count"))
-        self.assertTrue(os.path.exists(conan_folder + ".count.lock"))
+        lock_files = client.client_cache.conanfile_lock_files(ref)
+        self.assertTrue(any(os.path.exists(f) for f in lock_files))
         client.run("remove * --locks", assert_error=True)
         self.assertIn("ERROR: Specifying a pattern is not supported", client.out)
         client.run("remove", assert_error=True)
         self.assertIn('ERROR: Please specify a pattern to be removed ("*" for all)', client.out)
         client.run("remove --locks")
         self.assertNotIn("locks", os.listdir(conan_folder))
-        self.assertFalse(os.path.exists(conan_folder + ".count"))
-        self.assertFalse(os.path.exists(conan_folder + ".count.lock"))
+        self.assertFalse(any(os.path.exists(f) for f in lock_files))
 
     def upload_dirty_test(self):
         test_server = TestServer([], users={"lasote": "mypass"})
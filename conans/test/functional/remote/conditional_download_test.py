@@ -0,0 +1,58 @@
+import unittest
+
+from conans.test.utils.tools import TestClient, TestRequester, TestServer
+
+conanfile = """from conans import ConanFile
+
+class Pkg(ConanFile):
+    exports_sources = "*.h"
+
+    def package(self):
+        self.copy("*.h")
+"""
+
+
+class ConditionalDownloadTest(unittest.TestCase):
+
+    def _check_not_modified(self, block_v2):
+        responses = []
+
+        class RecordingRequester(TestRequester):
+
+            def get(self, url, **kwargs):
+                response = super(RecordingRequester, self).get(url, **kwargs)
+                if "conanmanifest.txt" in url or "conaninfo.txt" in url:
+                    responses.append(response.status_code)
+                return response
+
+        servers = {"default": TestServer()}
+        client = TestClient(servers=servers, users={"default": [("lasote", "mypass")]},
+                            block_v2=block_v2)
+        client.save({"conanfile.py": conanfile, "header.h": "header"})
+        client.run("create . lib/1.0@lasote/stable")
+        client.run("upload lib/1.0@lasote/stable --all")
+
+        client2 = TestClient(servers=servers, block_v2=block_v2,
+                             requester_class=RecordingRequester)
+        client2.run("install lib/1.0@lasote/stable")
+        client2.run("install lib/1.0@lasote/stable --update")
+        self.assertIn(200, responses)
+        del responses[:]
+        client2.run("install lib/1.0@lasote/stable --update")
+        self.assertIn("lib/1.0@lasote/stable: Already installed!", client2.out)
+        self.assertTrue(responses)
+        self.assertEqual(set(responses), {304})
+
+        # The modified files are downloaded again
+        client.save({"header.h": "modified header"})
+        client.run("create . lib/1.0@lasote/stable")
+        client.run("upload lib/1.0@lasote/stable --all")
+        del responses[:]
+        client2.run("install lib/1.0@lasote/stable --update")
+        self.assertIn(200, responses)
+
+    def v1_test(self):
+        self._check_not_modified(block_v2=True)
+
+    def v2_test(self):
+        self._check_not_modified(block_v2=False)
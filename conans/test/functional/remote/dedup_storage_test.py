@@ -0,0 +1,53 @@
+import platform
+import unittest
+
+from conans import CHECKSUM_DEPLOY, COMPLEX_SEARCH_CAPABILITY, REVISIONS
+from conans.test.utils.tools import TestClient, TestRequester, TestServer
+from conans.util.env_reader import get_env
+
+conanfile = """from conans import ConanFile
+
+class Pkg(ConanFile):
+    exports_sources = "*.h"
+
+    def package(self):
+        self.copy("*.h")
+"""
+
+
+@unittest.skipIf(platform.system() == "Windows", "Needs hardlinks")
+@unittest.skipIf(get_env("CONAN_API_V2_BLOCKED", True), "The checksum deploy is an ApiV2 feature")
+class DedupStorageTest(unittest.TestCase):
+
+    def reupload_test(self):
+        uploads = []
+
+        class RecordingRequester(TestRequester):
+
+            def put(self, url, **kwargs):
+                response = super(RecordingRequester, self).put(url, **kwargs)
+                if "/files/" in url:
+                    deploy = "X-Checksum-Deploy" in (kwargs.get("headers") or {})
+                    uploads.append((url.rsplit("/", 1)[1].split("?")[0], deploy, response.status_code))
+                return response
+
+        server = TestServer(server_capabilities=[COMPLEX_SEARCH_CAPABILITY, REVISIONS,
+                                                 CHECKSUM_DEPLOY], dedup=True)
+        client = TestClient(servers={"default": server},
+                            users={"default": [("lasote", "mypass")]}, block_v2=False,
+                            requester_class=RecordingRequester)
+        client.save({"conanfile.py": conanfile, "header.h": "header"})
+        client.run("create . lib/1.0@lasote/stable")
+        client.run("upload lib/1.0@lasote/stable --all")
+        # Not in the server, uploaded after the checksum deploy
+        self.assertIn(("conan_package.tgz", True, 404), uploads)
+        self.assertIn(("conan_package.tgz", False, 200), uploads)
+
+        del uploads[:]
+        client.run("upload lib/1.0@lasote/stable --all --force")
+        self.assertTrue(uploads)
+        self.assertEqual({(deploy, status) for _, deploy, status in uploads}, {(True, 201)})
+
+        client2 = TestClient(servers={"default": server}, block_v2=False)
+        client2.run("install lib/1.0@lasote/stable")
+        self.assertIn("lib/1.0@lasote/stable: Package installed", client2.out)
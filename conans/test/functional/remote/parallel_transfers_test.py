@@ -0,0 +1,96 @@
+import os
+import unittest
+
+from conans.client import tools
+from conans.model.ref import ConanFileReference
+from conans.test.utils.tools import TestClient, TestRequester, TestServer, TestingResponse
+
+
+conanfile = """from conans import ConanFile
+
+class Pkg(ConanFile):
+    exports_sources = "*.h"
+
+    def package(self):
+        self.copy("*.h")
+"""
+
+
+class ParallelTransfersTest(unittest.TestCase):
+
+    def _upload_package(self, servers, requester_class=None):
+        client = TestClient(servers=servers, users={"default": [("lasote", "mypass")]},
+                            block_v2=False, requester_class=requester_class)
+        client.save({"conanfile.py": conanfile, "header.h": "header"})
+        client.run("create . lib/1.0@lasote/stable")
+        return client
+
+    def upload_download_test(self):
+        servers = {"default": TestServer()}
+        client = self._upload_package(servers)
+        with tools.environment_append({"CONAN_PARALLEL_TRANSFERS": "4"}):
+            client.run("upload lib/1.0@lasote/stable --all")
+            lines = [line.strip() for line in str(client.out).splitlines()
+                     if line.startswith("Uploading")]
+            self.assertEqual(lines, ["Uploading lib/1.0@lasote/stable to remote 'default'",
+                                     "Uploading conanmanifest.txt",
+                                     "Uploading conanfile.py",
+                                     "Uploading conan_sources.tgz",
+                                     "Uploading package 1/1: "
+                                     "5ab84d6acfe1f23c4fae0ab88f26e3a396351ac9 to 'default'",
+                                     "Uploading conanmanifest.txt",
+                                     "Uploading conaninfo.txt",
+                                     "Uploading conan_package.tgz"])
+
+            client2 = TestClient(servers=servers, block_v2=False)
+            client2.run("install lib/1.0@lasote/stable")
+            self.assertIn("Downloading conanmanifest.txt", client2.out)
+            self.assertIn("Downloading conan_package.tgz", client2.out)
+            ref = ConanFileReference.loads("lib/1.0@lasote/stable")
+            pkg_folder = client2.client_cache.packages(ref)
+            pkg_id = os.listdir(pkg_folder)[0]
+            header = os.path.join(pkg_folder, pkg_id, "header.h")
+            self.assertEqual(tools.load(header), "header")
+
+    def failed_files_reported_test(self):
+
+        class FailingUploadRequester(TestRequester):
+
+            def put(self, url, **kwargs):
+                if "conaninfo.txt" in url or "conan_package.tgz" in url:
+                    raise ConnectionError("Fake connection error exception")
+                return super(FailingUploadRequester, self).put(url, **kwargs)
+
+        servers = {"default": TestServer()}
+        client = self._upload_package(servers, requester_class=FailingUploadRequester)
+        with tools.environment_append({"CONAN_PARALLEL_TRANSFERS": "4"}):
+            client.run("upload lib/1.0@lasote/stable --all --retry 1", assert_error=True)
+        self.assertIn("Execute upload again to retry upload the failed files: "
+                      "conaninfo.txt, conan_package.tgz", client.out)
+
+    def failed_download_test(self):
+
+        class FailingDownloadRequester(TestRequester):
+
+            def get(self, url, **kwargs):
+                if "conan_package.tgz" in url:
+                    return TestingResponse(_FakeResponse(500))
+                return super(FailingDownloadRequester, self).get(url, **kwargs)
+
+        servers = {"default": TestServer()}
+        client = self._upload_package(servers)
+        client.run("upload lib/1.0@lasote/stable --all")
+        client2 = TestClient(servers=servers, block_v2=False,
+                             requester_class=FailingDownloadRequester)
+        with tools.environment_append({"CONAN_PARALLEL_TRANSFERS": "4"}):
+            client2.run("install lib/1.0@lasote/stable", assert_error=True)
+        self.assertIn("Error 500 downloading file", client2.out)
+        self.assertIn("conan_package.tgz", client2.out)
+
+
+class _FakeResponse(object):
+
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.headers = {}
+        self.body = b""
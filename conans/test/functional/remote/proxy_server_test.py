@@ -0,0 +1,183 @@
+import os
+import socket
+import threading
+import time
+import unittest
+
+from mock import patch
+
+from conans.model.ref import ConanFileReference
+from conans.paths import CONANFILE, CONAN_MANIFEST
+from conans.server.rest.server import ThreadedWSGIRefServer
+from conans.server.store.proxy_store import UpstreamRemote
+from conans.test.utils.tools import TestClient, TestServer
+from conans.util.files import save
+from conans.util.parallel import run_in_parallel
+
+conanfile = """from conans import ConanFile
+
+class Pkg(ConanFile):
+    exports_sources = "*.h"
+
+    def package(self):
+        self.copy("*.h")
+"""
+
+
+class _HttpServer(threading.Thread):
+    """ Serves the app of a TestServer in a real port, for the requests of the proxy """
+
+    def __init__(self, test_server):
+        super(_HttpServer, self).__init__()
+        self.daemon = True
+        self.app = test_server.test_server.ra.root_app
+        self.adapter = ThreadedWSGIRefServer(host="127.0.0.1", port=0, workers=4)
+        self.adapter.quiet = True
+
+    def __enter__(self):
+        self.start()
+        while self.adapter.srv is None:
+            time.sleep(0.01)
+        return "http://127.0.0.1:%s" % self.adapter.srv.server_port
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.adapter.srv.shutdown()
+        self.adapter.srv.server_close()
+        self.join()
+
+    def run(self):
+        self.adapter.run(self.app)
+
+
+class ProxyServerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.upstream = TestServer(users={"lasote": "mypass"})
+        self.ref = ConanFileReference.loads("lib/1.0@lasote/testing")
+
+    def _seed_upstream(self, revision):
+        ref = self.ref.copy_with_rev(revision)
+        export = self.upstream.server_store.export(ref)
+        save(os.path.join(export, CONANFILE), "# %s" % revision)
+        save(os.path.join(export, CONAN_MANIFEST), "123\nconanfile.py: 456")
+        self.upstream.server_store.update_last_revision(ref)
+        return ref
+
+    def install_from_upstream_test(self):
+        client = TestClient(servers={"default": self.upstream},
+                            users={"default": [("lasote", "mypass")]})
+        client.save({CONANFILE: conanfile, "header.h": "header"})
+        client.run("create . %s" % str(self.ref))
+        client.run("upload lib/1.0@lasote/testing --all")
+
+        with _HttpServer(self.upstream) as url:
+            proxy = TestServer(upstream=UpstreamRemote(url))
+            client = TestClient(servers={"default": proxy},
+                                users={"default": [("lasote", "mypass")]})
+            client.run("search lib* -r default")
+            self.assertIn("lib/1.0@lasote/testing", client.out)
+            client.run("search lib/1.0@lasote/testing -r default")
+            self.assertIn("Package_ID: 5ab84d6acfe1f23c4fae0ab88f26e3a396351ac9", client.out)
+            client.run("install lib/1.0@lasote/testing")
+            self.assertIn("lib/1.0@lasote/testing: Retrieving package", client.out)
+
+        # Stored by the proxy, served without the upstream
+        client = TestClient(servers={"default": proxy}, users={"default": [("lasote", "mypass")]})
+        client.run("install lib/1.0@lasote/testing")
+        self.assertIn("lib/1.0@lasote/testing: Retrieving package", client.out)
+        client.run("search lib* -r default")
+        self.assertIn("lib/1.0@lasote/testing", client.out)
+        client.run("search missing* -r default")
+        self.assertIn("There are no packages matching the 'missing*' pattern", client.out)
+
+    def concurrent_misses_test(self):
+        ref = self._seed_upstream("rev1")
+        with _HttpServer(self.upstream) as url:
+            upstream = UpstreamRemote(url)
+            proxy = TestServer(upstream=upstream)
+            with patch.object(upstream, "get_recipe", wraps=upstream.get_recipe) as fetch:
+                results = run_in_parallel(proxy.server_store.proxy_recipe, [self.ref] * 8, 8)
+            self.assertEqual(results, [ref] * 8)
+            self.assertEqual(fetch.call_count, 1)
+            self.assertEqual(proxy.server_store.get_last_revision(self.ref).revision, "rev1")
+            self.assertEqual(sorted(proxy.server_store.get_recipe_file_list(ref)),
+                             [CONANFILE, CONAN_MANIFEST])
+
+    def latest_revision_ttl_test(self):
+        self._seed_upstream("rev1")
+        with _HttpServer(self.upstream) as url:
+            proxy = TestServer(upstream=UpstreamRemote(url, ttl=60))
+            store = proxy.server_store
+            self.assertEqual(store.proxy_recipe(self.ref).revision, "rev1")
+
+            ref2 = self._seed_upstream("rev2")
+            self.assertEqual(store.proxy_recipe(self.ref).revision, "rev1")
+            later = time.time() + 61
+            with patch("conans.server.store.proxy_store.time.time", return_value=later):
+                self.assertEqual(store.proxy_recipe(self.ref), ref2)
+            self.assertTrue(store.path_exists(store.export(ref2)))
+
+        # Upstream down, the stored revisions are served
+        missing = ConanFileReference.loads("other/1.0@lasote/testing")
+        self.assertEqual(store.proxy_recipe(missing), missing)
+        self.assertEqual(store.get_last_revision(self.ref).revision, "rev2")
+
+    def pinned_revision_test(self):
+        ref1 = self._seed_upstream("rev1")
+        ref2 = self._seed_upstream("rev2")
+        with _HttpServer(self.upstream) as url:
+            proxy = TestServer(upstream=UpstreamRemote(url))
+            store = proxy.server_store
+            self.assertEqual(store.proxy_recipe(self.ref), ref2)
+            # Fetching an old revision doesn't make it the latest one
+            self.assertEqual(store.proxy_recipe(ref1), ref1)
+            self.assertTrue(store.path_exists(store.export(ref1)))
+            self.assertEqual(store.get_last_revision(self.ref).revision, "rev2")
+
+            proxy = TestServer(upstream=UpstreamRemote(url))
+            store = proxy.server_store
+            self.assertEqual(store.proxy_recipe(ref2), ref2)
+            self.assertIsNone(store.get_last_revision(self.ref))
+            # Already stored, but now it is the upstream latest answer
+            self.assertEqual(store.proxy_recipe(self.ref), ref2)
+            self.assertEqual(store.get_last_revision(self.ref).revision, "rev2")
+
+    def stalled_upstream_test(self):
+        # The upstream accepts the connections but never answers
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.bind(("127.0.0.1", 0))
+        listener.listen(16)
+        listener.settimeout(0.1)
+
+        def connections():
+            accepted = []
+            try:
+                while True:
+                    accepted.append(listener.accept()[0])
+            except socket.timeout:
+                pass
+            for connection in accepted:
+                connection.close()
+            return len(accepted)
+
+        try:
+            url = "http://127.0.0.1:%s" % listener.getsockname()[1]
+            proxy = TestServer(upstream=UpstreamRemote(url, timeout=0.5, failure_ttl=5))
+            store = proxy.server_store
+            start = time.time()
+            self.assertEqual(store.proxy_recipe(self.ref), self.ref)
+            self.assertLess(time.time() - start, 5)
+            self.assertEqual(connections(), 1)
+
+            # The failure is reused, the upstream is not requested again meanwhile
+            other = ConanFileReference.loads("other/1.0@lasote/testing")
+            self.assertEqual(store.proxy_recipe(other), other)
+            self.assertEqual(store.upstream_recipes("*", False), [])
+            self.assertEqual(connections(), 0)
+
+            later = time.time() + 6
+            with patch("conans.server.store.proxy_store.time.time", return_value=later):
+                self.assertEqual(store.proxy_recipe(other), other)
+            self.assertEqual(connections(), 1)
+        finally:
+            listener.close()
@@ -0,0 +1,59 @@
+import unittest
+
+from mock import patch
+
+from conans.test.utils.tools import TestClient, TestRequester, TestServer
+
+
+class SearchPaginationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.searches = searches = []
+
+        class RecordingRequester(TestRequester):
+
+            def get(self, url, **kwargs):
+                if "/search" in url:
+                    searches.append(url)
+                return super(RecordingRequester, self).get(url, **kwargs)
+
+        self.server = TestServer()
+        self.client = TestClient(servers={"default": self.server},
+                                 users={"default": [("lasote", "mypass")]},
+                                 requester_class=RecordingRequester)
+        self.client.save({"conanfile.py": "from conans import ConanFile\n"
+                                          "class Pkg(ConanFile):\n    pass"})
+        for version in ("1.0", "1.1", "1.2", "2.0"):
+            self.client.run("export . lib/%s@lasote/stable" % version)
+        self.client.run("export . other/1.0@lasote/stable")
+        self.client.run("upload * --confirm")
+        del self.searches[:]
+
+    @patch("conans.client.remote_manager.SEARCH_PAGE_SIZE", 2)
+    def search_pages_test(self):
+        self.client.run("search * -r default")
+        for ref in ("lib/1.0", "lib/1.1", "lib/1.2", "lib/2.0", "other/1.0"):
+            self.assertIn("%s@lasote/stable" % ref, self.client.out)
+        self.assertEqual(len(self.searches), 3)
+        self.assertIn("limit=2", self.searches[0])
+        self.assertNotIn("cursor", self.searches[0])
+        self.assertIn("cursor", self.searches[1])
+
+    @patch("conans.client.remote_manager.SEARCH_PAGE_SIZE", 2)
+    def version_range_test(self):
+        self.client.save({"conanfile.txt": "[requires]\nlib/[<2.0]@lasote/stable"},
+                         clean_first=True)
+        self.client.run("remove * -f")
+        self.client.run("install . --build missing")
+        self.assertIn("Version range '<2.0' required by 'None' resolved to "
+                      "'lib/1.2@lasote/stable'", self.client.out)
+        self.assertEqual(len(self.searches), 2)
+
+    @patch("conans.client.remote_manager.SEARCH_PAGE_SIZE", 2)
+    def stop_early_test(self):
+        self.client.run("search * -r default")  # Initializes the client remote manager
+        del self.searches[:]
+        remote = self.client.client_cache.registry.remotes.get("default")
+        references = self.client.remote_manager.iter_search_recipes(remote, "lib/*")
+        self.assertEqual(str(next(references)), "lib/1.0@lasote/stable")
+        self.assertEqual(len(self.searches), 1)
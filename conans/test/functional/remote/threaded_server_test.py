@@ -0,0 +1,146 @@
+import os
+import socket
+import threading
+import time
+import unittest
+
+import bottle
+import requests
+from nose.plugins.attrib import attr
+
+from conans import __version__
+from conans.model.ref import ConanFileReference
+from conans.model.version import Version
+from conans.server.rest.server import ThreadedWSGIRefServer
+from conans.server.service.file_sender import FileSender
+from conans.test.utils.server_launcher import TestServerLauncher
+from conans.test.utils.test_files import temp_folder
+from conans.util.files import save
+from conans.util.parallel import run_in_parallel
+
+
+class _ServerThread(threading.Thread):
+
+    def __init__(self, app, **options):
+        super(_ServerThread, self).__init__()
+        self.daemon = True
+        self.app = app
+        self.adapter = ThreadedWSGIRefServer(host="127.0.0.1", port=0, **options)
+        self.adapter.quiet = True
+
+    def __enter__(self):
+        self.start()
+        while self.adapter.srv is None:
+            time.sleep(0.01)
+        return "http://127.0.0.1:%s" % self.adapter.srv.server_port
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.adapter.srv.shutdown()
+        self.adapter.srv.server_close()
+        self.join()
+
+    def run(self):
+        self.adapter.run(self.app)
+
+
+class ThreadedServerTest(unittest.TestCase):
+
+    def slow_request_not_blocking_test(self):
+        app = bottle.Bottle()
+        release = threading.Event()
+
+        @app.route("/slow")
+        def slow():
+            release.wait(10)
+            return "slow"
+
+        @app.route("/fast")
+        def fast():
+            return "fast"
+
+        with _ServerThread(app, workers=2) as url:
+            slow_response = []
+            thread = threading.Thread(
+                target=lambda: slow_response.append(requests.get(url + "/slow").text))
+            thread.start()
+            self.assertEqual(requests.get(url + "/fast", timeout=5).text, "fast")
+            self.assertEqual(slow_response, [])
+            release.set()
+            thread.join()
+            self.assertEqual(slow_response, ["slow"])
+
+    def request_timeout_test(self):
+        app = bottle.Bottle()
+
+        @app.route("/fast")
+        def fast():
+            return "fast"
+
+        with _ServerThread(app, workers=1, request_timeout=0.5) as url:
+            port = int(url.rsplit(":", 1)[1])
+            idle_client = socket.create_connection(("127.0.0.1", port))
+            try:
+                idle_client.sendall(b"GET /fast HTTP/1.0\r\n")  # Never completes the request
+                # The only worker is released after the timeout
+                self.assertEqual(requests.get(url + "/fast", timeout=5).text, "fast")
+                idle_client.settimeout(5)
+                self.assertEqual(idle_client.recv(1024), b"")
+            finally:
+                idle_client.close()
+
+    def sendfile_test(self):
+        app = bottle.Bottle()
+        path = os.path.join(temp_folder(), "conan_package.tgz")
+        content = os.urandom(1024 * 1024)
+        save(path, content)
+        sender = FileSender("sendfile")
+
+        @app.route("/file")
+        def get_file():
+            return sender(path)
+
+        with _ServerThread(app, workers=2, sendfile=True) as url:
+            response = requests.get(url + "/file", timeout=5)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.content, content)
+            # Ranges and missing files are still handled by bottle
+            response = requests.get(url + "/file", headers={"Range": "bytes=10-19"}, timeout=5)
+            self.assertEqual(response.status_code, 206)
+            self.assertEqual(response.content, content[10:20])
+            path += ".missing"
+            self.assertEqual(requests.get(url + "/file", timeout=5).status_code, 404)
+
+
+@attr("slow")
+class ThreadedServerBenchmarkTest(unittest.TestCase):
+
+    def _seed_store(self, server_store, count):
+        for i in range(count):
+            ref = ConanFileReference.loads("lib%d/1.0@conan/stable#rev" % i)
+            export = server_store.export(ref)
+            save(os.path.join(export, "conanfile.py"), "from conans import ConanFile")
+            save(os.path.join(export, "conan_sources.tgz"), os.urandom(1024 * 1024))
+            server_store.update_last_revision(ref)
+
+    def requests_per_second_test(self):
+        server = TestServerLauncher(server_version=Version(__version__),
+                                    min_client_compatible_version=Version("0.25.0"))
+        self._seed_store(server.server_store, 20)
+        downloads = ["/v2/conans/lib%d/1.0/conan/stable/revisions/rev/files/conan_sources.tgz"
+                     % i for i in range(20)]
+        searches = ["/v2/conans/search?q=lib%d*" % i for i in range(20)]
+
+        for workers in (1, 8):
+            with _ServerThread(server.ra.root_app, workers=workers) as url:
+                def get(path):
+                    response = requests.get(url + path)
+                    response.raise_for_status()
+
+                for name, paths in (("downloads", downloads), ("searches", searches)):
+                    paths = paths * 5
+                    start = time.time()
+                    errors = run_in_parallel(get, paths, 16)
+                    elapsed = time.time() - start
+                    self.assertEqual(errors, [None] * len(paths))
+                    print("workers=%d %s: %.1f requests/s" % (workers, name,
+                                                               len(paths) / elapsed))
@@ -8,6 +8,7 @@ from conans.client import tools
 from conans.model.manifest import FileTreeManifest
 from conans.model.ref import ConanFileReference, PackageReference
 from conans.paths import EXPORT_SOURCES_TGZ_NAME, EXPORT_SRC_FOLDER, EXPORT_TGZ_NAME
+from conans.server.store.checksums import is_storage_file
 from conans.test.utils.test_files import scan_folder
 from conans.test.utils.tools import NO_SETTINGS_PACKAGE_ID, TestClient, TestServer
 from conans.util.files import load, md5sum, save
@@ -118,7 +119,9 @@ class ExportsSourcesTest(unittest.TestCase):
                                'conanmanifest.txt']
 
         server = server or self.server
-        self.assertEqual(scan_folder(server.server_store.export(self.reference)), expected_server)
+        server_files = [f for f in scan_folder(server.server_store.export(self.reference))
+                        if is_storage_file(f)]
+        self.assertEqual(server_files, expected_server)
 
     def _check_export_folder(self, mode, export_folder=None, export_src_folder=None):
         if mode == "exports_sources":
@@ -0,0 +1,74 @@
+import os
+import unittest
+
+from mock import patch
+
+from conans.client.store import hashes_cache
+from conans.client.store.hashes_cache import HashesCache
+from conans.model.manifest import FileTreeManifest
+from conans.test.utils.test_files import temp_folder
+from conans.util.files import md5sum, save
+
+
+class HashesCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = HashesCache(os.path.join(temp_folder(), ".hashes.db"))
+        self.folder = temp_folder()
+        self.files = {}
+        for i in range(20):
+            path = os.path.join(self.folder, "include", "header%d.h" % i)
+            save(path, "header %d" % i)
+            self.files[path] = md5sum(path)
+
+    def _md5sums(self):
+        # Pretend the files were modified long ago, so they are not discarded as racy
+        with patch.object(hashes_cache, "_RACY_INTERVAL", -10):
+            return self.cache.md5sums(self.folder, list(self.files))
+
+    def cached_test(self):
+        self.assertEqual(self._md5sums(), self.files)
+        with patch.object(hashes_cache, "md5sums", return_value={}) as computed:
+            self.assertEqual(self._md5sums(), self.files)
+        computed.assert_called_once_with([])
+
+    def modified_file_test(self):
+        self._md5sums()
+        path = os.path.join(self.folder, "include", "header3.h")
+        save(path, "modified header 3")
+        self.files[path] = md5sum(path)
+        with patch.object(hashes_cache, "md5sums", wraps=hashes_cache.md5sums) as computed:
+            self.assertEqual(self._md5sums(), self.files)
+        computed.assert_called_once_with([path])
+
+    def racy_files_not_stored_test(self):
+        self.cache.md5sums(self.folder, list(self.files))
+        with patch.object(hashes_cache, "md5sums", wraps=hashes_cache.md5sums) as computed:
+            self.assertEqual(self._md5sums(), self.files)
+        self.assertEqual(len(computed.call_args[0][0]), 20)
+
+    def removed_files_pruned_test(self):
+        self._md5sums()
+        path = os.path.join(self.folder, "include", "header3.h")
+        os.remove(path)
+        self.files.pop(path)
+        self._md5sums()
+        connection = self.cache._connect()
+        try:
+            rows = connection.execute("select path from file_hashes").fetchall()
+        finally:
+            connection.close()
+        self.assertEqual(sorted(row[0] for row in rows), sorted(self.files))
+
+    def broken_database_test(self):
+        save(self.cache.dbfile, "this is not a database")
+        self.assertEqual(self.cache.md5sums(self.folder, list(self.files)), self.files)
+
+    def manifest_test(self):
+        save(os.path.join(self.folder, "conanfile.py"), "from conans import ConanFile")
+        expected = repr(FileTreeManifest.create(self.folder))
+        with patch.object(hashes_cache, "_RACY_INTERVAL", -10):
+            first = FileTreeManifest.create(self.folder, hashes_cache=self.cache)
+            second = FileTreeManifest.create(self.folder, hashes_cache=self.cache)
+        self.assertEqual(repr(first).split("\n", 1)[1], expected.split("\n", 1)[1])
+        self.assertEqual(repr(second).split("\n", 1)[1], expected.split("\n", 1)[1])
@@ -0,0 +1,60 @@
+import os
+import unittest
+
+from conans.client.rest.rest_client_v2 import RestV2Methods
+from conans.errors import ConanException, NotFoundException
+from conans.test.utils.test_files import temp_folder
+from conans.test.utils.tools import TestBufferConanOutput
+
+
+class _Response(object):
+
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.ok = status_code == 200
+        self.headers = {}
+        self.content = b"contents"
+
+
+class _Requester(object):
+
+    def __init__(self, statuses):
+        self.statuses = statuses
+        self.requested = []
+
+    def get(self, url, **kwargs):
+        self.requested.append(url)
+        return _Response(self.statuses.get(url, 200))
+
+
+class DownloadFilesTest(unittest.TestCase):
+
+    def _download(self, statuses, parallel_transfers):
+        files = ["conanmanifest.txt", "conanfile.py", "conan_export.tgz"]
+        requester = _Requester(statuses)
+        rest_client = RestV2Methods("http://myremote", None, {}, TestBufferConanOutput(),
+                                    requester, verify_ssl=False,
+                                    parallel_transfers=parallel_transfers)
+        dest_folder = temp_folder()
+        try:
+            rest_client._download_and_save_files({f: f for f in files}, dest_folder, files)
+        finally:
+            self.downloaded = sorted(os.listdir(dest_folder))
+            self.requested = requester.requested
+
+    def all_not_found_test(self):
+        statuses = {"conanfile.py": 404, "conan_export.tgz": 404}
+        with self.assertRaisesRegexp(NotFoundException, "Not found"):
+            self._download(statuses, parallel_transfers=4)
+        self.assertEqual(self.downloaded, ["conanmanifest.txt"])
+
+        statuses["conanfile.py"] = 500
+        with self.assertRaisesRegexp(ConanException, "Error downloading files: "
+                                                     "conanfile.py, conan_export.tgz"):
+            self._download(statuses, parallel_transfers=4)
+
+    def sequential_stops_test(self):
+        with self.assertRaisesRegexp(ConanException, "Error 500 downloading file conanfile.py"):
+            self._download({"conanfile.py": 500}, parallel_transfers=1)
+        self.assertIn("conanfile.py", self.requested)
+        self.assertNotIn("conan_export.tgz", self.requested)
@@ -0,0 +1,41 @@
+import os
+import unittest
+
+from mock import patch
+
+from conans.client.conf import default_settings_yml
+from conans.client.store.settings_cache import SettingsCache
+from conans.model.settings import Settings
+from conans.test.utils.test_files import temp_folder
+from conans.util.files import save
+
+
+class SettingsCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = SettingsCache(os.path.join(temp_folder(), ".settings.cache"))
+
+    def cached_test(self):
+        definition = self.cache.load(default_settings_yml)
+        with patch("yaml.load") as parse:
+            self.assertEqual(self.cache.load(default_settings_yml), definition)
+        self.assertFalse(parse.called)
+        settings = Settings(definition)
+        self.assertEqual(settings.fields, Settings.loads(default_settings_yml).fields)
+        self.assertIn("Visual Studio", settings.compiler.values_range)
+
+    def modified_test(self):
+        self.cache.load("os: [Windows, Linux]")
+        definition = self.cache.load("os: [Windows, Linux, Macos]")
+        self.assertEqual(definition, {"os": ["Windows", "Linux", "Macos"]})
+        self.assertEqual(self.cache.load("os: [Windows, Linux, Macos]"), definition)
+
+    def corrupted_test(self):
+        save(self.cache.cache_file, "corrupted")
+        self.assertEqual(self.cache.load("os: [Windows]"), {"os": ["Windows"]})
+        self.assertEqual(self.cache.load("os: [Windows]"), {"os": ["Windows"]})
+
+    def not_writable_test(self):
+        cache = SettingsCache(os.path.join(temp_folder(), "missing", ".settings.cache"))
+        self.assertEqual(cache.load("os: [Windows]"), {"os": ["Windows"]})
+        self.assertEqual(os.listdir(os.path.dirname(os.path.dirname(cache.cache_file))), [])
@@ -0,0 +1,50 @@
+import os
+import time
+import unittest
+
+from mock import patch
+
+from conans.client.store.trash import Trash
+from conans.test.utils.test_files import temp_folder
+from conans.util.files import save
+
+
+class TrashTest(unittest.TestCase):
+
+    def setUp(self):
+        folder = temp_folder()
+        self.store = os.path.join(folder, "data")
+        self.trash = Trash(os.path.join(folder, "data.trash"))
+
+    def _folder(self, name):
+        path = os.path.join(self.store, name)
+        save(os.path.join(path, "sub", "file.txt"), "contents")
+        return path
+
+    def discard_test(self):
+        path = self._folder("build")
+        with patch.object(self.trash, "empty") as empty:
+            self.trash.discard(path)
+        empty.assert_called_once_with(wait=False)
+        self.assertFalse(os.path.exists(path))
+        self.assertEqual(len(os.listdir(self.trash.folder)), 1)
+
+        self.trash.empty()
+        self.assertEqual(os.listdir(self.trash.folder), [])
+        self.trash.discard(path)  # Not existing
+
+    def background_test(self):
+        for name in ("build", "package", "source"):
+            self.trash.discard(self._folder(name))
+        deadline = time.time() + 10
+        while os.listdir(self.trash.folder) and time.time() < deadline:
+            time.sleep(0.05)
+        self.assertEqual(os.listdir(self.trash.folder), [])
+        self.assertEqual(os.listdir(self.store), [])
+
+    def cannot_move_test(self):
+        path = self._folder("build")
+        with patch("os.rename", side_effect=OSError("Cross-device link")):
+            self.trash.discard(path)
+        self.assertFalse(os.path.exists(path))
+        self.assertEqual(os.listdir(self.trash.folder), [])
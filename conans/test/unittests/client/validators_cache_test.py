@@ -0,0 +1,38 @@
+import os
+import time
+import unittest
+
+from conans.client.store.validators_cache import ValidatorsCache
+from conans.test.utils.test_files import temp_folder
+
+
+class ValidatorsCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = ValidatorsCache(os.path.join(temp_folder(), ".validators.db"),
+                                     max_entries=3)
+
+    def get_set_test(self):
+        url = "http://remote/v1/files/lib/1.0/user/channel/0/export/conanmanifest.txt"
+        self.assertIsNone(self.cache.get(url))
+        self.cache.set(url + "?signature=token1", '"etag1"', b"contents")
+        # The query (the signature of the v1 urls) is not part of the key
+        self.assertEqual(self.cache.get(url + "?signature=token2"), ('"etag1"', b"contents"))
+        self.cache.set(url, '"etag2"', bytearray(b"new contents"))
+        self.assertEqual(self.cache.get(url), ('"etag2"', b"new contents"))
+
+    def prune_test(self):
+        for i in range(3):
+            self.cache.set("http://remote/file%d" % i, '"etag"', b"contents")
+            time.sleep(0.02)  # Different "used" times also with low resolution clocks
+        self.cache.touch("http://remote/file0")
+        time.sleep(0.02)
+        self.cache.set("http://remote/file3", '"etag"', b"contents")
+        self.assertIsNone(self.cache.get("http://remote/file1"))
+        for i in (0, 2, 3):
+            self.assertIsNotNone(self.cache.get("http://remote/file%d" % i))
+
+    def broken_database_test(self):
+        cache = ValidatorsCache(os.path.join(temp_folder(), "missing", ".validators.db"))
+        cache.set("http://remote/file", '"etag"', b"contents")
+        self.assertIsNone(cache.get("http://remote/file"))
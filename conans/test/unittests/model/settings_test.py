@@ -149,6 +149,46 @@ class SettingsTest(unittest.TestCase):
         self.sut.os = "Linux"
         self.assertEqual(self.sut.os, "Linux")
 
+    def copy_test(self):
+        self.sut.compiler = "gcc"
+        self.sut.compiler.arch = "x86"
+        copied = self.sut.copy()
+        # Both of them are shared until modified
+        self.assertIs(copied._data["compiler"], self.sut._data["compiler"])
+
+        copied.compiler.arch = "x64"
+        copied.compiler.arch.speed = "C"
+        copied.compiler["Visual Studio"].version.remove("12")
+        del copied.os
+        self.assertEqual(self.sut.values.dumps(), "compiler=gcc\ncompiler.arch=x86")
+        self.assertEqual(copied.values.dumps(),
+                         "compiler=gcc\ncompiler.arch=x64\ncompiler.arch.speed=C")
+        self.assertEqual(self.sut.fields, ["compiler", "os"])
+        self.sut.compiler = "Visual Studio"
+        self.sut.compiler.version = "12"
+        # Only the modified path was copied
+        self.assertIs(copied._data["compiler"]._definition["gcc"]._data["version"],
+                      self.sut._data["compiler"]._definition["gcc"]._data["version"])
+
+        # The original modified after the copy doesn't change it
+        self.sut.compiler = "gcc"
+        self.sut.compiler.arch = "x86"
+        self.sut.compiler.arch.speed = "A"
+        copied.compiler.arch.remove("x86")
+        self.assertEqual(copied.values.dumps(),
+                         "compiler=gcc\ncompiler.arch=x64\ncompiler.arch.speed=C")
+        self.assertEqual(self.sut.values.dumps(),
+                         "compiler=gcc\ncompiler.arch=x86\ncompiler.arch.speed=A")
+
+    def copy_constraint_test(self):
+        copied = self.sut.copy()
+        copied.constraint({"compiler": {"gcc": {"version": ["4.9"], "arch": None}}})
+        self.assertEqual(copied.fields, ["compiler"])
+        self.assertEqual(copied.compiler.values_range, ["gcc"])
+        self.assertEqual(self.sut.fields, ["compiler", "os"])
+        self.assertEqual(self.sut.compiler.values_range, ["Visual Studio", "gcc"])
+        self.assertEqual(self.sut.compiler["gcc"].version.values_range, ["4.8", "4.9"])
+
     def loads_default_test(self):
         settings = Settings.loads("""os: [Windows, Linux, Macos, Android, FreeBSD, SunOS]
 arch: [x86, x86_64, arm]
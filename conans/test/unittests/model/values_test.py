@@ -25,3 +25,15 @@ class ValuesTest(unittest.TestCase):
         v.compiler = None
         self.assertEqual(v.as_list(), [('compiler', 'None')])
         self.assertEqual(v.dumps(), "compiler=None")
+
+    def copy_test(self):
+        v = Values.from_list([("compiler", "gcc"), ("compiler.version", "4.9"), ("os", "Linux")])
+        copied = v.copy()
+        copied.compiler.version = "5"
+        del copied.os
+        self.assertEqual(v.dumps(), "compiler=gcc\ncompiler.version=4.9\nos=Linux")
+        self.assertEqual(copied.dumps(), "compiler=gcc\ncompiler.version=5")
+
+        v.compiler.clear()
+        self.assertEqual(v.dumps(), "compiler=\nos=Linux")
+        self.assertEqual(copied.dumps(), "compiler=gcc\ncompiler.version=5")
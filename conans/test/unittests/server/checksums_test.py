@@ -0,0 +1,129 @@
+import hashlib
+import os
+import time
+import unittest
+from datetime import timedelta
+from io import BytesIO
+
+from mock import patch
+
+from conans.errors import RequestErrorException
+from conans.server.store import checksums
+from conans.server.crypto.jwt.jwt_updown_manager import JWTUpDownAuthManager
+from conans.server.store.checksums import ChecksumsScrubber, load_checksums, scrub_checksums, \
+    write_stream
+from conans.server.store.disk_adapter import ServerDiskAdapter
+from conans.test.utils.test_files import temp_folder
+from conans.util.files import load, md5, save
+
+
+class WriteStreamTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = temp_folder()
+        self.path = os.path.join(self.folder, "0", "package", "conan_package.tgz")
+        self.content = os.urandom(2500)
+
+    def checksums_test(self):
+        with patch.object(checksums, "_BLOCK_SIZE", 1000):
+            ret = write_stream(BytesIO(self.content + b"trailing"), self.path, len(self.content))
+        expected = {"md5": hashlib.md5(self.content).hexdigest(),
+                    "sha1": hashlib.sha1(self.content).hexdigest(),
+                    "size": 2500,
+                    "mtime": os.stat(self.path).st_mtime}
+        self.assertEqual(ret, expected)
+        self.assertEqual(load_checksums(self.path), expected)
+        self.assertEqual(load(self.path, binary=True), self.content)
+        self.assertEqual(sorted(os.listdir(os.path.dirname(self.path))),
+                         ["conan_package.tgz", "conan_package.tgz.checksums"])
+
+        # Without size, until the end of the stream
+        ret = write_stream(BytesIO(b"new content"), self.path)
+        self.assertEqual(ret["md5"], hashlib.md5(b"new content").hexdigest())
+        self.assertEqual(load_checksums(self.path), ret)
+
+    def incomplete_test(self):
+        save(self.path, "previous")
+        previous = write_stream(BytesIO(b"previous"), self.path)
+        with self.assertRaisesRegexp(RequestErrorException, "received 2500 of 3000 bytes"):
+            write_stream(BytesIO(self.content), self.path, 3000)
+        # The previous file is kept, without leftovers
+        self.assertEqual(load(self.path), "previous")
+        self.assertEqual(load_checksums(self.path), previous)
+        self.assertEqual(sorted(os.listdir(os.path.dirname(self.path))),
+                         ["conan_package.tgz", "conan_package.tgz.checksums"])
+
+
+class PersistedChecksumsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.storage = temp_folder()
+        self.folder = os.path.join(self.storage, "lib", "1.0", "conan", "stable", "0", "export")
+        self.adapter = ServerDiskAdapter("http://url", self.storage,
+                                         JWTUpDownAuthManager("secret", timedelta(seconds=200)))
+
+    def snapshot_test(self):
+        write_stream(BytesIO(b"uploaded"), os.path.join(self.folder, "conanfile.py"))
+        save(os.path.join(self.folder, "conanmanifest.txt"), "stored before the checksums")
+        expected = {os.path.join(self.folder, "conanfile.py"): md5("uploaded"),
+                    os.path.join(self.folder, "conanmanifest.txt"):
+                        md5("stored before the checksums")}
+        self.assertEqual(self.adapter.get_snapshot(self.folder), expected)
+
+        # Now all of them are persisted and the files are not read again
+        with patch.object(checksums, "compute_checksums", side_effect=AssertionError):
+            self.assertEqual(self.adapter.get_snapshot(self.folder), expected)
+
+        # Modified out of the server, they are computed again
+        save(os.path.join(self.folder, "conanfile.py"), "modified out of the server")
+        expected[os.path.join(self.folder, "conanfile.py")] = md5("modified out of the server")
+        self.assertEqual(self.adapter.get_snapshot(self.folder), expected)
+
+        self.adapter.delete_file(os.path.join(self.folder, "conanfile.py"))
+        self.assertEqual(sorted(os.listdir(self.folder)),
+                         ["conanmanifest.txt", "conanmanifest.txt.checksums"])
+
+    def scrub_test(self):
+        ok = os.path.join(self.folder, "conanfile.py")
+        corrupted = os.path.join(self.folder, "conan_export.tgz")
+        missing = os.path.join(self.folder, "conanmanifest.txt")
+        write_stream(BytesIO(b"contents"), ok)
+        write_stream(BytesIO(b"contents"), corrupted)
+        save(missing, "contents")
+        # Same size and mtime, different contents
+        stat = os.stat(corrupted)
+        save(corrupted, "CONTENTS")
+        os.utime(corrupted, (stat.st_atime, stat.st_mtime))
+
+        self.assertEqual(scrub_checksums(self.storage), [corrupted])
+        self.assertEqual(load_checksums(missing)["md5"], md5("contents"))
+
+        # Metadata rewritten in place is not checksummed
+        for filename in ("revisions.txt", "revisions.txt.lock"):
+            save(os.path.join(self.folder, filename), "metadata")
+            scrub_checksums(self.storage)
+            self.assertFalse(os.path.exists(os.path.join(self.folder,
+                                                         filename + ".checksums")))
+
+        scrubber = ChecksumsScrubber(self.storage, 0.01)
+        scrubber.start()
+        try:
+            for _ in range(500):
+                if scrubber.corrupted:
+                    break
+                time.sleep(0.01)
+            self.assertEqual(scrubber.corrupted, [corrupted])
+        finally:
+            scrubber.stop()
+            scrubber.join()
+
+    @unittest.skipUnless(hasattr(os, "link"), "Requires hardlinks")
+    def scrub_hardlinks_test(self):
+        write_stream(BytesIO(b"contents"), os.path.join(self.folder, "conanfile.py"))
+        other = os.path.join(self.storage, "other", "conanfile.py")
+        os.makedirs(os.path.dirname(other))
+        os.link(os.path.join(self.folder, "conanfile.py"), other)
+        with patch.object(checksums, "compute_checksums",
+                          wraps=checksums.compute_checksums) as compute:
+            scrub_checksums(self.storage)
+        self.assertEqual(compute.call_count, 1)
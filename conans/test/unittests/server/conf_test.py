@@ -85,6 +85,16 @@ text=value
         self.assertEquals(config.host_name, "localhost")
         self.assertEquals(config.public_port, 12345)
         self.assertEquals(config.public_url, "https://localhost:12345/v1")
+        self.assertEquals(config.workers, 1)
+        self.assertIsNone(config.request_timeout)
+        self.assertIsNone(config.download_mode)
+        self.assertIsNone(config.download_redirect_location)
+        self.assertIsNone(config.checksums_scrub_hours)
+        self.assertEquals(config.memory_cache_mb, 0)
+        self.assertFalse(config.disk_storage_dedup)
+        self.assertIsNone(config.upstream_url)
+        self.assertEquals(config.upstream_ttl, 60)
+        self.assertEquals(config.upstream_timeout, 30)
 
         # Now check with environments
         tmp_storage = temp_folder()
@@ -96,6 +106,17 @@ text=value
         self.environ["CONAN_SERVER_USERS"] = "lasote:lasotepass,pepe2:pepepass2"
         self.environ["CONAN_HOST_NAME"] = "remotehost"
         self.environ["CONAN_SERVER_PUBLIC_PORT"] = "33333"
+        self.environ["CONAN_SERVER_WORKERS"] = "8"
+        self.environ["CONAN_SERVER_REQUEST_TIMEOUT"] = "30"
+        self.environ["CONAN_SERVER_DOWNLOAD_MODE"] = "x-accel-redirect"
+        self.environ["CONAN_SERVER_CHECKSUMS_SCRUB_HOURS"] = "24"
+        self.environ["CONAN_SERVER_MEMORY_CACHE_MB"] = "128"
+        self.environ["CONAN_SERVER_DISK_STORAGE_DEDUP"] = "True"
+        self.environ["CONAN_SERVER_DOWNLOAD_REDIRECT_LOCATION"] = "/internal_storage"
+        self.environ["CONAN_SERVER_UPSTREAM_URL"] = "https://central.example.com"
+        self.environ["CONAN_SERVER_UPSTREAM_USER"] = "proxy"
+        self.environ["CONAN_SERVER_UPSTREAM_TTL"] = "300"
+        self.environ["CONAN_SERVER_UPSTREAM_TIMEOUT"] = "5"
 
         config = ConanServerConfigParser(self.file_path, environment=self.environ)
         self.assertEquals(config.jwt_secret,  "newkey")
@@ -110,3 +131,15 @@ text=value
         self.assertEquals(config.host_name, "remotehost")
         self.assertEquals(config.public_port, 33333)
         self.assertEquals(config.public_url, "http://remotehost:33333/v1")
+        self.assertEquals(config.workers, 8)
+        self.assertEquals(config.request_timeout, 30)
+        self.assertEquals(config.download_mode, "x-accel-redirect")
+        self.assertEquals(config.download_redirect_location, "/internal_storage")
+        self.assertEquals(config.checksums_scrub_hours, 24)
+        self.assertEquals(config.memory_cache_mb, 128)
+        self.assertTrue(config.disk_storage_dedup)
+        self.assertEquals(config.upstream_url, "https://central.example.com")
+        self.assertEquals(config.upstream_user, "proxy")
+        self.assertIsNone(config.upstream_password)
+        self.assertEquals(config.upstream_ttl, 300)
+        self.assertEquals(config.upstream_timeout, 5)
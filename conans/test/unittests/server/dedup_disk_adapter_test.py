@@ -0,0 +1,66 @@
+import os
+import platform
+import unittest
+from datetime import timedelta
+from io import BytesIO
+
+from conans.server.crypto.jwt.jwt_updown_manager import JWTUpDownAuthManager
+from conans.server.store.checksums import load_checksums
+from conans.server.store.dedup_disk_adapter import BLOBS_FOLDER, ServerDedupDiskAdapter
+from conans.test.utils.test_files import temp_folder
+from conans.util.files import load, md5, sha1sum
+
+
+@unittest.skipIf(platform.system() == "Windows", "Needs hardlinks")
+class ServerDedupDiskAdapterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.storage = temp_folder()
+        self.adapter = ServerDedupDiskAdapter("http://url", self.storage,
+                                              JWTUpDownAuthManager("secret",
+                                                                   timedelta(seconds=200)))
+        self.stable = os.path.join(self.storage, "lib", "1.0", "conan", "stable", "0", "export")
+        self.testing = os.path.join(self.storage, "lib", "1.0", "conan", "testing", "0", "export")
+
+    def _blobs(self):
+        blobs = os.path.join(self.storage, BLOBS_FOLDER)
+        return sorted(f for _, _, files in os.walk(blobs) for f in files
+                      if not f.endswith(".checksums"))
+
+    def dedup_test(self):
+        sources = os.path.join(self.stable, "conan_sources.tgz")
+        other_sources = os.path.join(self.testing, "conan_sources.tgz")
+        self.adapter.write_stream(BytesIO(b"sources"), sources)
+        self.adapter.write_stream(BytesIO(b"sources"), other_sources)
+        self.adapter.write_stream(BytesIO(b"conanfile"), os.path.join(self.stable, "conanfile.py"))
+
+        self.assertEqual(os.stat(sources).st_ino, os.stat(other_sources).st_ino)
+        self.assertEqual(os.stat(sources).st_nlink, 3)
+        self.assertEqual(len(self._blobs()), 2)
+        self.assertEqual(load_checksums(other_sources)["md5"], md5("sources"))
+        self.assertEqual(self.adapter.get_snapshot(self.testing),
+                         {other_sources: md5("sources")})
+
+        # Replacing a file doesn't modify the others
+        self.adapter.write_stream(BytesIO(b"new sources"), other_sources)
+        self.assertEqual(load(sources), "sources")
+        self.assertEqual(os.stat(sources).st_nlink, 2)
+
+        self.adapter.delete_folder(self.stable)
+        self.assertEqual(self._blobs(), [sha1sum(other_sources)])
+        self.adapter.delete_file(other_sources)
+        self.assertEqual(self._blobs(), [])
+
+    def deploy_checksum_test(self):
+        sources = os.path.join(self.stable, "conan_sources.tgz")
+        self.adapter.write_stream(BytesIO(b"sources"), sources)
+        other_sources = os.path.join(self.testing, "conan_sources.tgz")
+
+        self.assertFalse(self.adapter.deploy_checksum(other_sources, "1" * 40))
+        self.assertFalse(self.adapter.deploy_checksum(other_sources, "../../conanfile.py"))
+        self.assertFalse(os.path.exists(other_sources))
+
+        self.assertTrue(self.adapter.deploy_checksum(other_sources, sha1sum(sources).upper()))
+        self.assertEqual(load(other_sources), "sources")
+        self.assertEqual(load_checksums(other_sources)["md5"], md5("sources"))
+        self.assertEqual(os.stat(sources).st_nlink, 3)
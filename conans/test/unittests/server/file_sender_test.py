@@ -0,0 +1,106 @@
+import os
+import unittest
+
+import bottle
+
+from conans.errors import ConanException
+from conans.server.service.file_sender import FileSender
+from conans.server.service.files_cache import SmallFilesCache
+from conans.server.store.checksums import checksums_path, get_checksums
+from conans.test.utils.test_files import temp_folder
+from conans.util.files import save, sha1sum
+
+
+class FileSenderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.storage = temp_folder()
+        self.path = os.path.join(self.storage, "lib", "1.0", "conan", "stable", "0", "export",
+                                 "conan sources.tgz")
+        save(self.path, "contents")
+
+    def tearDown(self):
+        bottle.request.bind({})
+
+    def python_test(self):
+        response = FileSender()(self.path)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.body.read(), b"contents")
+        response.body.close()
+        self.assertEqual(response.headers["Content-Length"], "8")
+
+    def x_accel_redirect_test(self):
+        sender = FileSender("x-accel-redirect", self.storage, "/internal_storage/")
+        response = sender(self.path)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.body, "")
+        self.assertEqual(response.headers["X-Accel-Redirect"],
+                         "/internal_storage/lib/1.0/conan/stable/0/export/conan%20sources.tgz")
+        self.assertEqual(response.headers["Content-Type"], "x-gzip")
+
+        outside = os.path.join(temp_folder(), "file.txt")
+        save(outside, "contents")
+        self.assertEqual(sender(outside).status_code, 403)
+        self.assertEqual(sender(self.path + ".missing").status_code, 404)
+
+    def x_sendfile_test(self):
+        response = FileSender("x-sendfile")(self.path)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["X-Sendfile"], self.path)
+
+    def invalid_test(self):
+        with self.assertRaisesRegexp(ConanException, "Invalid download mode 'nginx'"):
+            FileSender("nginx")
+        with self.assertRaisesRegexp(ConanException, "needs a redirect location"):
+            FileSender("x-accel-redirect", self.storage)
+
+    def etag_test(self):
+        get_checksums(self.path)
+        etag = '"%s"' % sha1sum(self.path)
+        for sender in (FileSender(), FileSender("x-sendfile")):
+            bottle.request.bind({})
+            response = sender(self.path)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.headers["ETag"], etag)
+            if hasattr(response.body, "close"):
+                response.body.close()
+
+            bottle.request.bind({"HTTP_IF_NONE_MATCH": '"other", %s' % etag})
+            response = sender(self.path)
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response.headers["ETag"], etag)
+            self.assertEqual(response.body, "")
+
+            bottle.request.bind({"HTTP_IF_NONE_MATCH": '"other"'})
+            response = sender(self.path)
+            self.assertEqual(response.status_code, 200)
+            if hasattr(response.body, "close"):
+                response.body.close()
+
+    def etag_without_checksums_test(self):
+        # The legacy files are not hashed in the request, they have no ETag until the scrubber
+        # saves their checksums
+        for sender in (FileSender(), FileSender("x-sendfile")):
+            bottle.request.bind({"HTTP_IF_NONE_MATCH": "*"})
+            response = sender(self.path)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn("ETag", response.headers)
+            if hasattr(response.body, "close"):
+                response.body.close()
+        self.assertFalse(os.path.exists(checksums_path(self.path)))
+
+    def files_cache_test(self):
+        files_cache = SmallFilesCache(1024)
+        sender = FileSender(files_cache=files_cache)
+        etag = '"%s"' % sha1sum(self.path)
+        for _ in range(2):
+            response = sender(self.path)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.body, b"contents")
+            self.assertEqual(response.headers["ETag"], etag)
+            self.assertEqual(response.headers["Content-Type"], "x-gzip")
+        self.assertEqual((files_cache.hits, files_cache.misses), (1, 1))
+
+        bottle.request.bind({"HTTP_IF_NONE_MATCH": etag})
+        self.assertEqual(sender(self.path).status_code, 304)
+        self.assertEqual(sender(self.path + ".missing").status_code, 404)
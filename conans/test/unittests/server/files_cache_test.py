@@ -0,0 +1,56 @@
+import hashlib
+import os
+import unittest
+from io import BytesIO
+
+from conans.server.service.files_cache import SmallFilesCache
+from conans.server.store.checksums import write_stream
+from conans.test.utils.test_files import temp_folder
+from conans.util.files import save
+
+
+class SmallFilesCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = temp_folder()
+        self.cache = SmallFilesCache(max_size=25, max_file_size=10)
+
+    def _path(self, name, contents):
+        path = os.path.join(self.folder, name)
+        save(path, contents)
+        return path
+
+    def hits_test(self):
+        path = self._path("conanmanifest.txt", "manifest")
+        expected = (b"manifest", '"%s"' % hashlib.sha1(b"manifest").hexdigest())
+        self.assertEqual(self.cache.get(path), expected)
+        self.assertEqual(self.cache.get(path), expected)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        self.assertIn("50.0% hits (1 hits, 1 misses), 1 files, 8 bytes", self.cache.stats())
+
+        # Too big files are not cached
+        big = self._path("conan_package.tgz", "0123456789A")
+        self.assertIsNone(self.cache.get(big))
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def invalidation_test(self):
+        path = self._path("conaninfo.txt", "info")
+        self.assertEqual(self.cache.get(path)[0], b"info")
+        write_stream(BytesIO(b"new info"), path)  # Upload
+        self.assertEqual(self.cache.get(path)[0], b"new info")
+        os.remove(path)
+        self.assertIsNone(self.cache.get(path))
+        self.assertIn("0 files, 0 bytes", self.cache.stats())
+
+    def eviction_test(self):
+        paths = [self._path("file%d" % i, "contents%d" % i) for i in range(3)]  # 9 bytes each
+        self.cache.get(paths[0])
+        self.cache.get(paths[1])
+        self.cache.get(paths[0])  # Now the least recently used is file1
+        self.cache.get(paths[2])
+        self.assertIn("2 files, 18 bytes", self.cache.stats())
+        self.cache.get(paths[0])
+        self.cache.get(paths[2])
+        self.assertEqual(self.cache.hits, 3)
+        self.cache.get(paths[1])
+        self.assertEqual(self.cache.misses, 4)
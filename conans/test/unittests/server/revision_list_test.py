@@ -29,3 +29,13 @@ class RevisionListTest(unittest.TestCase):
         loaded.remove_revision("rev1")
         self.assertEquals(loaded.latest_revision().revision, "rev2")
         self.assertIsNotNone(loaded.latest_revision().time)
+
+    def test_add_existing(self):
+        rev = RevisionList()
+        rev.add_revision("rev1")
+        rev.add_revision("rev2")
+        rev.add_revision("rev1")
+        self.assertEquals([r.revision for r in rev.items()], ["rev1", "rev2"])
+        self.assertEquals(rev.latest_revision().revision, "rev1")
+        self.assertIsNotNone(rev.get_time("rev2"))
+        self.assertIsNone(rev.get_time("rev3"))
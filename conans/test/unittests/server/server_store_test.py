@@ -0,0 +1,105 @@
+import os
+import unittest
+from datetime import timedelta
+
+import six
+from mock import patch
+
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.server.crypto.jwt.jwt_updown_manager import JWTUpDownAuthManager
+from conans.server.store import server_store
+from conans.server.store.disk_adapter import ServerDiskAdapter
+from conans.server.store.server_store import ServerStore
+from conans.test.utils.test_files import temp_folder
+from conans.util.files import load, save
+from conans.util.parallel import run_in_parallel
+
+
+class ServerStoreRevisionsTest(unittest.TestCase):
+
+    def setUp(self):
+        updown_auth_manager = JWTUpDownAuthManager("secret", timedelta(seconds=200))
+        adapter = ServerDiskAdapter("http://url", temp_folder(), updown_auth_manager)
+        self.server_store = ServerStore(storage_adapter=adapter)
+        self.ref = ConanFileReference.loads("lib/1.0@conan/stable")
+
+    def concurrent_recipe_revisions_test(self):
+        refs = [self.ref.copy_with_rev("rev%d" % i) for i in range(40)]
+        errors = run_in_parallel(self.server_store.update_last_revision, refs, 8)
+        self.assertEqual(errors, [None] * len(refs))
+        revisions = self.server_store.get_recipe_revisions(self.ref)
+        self.assertEqual(sorted(r.revision for r in revisions),
+                         sorted(r.revision for r in refs))
+
+        run_in_parallel(self.server_store._remove_revision_from_index, refs[:20], 8)
+        revisions = self.server_store.get_recipe_revisions(self.ref)
+        self.assertEqual(sorted(r.revision for r in revisions),
+                         sorted(r.revision for r in refs[20:]))
+
+    def concurrent_package_revisions_test(self):
+        ref = self.ref.copy_with_rev("rev")
+        self.server_store.update_last_revision(ref)
+        prefs = [PackageReference(ref, "pkg_id", "prev%d" % i) for i in range(40)]
+        run_in_parallel(self.server_store.update_last_package_revision, prefs, 8)
+        revisions = self.server_store.get_package_revisions(prefs[0])
+        self.assertEqual(sorted(r.revision for r in revisions),
+                         sorted(p.revision for p in prefs))
+
+    def revisions_cache_test(self):
+        ref = self.ref.copy_with_rev("rev1")
+        adapter = self.server_store._storage_adapter
+        with patch.object(adapter, "update_file", wraps=adapter.update_file) as update_file:
+            for _ in range(5):  # Once per uploaded file
+                self.server_store.update_last_revision(ref)
+            self.assertEqual(update_file.call_count, 1)
+
+        with patch.object(server_store, "_RACY_INTERVAL", -10), \
+                patch.object(adapter, "read_file", wraps=adapter.read_file) as read_file:
+            for _ in range(5):
+                self.assertEqual(self.server_store.get_last_revision(self.ref).revision, "rev1")
+                self.assertIsNotNone(self.server_store.get_revision_time(ref))
+            self.assertLessEqual(read_file.call_count, 1)
+
+        # Modified by other server process sharing the storage
+        other_store = ServerStore(storage_adapter=adapter)
+        other_store.update_last_revision(self.ref.copy_with_rev("rev2longer"))
+        self.assertEqual(self.server_store.get_last_revision(self.ref).revision, "rev2longer")
+        other_store._remove_revision_from_index(self.ref.copy_with_rev("rev2longer"))
+        self.assertEqual(self.server_store.get_last_revision(self.ref).revision, "rev1")
+
+    def revisions_cache_bounded_test(self):
+        refs = [ConanFileReference.loads("lib%d/1.0@conan/stable#rev" % i) for i in range(4)]
+        for ref in refs:
+            self.server_store.update_last_revision(ref)
+
+        adapter = self.server_store._storage_adapter
+        with patch.object(server_store, "_RACY_INTERVAL", -10), \
+                patch.object(server_store, "_REVISIONS_CACHE_ENTRIES", 2), \
+                patch.object(adapter, "read_file", wraps=adapter.read_file) as read_file:
+            for ref in refs[:3]:
+                self.server_store.get_last_revision(ref)
+            self.assertEqual(len(self.server_store._revisions_cache), 2)
+            self.server_store.get_last_revision(refs[1])  # Now the most recently used
+            self.server_store.get_last_revision(refs[3])  # Evicts refs[2]
+            self.assertEqual(read_file.call_count, 4)
+
+            self.server_store.get_last_revision(refs[1])
+            self.server_store.get_last_revision(refs[3])
+            self.assertEqual(read_file.call_count, 4)
+            self.server_store.get_last_revision(refs[2])
+            self.assertEqual(read_file.call_count, 5)
+            self.assertEqual(len(self.server_store._revisions_cache), 2)
+
+    def revisions_cache_racy_test(self):
+        self.server_store.update_last_revision(self.ref.copy_with_rev("rev1"))
+        self.assertEqual(self.server_store.get_last_revision(self.ref).revision, "rev1")
+
+        # Rewritten by other server process in the same timestamp tick, with the same size
+        rev_file = self.server_store._recipe_revisions_file(self.ref)
+        stat = os.stat(rev_file)
+        save(rev_file, load(rev_file).replace("rev1", "rev2"))
+        if six.PY3:
+            os.utime(rev_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        else:
+            os.utime(rev_file, (stat.st_atime, stat.st_mtime))
+        self.assertEqual(self.server_store.get_last_revision(self.ref).revision, "rev2")
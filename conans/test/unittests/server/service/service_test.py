@@ -1,6 +1,7 @@
 import os
 import unittest
 from datetime import timedelta
+from io import BytesIO
 from time import sleep
 
 from conans import DEFAULT_REVISION_V1
@@ -12,20 +13,11 @@ from conans.server.crypto.jwt.jwt_updown_manager import JWTUpDownAuthManager
 from conans.server.service.authorize import BasicAuthorizer
 from conans.server.service.service import ConanService, FileUploadDownloadService, \
     SearchService
+from conans.server.store.checksums import load_checksums
 from conans.server.store.disk_adapter import ServerDiskAdapter
 from conans.server.store.server_store import ServerStore
 from conans.test.utils.test_files import hello_source_files, temp_folder
-from conans.util.files import load, md5sum, mkdir, save, save_files
-
-
-class MockFileSaver(object):
-
-    def __init__(self, filename, content):
-        self.filename = filename
-        self.content = content
-
-    def save(self, abspath):
-        save(os.path.join(abspath, self.filename), self.content)
+from conans.util.files import load, md5, md5sum, mkdir, save, save_files
 
 
 class FileUploadDownloadServiceTest(unittest.TestCase):
@@ -35,7 +27,8 @@ class FileUploadDownloadServiceTest(unittest.TestCase):
                                                         timedelta(seconds=1))
 
         self.storage_dir = temp_folder()
-        self.service = FileUploadDownloadService(self.updown_auth_manager, self.storage_dir)
+        adapter = ServerDiskAdapter("http://url", self.storage_dir, self.updown_auth_manager)
+        self.service = FileUploadDownloadService(self.updown_auth_manager, ServerStore(adapter))
         self.disk_path = os.path.join(self.storage_dir, "dir", "other")
         self.relative_file_path = "dir/other/thefile.txt"
         self.absolute_file_path = os.path.join(self.disk_path, "thefile.txt")
@@ -62,15 +55,17 @@ class FileUploadDownloadServiceTest(unittest.TestCase):
         token = self.updown_auth_manager.get_token_for(self.relative_file_path,
                                                        "pepe", len(self.content))
 
-        file_saver = MockFileSaver("thefile.txt", self.content)
         self.assertFalse(os.path.exists(self.absolute_file_path))
-        self.service.put_file(file_saver, self.absolute_file_path, token, len(self.content))
+        self.service.put_file(BytesIO(self.content.encode()), self.absolute_file_path, token,
+                              len(self.content))
 
-        self.assertTrue(os.path.exists(self.absolute_file_path))
+        self.assertEquals(load(self.absolute_file_path), self.content)
+        self.assertEquals(load_checksums(self.absolute_file_path)["md5"], md5(self.content))
 
         # Raises if wrong size
-        self.assertRaises(RequestErrorException, self.service.put_file, file_saver,
-                          self.absolute_file_path, token, len(self.content) + 1)
+        self.assertRaises(RequestErrorException, self.service.put_file,
+                          BytesIO(self.content.encode()), self.absolute_file_path, token,
+                          len(self.content) + 1)
 
 
 class ConanServiceTest(unittest.TestCase):
@@ -239,6 +234,43 @@ class ConanServiceTest(unittest.TestCase):
                                                 'settings': {},
                                                 'recipe_hash': None}})
 
+    def test_search_page(self):
+        conan_ref2 = ConanFileReference("openssl", "3.0", "lasote", "stable", DEFAULT_REVISION_V1)
+        conan_ref3 = ConanFileReference("Assimp", "1.10", "fenix", "stable", DEFAULT_REVISION_V1)
+        conan_ref4 = ConanFileReference("assimpFake", "0.1", "phil", "stable", DEFAULT_REVISION_V1)
+        conan_ref5 = ConanFileReference("openssl", "3.1", "lasote", "stable", DEFAULT_REVISION_V1)
+        for ref in (conan_ref2, conan_ref3, conan_ref4, conan_ref5):
+            save_files(self.server_store.export(ref), {"dummy.txt": "//"})
+        expected = [conan_ref3, conan_ref4, self.conan_reference, conan_ref2, conan_ref5]
+
+        references, cursor = self.search_service.search_page(limit=2)
+        self.assertEqual(references, expected[:2])
+        references, cursor = self.search_service.search_page(cursor=cursor, limit=2)
+        self.assertEqual(references, expected[2:4])
+        references, cursor = self.search_service.search_page(cursor=cursor, limit=2)
+        self.assertEqual(references, expected[4:])
+        self.assertIsNone(cursor)
+
+        references, cursor = self.search_service.search_page(pattern="openssl/3*@lasote/*",
+                                                             ignorecase=False, limit=1)
+        self.assertEqual(references, [conan_ref2])
+        references, cursor = self.search_service.search_page(pattern="openssl/3*@lasote/*",
+                                                             ignorecase=False, cursor=cursor,
+                                                             limit=1)
+        self.assertEqual(references, [conan_ref5])
+        references, _ = self.search_service.search_page(pattern="ASSIMP*", limit=10)
+        self.assertEqual(references, [conan_ref3, conan_ref4])
+        self.assertEqual(self.search_service.search_page(pattern="ASSIMP*", ignorecase=False,
+                                                         limit=10), ([], None))
+
+        # Only the readable references
+        authorizer = BasicAuthorizer([("openssl/*@lasote/*", "*")], [])
+        search_service = SearchService(authorizer, self.server_store, "lasote")
+        self.assertEqual(search_service.search_page(limit=5), (expected[2:], None))
+
+        with self.assertRaisesRegexp(RequestErrorException, "Invalid search cursor"):
+            self.search_service.search_page(cursor="openssl/3.0", limit=2)
+
     def remove_test(self):
         conan_ref2 = ConanFileReference("OpenCV", "3.0", "lasote", "stable", DEFAULT_REVISION_V1)
         conan_ref3 = ConanFileReference("Assimp", "1.10", "lasote", "stable", DEFAULT_REVISION_V1)
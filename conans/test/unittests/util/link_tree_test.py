@@ -0,0 +1,107 @@
+import errno
+import os
+import platform
+import shutil
+import stat
+import time
+import unittest
+
+from mock import patch
+from nose.plugins.attrib import attr
+
+from conans.client.tools import replace_in_file
+from conans.test.utils.test_files import temp_folder
+from conans.test.utils.tools import TestBufferConanOutput
+from conans.util import files
+from conans.util.files import FileLinker, link_tree, load, mkdir, save, save_append
+
+
+@unittest.skipIf(platform.system() == "Windows", "Needs symlinks and hardlinks")
+class LinkTreeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.source = temp_folder()
+        save(os.path.join(self.source, "src", "main.cpp"), "int main(){}")
+        save(os.path.join(self.source, "configure"), "#!/bin/sh")
+        os.chmod(os.path.join(self.source, "configure"), 0o755)
+        save(os.path.join(self.source, "ignored", "file.txt"), "ignored")
+        mkdir(os.path.join(self.source, "empty"))
+        os.symlink("src", os.path.join(self.source, "link_src"))
+        self.build = os.path.join(temp_folder(), "build")
+
+    def _same_file(self, name):
+        source = os.stat(os.path.join(self.source, name))
+        build = os.stat(os.path.join(self.build, name))
+        return (source.st_dev, source.st_ino) == (build.st_dev, build.st_ino)
+
+    def hardlink_test(self):
+        link_tree(self.source, self.build, ignore=shutil.ignore_patterns("ignored"),
+                  linker=FileLinker(reflink=False))
+        self.assertEqual(sorted(os.listdir(self.build)),
+                         ["configure", "empty", "link_src", "src"])
+        self.assertTrue(self._same_file("src/main.cpp"))
+        self.assertTrue(self._same_file("configure"))
+        self.assertEqual(os.readlink(os.path.join(self.build, "link_src")), "src")
+        self.assertEqual(os.listdir(os.path.join(self.build, "empty")), [])
+
+    def writes_break_links_test(self):
+        link_tree(self.source, self.build, linker=FileLinker(reflink=False))
+        main = os.path.join(self.build, "src", "main.cpp")
+        save(main, "int main(){return 1;}")
+        configure = os.path.join(self.build, "configure")
+        replace_in_file(configure, "#!/bin/sh", "#!/bin/bash", output=TestBufferConanOutput())
+        save_append(os.path.join(self.build, "ignored", "file.txt"), " appended")
+
+        self.assertEqual(load(os.path.join(self.source, "src", "main.cpp")), "int main(){}")
+        self.assertEqual(load(os.path.join(self.source, "configure")), "#!/bin/sh")
+        self.assertEqual(load(os.path.join(self.source, "ignored", "file.txt")), "ignored")
+        self.assertEqual(load(main), "int main(){return 1;}")
+        self.assertEqual(load(configure), "#!/bin/bash")
+        self.assertTrue(os.access(configure, os.X_OK))
+        self.assertFalse(self._same_file("configure"))
+
+    def read_only_links_test(self):
+        link_tree(self.source, self.build, linker=FileLinker(reflink=False))
+        main = os.path.join(self.source, "src", "main.cpp")
+        os.chmod(main, 0o444)  # e.g. the same inode is a file of the read-only cache
+        build_main = os.path.join(self.build, "src", "main.cpp")
+        save(build_main, "int main(){return 1;}")
+
+        self.assertEqual(load(main), "int main(){}")
+        self.assertEqual(stat.S_IMODE(os.stat(main).st_mode), 0o444)
+        self.assertEqual(load(build_main), "int main(){return 1;}")
+        self.assertTrue(os.stat(build_main).st_mode & stat.S_IWRITE)
+
+    def reflink_fallback_test(self):
+        linker = FileLinker()
+        with patch.object(files, "_reflink", side_effect=OSError(errno.EOPNOTSUPP, "No")):
+            link_tree(self.source, self.build, linker=linker)
+        self.assertFalse(linker.reflink)
+        self.assertTrue(self._same_file("src/main.cpp"))
+
+    def copy_fallback_test(self):
+        linker = FileLinker(reflink=False)
+        with patch.object(os, "link", side_effect=OSError(errno.EXDEV, "Cross-device")):
+            link_tree(self.source, self.build, linker=linker)
+        self.assertFalse(linker.hardlink)
+        self.assertFalse(self._same_file("src/main.cpp"))
+        self.assertEqual(load(os.path.join(self.build, "src", "main.cpp")), "int main(){}")
+        self.assertTrue(os.access(os.path.join(self.build, "configure"), os.X_OK))
+
+    @attr("slow")
+    def benchmark_test(self):
+        source = temp_folder()
+        content = os.urandom(1024 * 1024)
+        for i in range(200):
+            save(os.path.join(source, "dir%d" % (i % 10), "file%d.bin" % i), content)
+
+        def timed(materialize):
+            build = os.path.join(temp_folder(), "build")
+            start = time.time()
+            materialize(source, build)
+            return time.time() - start
+
+        copy_time = timed(lambda src, dst: shutil.copytree(src, dst, symlinks=True))
+        link_time = timed(link_tree)
+        print("copytree: %.3fs, link_tree: %.3fs" % (copy_time, link_time))
+        self.assertLess(link_time, copy_time)
@@ -0,0 +1,100 @@
+import json
+import os
+import platform
+import threading
+import unittest
+
+from mock import patch
+
+from conans.client import tools
+from conans.test.utils.test_files import temp_folder
+from conans.test.utils.tools import TestBufferConanOutput
+from conans.util import locks, tracer
+from conans.util.files import load
+from conans.util.locks import ReadLock, WriteLock
+
+
+class _LockInThread(threading.Thread):
+
+    def __init__(self, lock):
+        super(_LockInThread, self).__init__()
+        self.daemon = True
+        self.lock = lock
+        self.acquired = threading.Event()
+
+    def run(self):
+        with self.lock:
+            self.acquired.set()
+
+
+@unittest.skipIf(platform.system() == "Windows", "OS shared locks not available in Windows")
+class OSLocksTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = os.path.join(temp_folder(), "pkg", "1.0", "user", "channel")
+        self.output = TestBufferConanOutput()
+
+    def _lock(self, lock_class):
+        return lock_class(self.folder, "pkg/1.0@user/channel", self.output)
+
+    def readers_do_not_block_test(self):
+        with self._lock(ReadLock):
+            with self._lock(ReadLock):
+                pass
+        self.assertNotIn("is locked by another concurrent conan process", self.output)
+        self.assertFalse(os.path.exists(self.folder + ".count"))
+        self.assertTrue(os.path.exists(self.folder + ".flock"))
+
+    def writer_waits_for_reader_test(self):
+        trace_file = os.path.join(temp_folder(), "trace.log")
+        with tools.environment_append({"CONAN_TRACE_FILE": trace_file}):
+            thread = _LockInThread(self._lock(WriteLock))
+            with self._lock(ReadLock):
+                thread.start()
+                self.assertFalse(thread.acquired.wait(0.3))
+            self.assertTrue(thread.acquired.wait(5))
+            thread.join()
+            tracer.flush_trace()
+
+        self.assertIn("pkg/1.0@user/channel is locked by another concurrent conan process",
+                      self.output)
+        actions = [json.loads(line) for line in load(trace_file).splitlines()]
+        self.assertEqual(len(actions), 1)
+        self.assertEqual(actions[0]["_action"], "LOCK_WAIT")
+        self.assertEqual(actions[0]["_id"], "pkg/1.0@user/channel")
+        self.assertEqual(actions[0]["lock"], "write")
+        self.assertGreater(actions[0]["duration"], 0.2)
+
+    def fallback_count_file_test(self):
+        with patch.object(locks, "fcntl", None):
+            with self._lock(ReadLock):
+                self.assertEqual(load(self.folder + ".count"), "1")
+            self.assertEqual(load(self.folder + ".count"), "0")
+            with self._lock(WriteLock):
+                self.assertEqual(load(self.folder + ".count"), "-1")
+            self.assertEqual(load(self.folder + ".count"), "0")
+        self.assertFalse(os.path.exists(self.folder + ".flock"))
+
+    def clean_test(self):
+        with self._lock(WriteLock):
+            pass
+        for lock_file in self._lock(WriteLock).files:
+            open(lock_file, "a").close()
+        locks.Lock.clean(self.folder)
+        self.assertFalse(any(os.path.exists(f) for f in self._lock(WriteLock).files))
+
+    def try_acquire_test(self):
+        with self._lock(ReadLock):
+            self.assertFalse(self._lock(WriteLock).try_acquire())
+        lock = self._lock(WriteLock)
+        self.assertTrue(lock.try_acquire())
+        self.assertFalse(self._lock(WriteLock).try_acquire())
+        lock.__exit__(None, None, None)
+        with patch.object(locks, "fcntl", None):
+            with self._lock(ReadLock):
+                self.assertFalse(self._lock(WriteLock).try_acquire())
+            lock = self._lock(WriteLock)
+            self.assertTrue(lock.try_acquire())
+            self.assertEqual(load(self.folder + ".count"), "-1")
+            lock.__exit__(None, None, None)
+        self.assertNotIn("is locked by another concurrent conan process", self.output)
@@ -0,0 +1,65 @@
+import json
+import os
+import unittest
+
+from mock import patch
+
+from conans.client import tools
+from conans.errors import ConanException
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.test.utils.test_files import temp_folder
+from conans.util import tracer
+from conans.util.files import load
+
+
+class TracerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.trace_file = os.path.join(temp_folder(), "trace.log")
+        self.ref = ConanFileReference.loads("pkg/1.0@user/channel")
+
+    def _actions(self):
+        return [json.loads(line) for line in load(self.trace_file).splitlines()]
+
+    def buffered_test(self):
+        with tools.environment_append({"CONAN_TRACE_FILE": self.trace_file}):
+            tracer.log_recipe_got_from_local_cache(self.ref)
+            tracer.log_download("http://myurl", 0.5, 1234, 0.1)
+            self.assertFalse(os.path.exists(self.trace_file))
+            tracer.flush_trace()
+
+        actions = self._actions()
+        self.assertEqual([a["_action"] for a in actions],
+                         ["GOT_RECIPE_FROM_LOCAL_CACHE", "DOWNLOAD"])
+        self.assertEqual(actions[0]["pid"], os.getpid())
+        self.assertEqual(actions[1]["bytes"], 1234)
+        self.assertEqual(actions[1]["queue_wait"], 0.1)
+        self.assertIn('"_action": "DOWNLOAD"', load(self.trace_file))  # Default format
+
+        tracer.flush_trace()  # Nothing else to write
+        self.assertEqual(len(self._actions()), 2)
+
+    def flush_when_full_test(self):
+        with patch.object(tracer, "FLUSH_SIZE", 3):
+            with patch.object(tracer.fasteners, "InterProcessLock",
+                              wraps=tracer.fasteners.InterProcessLock) as lock:
+                with tools.environment_append({"CONAN_TRACE_FILE": self.trace_file}):
+                    for _ in range(7):
+                        tracer.log_recipe_got_from_local_cache(self.ref)
+                    self.assertEqual(len(self._actions()), 6)
+                    tracer.flush_trace()
+        self.assertEqual(len(self._actions()), 7)
+        self.assertEqual(lock.call_count, 3)  # Once per batch
+
+    def compact_format_test(self):
+        with tools.environment_append({"CONAN_TRACE_FILE": self.trace_file,
+                                       "CONAN_TRACE_FORMAT": "compact"}):
+            tracer.log_package_built(PackageReference(self.ref, "myid"), 2.5, phases={"build": 2})
+            tracer.flush_trace()
+        self.assertIn('"_action":"PACKAGE_BUILT_FROM_SOURCES"', load(self.trace_file))
+        self.assertEqual(self._actions()[0]["phases"], {"build": 2})
+
+        with tools.environment_append({"CONAN_TRACE_FILE": self.trace_file,
+                                       "CONAN_TRACE_FORMAT": "binary"}):
+            with self.assertRaisesRegexp(ConanException, "Bad CONAN_TRACE_FORMAT value"):
+                tracer.log_recipe_got_from_local_cache(self.ref)
@@ -26,7 +26,7 @@ class TestServerLauncher(object):
                  write_permissions=None, users=None, base_url=None, plugins=None,
                  server_version=None,
                  min_client_compatible_version=None,
-                 server_capabilities=None):
+                 server_capabilities=None, dedup=False, upstream=None):
 
         plugins = plugins or []
         if not base_path:
@@ -52,7 +52,8 @@ class TestServerLauncher(object):
                                                    server_config.authorize_timeout)
         base_url = base_url or server_config.public_url
         self.server_store = get_server_store(server_config.disk_storage_path,
-                                             base_url, updown_auth_manager)
+                                             base_url, updown_auth_manager, dedup,
+                                             upstream)
 
         # Prepare some test users
         if not read_permissions:
@@ -102,7 +102,7 @@ class TestingResponse(object):
 
     @property
     def ok(self):
-        return self.test_response.status_code == 200
+        return self.test_response.status_code < 400  # As requests does
 
     @property
     def content(self):
@@ -233,7 +233,8 @@ class TestServer(object):
                  write_permissions=None, users=None, plugins=None, base_path=None,
                  server_version=Version(SERVER_VERSION),
                  min_client_compatible_version=Version(MIN_CLIENT_COMPATIBLE_VERSION),
-                 server_capabilities=None, complete_urls=False):
+                 server_capabilities=None, complete_urls=False, dedup=False,
+                 upstream=None):
         """
              'read_permissions' and 'write_permissions' is a list of:
                  [("opencv/2.3.4@lasote/testing", "user1, user2")]
@@ -260,7 +261,8 @@ class TestServer(object):
                                               plugins=plugins,
                                               server_version=server_version,
                                               min_client_compatible_version=min_client_ver,
-                                              server_capabilities=server_capabilities)
+                                              server_capabilities=server_capabilities,
+                                              dedup=dedup, upstream=upstream)
         self.app = TestApp(self.test_server.ra.root_app)
 
     @property
@@ -594,6 +596,15 @@ servers["r2"] = TestServer()
         # Maybe something have changed with migrations
         return self._init_collaborators(user_io)
 
+    def get_conan_api(self, user_io=None):
+        """ a ConanAPI instance, to test the API methods and arguments without a command
+        """
+        _, requester = self.init_dynamic_vars(user_io)
+        with tools.environment_append(self.client_cache.conan_config.env_vars):
+            interactive = not get_env("CONAN_NON_INTERACTIVE", False)
+            return Conan(self.client_cache, self.user_io, self.runner, self.remote_manager,
+                         self.hook_manager, requester, interactive=interactive)
+
     def run(self, command_line, user_io=None, assert_error=False):
         """ run a single command as in the command line.
             If user or password is filled, user_io will be mocked to return this
@@ -622,9 +633,12 @@ servers["r2"] = TestServer()
             sys.path = old_path
             os.chdir(current_dir)
             # Reset sys.modules to its prev state. A .copy() DOES NOT WORK
+            # The conans modules are kept, the lazy attributes of conans (as the build
+            # helpers) are imported the first time inside a command, and they are cached
             added_modules = set(sys.modules).difference(old_modules)
             for added in added_modules:
-                sys.modules.pop(added, None)
+                if not added.startswith("conans."):
+                    sys.modules.pop(added, None)
 
         if (assert_error and not error) or (not assert_error and error):
             if assert_error:
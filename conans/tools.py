@@ -10,8 +10,6 @@
     the currification.
 """
 
-import requests
-
 from conans.client.output import ConanOutput
 # Tools from conans.client.tools
 from conans.client.tools import files as tools_files, net as tools_net, oss as tools_oss, \
@@ -22,6 +20,7 @@ from conans.client.tools.scm import *  # pylint: disable=unused-import
 from conans.client.tools.apple import *
 # Tools form conans.util
 from conans.util.env_reader import get_env
+from conans.util.lazy import lazy_attributes
 from conans.util.files import _generic_algorithm_sum, load, md5, md5sum, mkdir, relative_dirs, \
     rmdir, save as files_save, save_append, sha1sum, sha256sum, touch, sha1sum, sha256sum, \
     to_file_bytes, touch
@@ -50,8 +49,18 @@ def get_global_instances():
     return _global_output, _global_requester
 
 
+class _DefaultRequester(object):
+    """ The requests module, imported the first time it is used """
+
+    def __getattr__(self, name):
+        import requests
+        return getattr(requests, name)
+
+
+lazy_attributes(__name__, {"requests": "requests"})
+
 # Assign a default, will be overwritten in the factory of the ConanAPI
-set_global_instances(the_output=ConanOutput(sys.stdout, True), the_requester=requests)
+set_global_instances(the_output=ConanOutput(sys.stdout, True), the_requester=_DefaultRequester())
 
 
 """
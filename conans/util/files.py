@@ -1,4 +1,5 @@
 import hashlib
+import multiprocessing
 import os
 import platform
 import re
@@ -8,12 +9,21 @@ import sys
 import tarfile
 import tempfile
 from contextlib import contextmanager
-from errno import ENOENT
+from errno import EEXIST, EMLINK, ENOENT
 from os.path import abspath, join as joinpath, realpath
 
 import six
 
 from conans.util.log import logger
+from conans.util.parallel import run_in_parallel
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# ioctl to clone the extents of a file (btrfs, xfs...): _IOW(0x94, 9, int)
+_FICLONE = 0x40049409
 
 
 def walk(top, **kwargs):
@@ -97,6 +107,22 @@ def md5sum(file_path):
     return _generic_algorithm_sum(file_path, "md5")
 
 
+def md5sums(file_paths):
+    """ Computes the md5 of several files using a pool of threads, hashlib and the file reads
+    release the GIL. Returns a {file_path: md5} dict
+    """
+    file_paths = list(file_paths)
+    try:
+        workers = min(multiprocessing.cpu_count(), 8)
+    except NotImplementedError:
+        workers = 1
+    results = run_in_parallel(md5sum, file_paths, workers)
+    for result in results:
+        if isinstance(result, Exception):
+            raise result
+    return dict(zip(file_paths, results))
+
+
 def sha1sum(file_path):
     return _generic_algorithm_sum(file_path, "sha1")
 
@@ -123,6 +149,7 @@ def save_append(path, content):
     except:
         pass
 
+    break_hardlink(path)
     with open(path, "ab") as handle:
         handle.write(to_file_bytes(content))
 
@@ -147,6 +174,7 @@ def save(path, content, only_if_modified=False):
         if old_content == new_content:
             return
 
+    break_hardlink(path)
     with open(path, "wb") as handle:
         handle.write(new_content)
 
@@ -216,7 +244,12 @@ def mkdir(path):
     """Recursive mkdir, doesnt fail if already existing"""
     if os.path.exists(path):
         return
-    os.makedirs(path)
+    try:
+        os.makedirs(path)
+    except OSError as e:
+        # Created concurrently by other thread or process
+        if e.errno != EEXIST or not os.path.isdir(path):
+            raise
 
 
 def path_exists(path, basedir):
@@ -304,6 +337,95 @@ def tar_extract(fileobj, destination_dir):
     the_tar.close()
 
 
+def _reflink(src, dst):
+    with open(src, "rb") as src_handle:
+        with open(dst, "wb") as dst_handle:
+            fcntl.ioctl(dst_handle.fileno(), _FICLONE, src_handle.fileno())
+    shutil.copystat(src, dst)
+
+
+class FileLinker(object):
+    """ Materializes files cloning them (reflink) if the filesystem supports it, hardlinking
+    them otherwise, and copying them as the last resort (e.g. different filesystems). A method
+    that fails is not tried again for the next files.
+    Hardlinked files share their contents with the source ones. The writes with save(),
+    save_append() and the tools break the link, but a file modified in place by any other
+    program modifies the source file too.
+    """
+
+    def __init__(self, reflink=True, hardlink=True):
+        self.reflink = reflink and fcntl is not None and platform.system() == "Linux"
+        self.hardlink = hardlink and hasattr(os, "link")
+
+    def __call__(self, src, dst):
+        """ :return: the method used: "reflink", "hardlink" or "copy"
+        """
+        if (self.reflink or self.hardlink) and os.path.lexists(dst):
+            os.unlink(dst)
+        if self.reflink:
+            try:
+                _reflink(src, dst)
+                return "reflink"
+            except (IOError, OSError) as e:
+                logger.debug("LINK: Cannot reflink %s: %s" % (src, str(e)))
+                self.reflink = False
+                if os.path.lexists(dst):
+                    os.unlink(dst)
+        if self.hardlink:
+            try:
+                os.link(src, dst)
+                return "hardlink"
+            except OSError as e:
+                logger.debug("LINK: Cannot hardlink %s: %s" % (src, str(e)))
+                if e.errno != EMLINK:  # Too many links of this file, but not of the next ones
+                    self.hardlink = False
+        shutil.copy2(src, dst)
+        return "copy"
+
+
+def link_tree(src, dst, ignore=None, linker=None):
+    """ Like shutil.copytree(src, dst, symlinks=True, ignore=ignore), but materializing the
+    files with a FileLinker instead of copying them
+    """
+    linker = linker or FileLinker()
+    names = os.listdir(src)
+    ignored_names = ignore(src, names) if ignore else set()
+    os.makedirs(dst)
+    for name in names:
+        if name in ignored_names:
+            continue
+        src_name = os.path.join(src, name)
+        dst_name = os.path.join(dst, name)
+        if os.path.islink(src_name):
+            os.symlink(os.readlink(src_name), dst_name)
+        elif os.path.isdir(src_name):
+            link_tree(src_name, dst_name, ignore, linker)
+        else:
+            linker(src_name, dst_name)
+    try:
+        shutil.copystat(src, dst)
+    except OSError:  # Windows cannot copy the times of folders
+        pass
+
+
+def break_hardlink(path):
+    """ Replaces a hardlinked file with a writable copy of its own, so writing it doesn't modify
+    the other links of the file. The shared inode could have been made read-only for another
+    link, as the files of a read-only cache
+    """
+    try:
+        st = os.lstat(path)
+        if st.st_nlink < 2:
+            return
+    except OSError:
+        return
+    tmp_path = path + ".conan_unlink"
+    shutil.copy2(path, tmp_path)
+    os.chmod(tmp_path, st.st_mode | stat.S_IWRITE)
+    os.unlink(path)
+    os.rename(tmp_path, path)
+
+
 def list_folder_subdirs(basedir, level):
     ret = []
     for root, dirs, _ in walk(basedir):
@@ -0,0 +1,48 @@
+import sys
+from importlib import import_module
+from types import ModuleType
+
+import six
+
+
+def _import_attribute(name, source):
+    module = import_module(source)
+    return module if source.split(".")[-1] == name else getattr(module, name)
+
+
+def lazy_attributes(module_name, attributes):
+    """ Defers the imports of the {name: source_module} attributes of a module until they are
+    used, e.g. "from conans import CMake" imports conans.client.build.cmake just then. The
+    attribute can be the source module itself, if it has the same name. "from module import *"
+    imports all of them.
+    Python 2 modules can't customize the attribute access, the attributes are imported now
+    """
+    module = sys.modules[module_name]
+    if six.PY2:
+        for name, source in attributes.items():
+            setattr(module, name, _import_attribute(name, source))
+        return
+
+    class LazyModule(ModuleType):
+        def __getattr__(self, name):
+            try:
+                source = attributes[name]
+            except KeyError:
+                raise AttributeError("module '%s' has no attribute '%s'" % (module_name, name))
+            value = _import_attribute(name, source)
+            setattr(self, name, value)
+            return value
+
+        def __dir__(self):
+            return sorted(set(ModuleType.__dir__(self)) | set(attributes))
+
+        @property
+        def __all__(self):
+            """ "from module import *" doesn't get the lazy attributes if they are not listed.
+            They are imported now, with them the same public names as the eager imports
+            """
+            for name in attributes:
+                getattr(self, name)
+            return sorted(name for name in self.__dict__ if not name.startswith("_"))
+
+    module.__class__ = LazyModule
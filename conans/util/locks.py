@@ -1,14 +1,24 @@
+import errno
 import os
 import time
 
 import fasteners
 
-from conans.util.files import load, save
+from conans.util.files import load, mkdir, save
 from conans.util.log import logger
+from conans.util.tracer import log_lock_wait
+
+try:
+    import fcntl
+except ImportError:  # Windows, only the readers count file can be used
+    fcntl = None
 
 
 class NoLock(object):
 
+    def try_acquire(self):
+        return True
+
     def __enter__(self):
         pass
 
@@ -27,38 +37,56 @@ class SimpleLock(object):
     def __exit__(self, exc_type, exc_val, exc_tb):  # @UnusedVariable
         self._lock.release()
 
+    def try_acquire(self):
+        """ Acquires the lock only if no other process holds it, without waiting """
+        return self._lock.acquire(blocking=False)
+
 
 READ_BUSY_DELAY = 0.5
 WRITE_BUSY_DELAY = 0.25
 
 
+# Errors meaning that the filesystem does not support the advisory locks (NFS, SMB...)
+_UNSUPPORTED_LOCK_ERRNOS = (errno.ENOLCK, errno.EOPNOTSUPP, errno.ENOSYS, errno.EINVAL)
+
+
 class Lock(object):
 
     @staticmethod
     def clean(folder):
-        if os.path.exists(folder + ".count"):
-            os.remove(folder + ".count")
-        if os.path.exists(folder + ".count.lock"):
-            os.remove(folder + ".count.lock")
+        for lock_file in (folder + ".count", folder + ".count.lock", folder + ".flock"):
+            if os.path.exists(lock_file):
+                os.remove(lock_file)
 
     def __init__(self, folder, locked_item, output):
         self._count_file = folder + ".count"
         self._count_lock_file = folder + ".count.lock"
+        self._flock_file = folder + ".flock"
+        self._flock_handle = None
         self._locked_item = locked_item
         self._output = output
         self._first_lock = True
+        self._wait_start = None
 
     @property
     def files(self):
-        return (self._count_file, self._count_lock_file)
+        return (self._count_file, self._count_lock_file, self._flock_file)
 
     def _info_locked(self):
         if self._first_lock:
             self._first_lock = False
+            self._wait_start = time.time()
             self._output.info("%s is locked by another concurrent conan process, wait..."
                               % str(self._locked_item))
             self._output.info("If not the case, quit, and do 'conan remove --locks'")
 
+    def _log_wait(self, lock_type):
+        if self._wait_start is not None:
+            duration = time.time() - self._wait_start
+            logger.debug("LOCK: Waited %.3fs for %s lock of %s"
+                         % (duration, lock_type, str(self._locked_item)))
+            log_lock_wait(self._locked_item, lock_type, duration)
+
     def _readers(self):
         try:
             return int(load(self._count_file))
@@ -68,10 +96,59 @@ class Lock(object):
             self._output.warn("%s does not contain a number!" % self._count_file)
             return 0
 
+    def _os_lock(self, operation, lock_type, wait=True):
+        """ Blocks until the OS shared/exclusive advisory lock of the item is acquired.
+        Returns False if the OS or the filesystem doesn't support them, then the readers
+        count file has to be used, and None if not waiting and other process holds it.
+        """
+        if fcntl is None:
+            return False
+        mkdir(os.path.dirname(self._flock_file))
+        handle = open(self._flock_file, "a")
+        try:
+            # Do not leak the lock to the processes launched while building
+            flags = fcntl.fcntl(handle, fcntl.F_GETFD)
+            fcntl.fcntl(handle, fcntl.F_SETFD, flags | fcntl.FD_CLOEXEC)
+            try:
+                fcntl.flock(handle, operation | fcntl.LOCK_NB)
+            except (IOError, OSError) as e:
+                if e.errno not in (errno.EAGAIN, errno.EACCES):
+                    raise
+                if not wait:
+                    handle.close()
+                    return None
+                self._info_locked()
+                fcntl.flock(handle, operation)
+                self._log_wait(lock_type)
+        except (IOError, OSError) as e:
+            handle.close()
+            if e.errno in _UNSUPPORTED_LOCK_ERRNOS:
+                logger.debug("LOCK: OS locks not supported for %s, using the readers count file"
+                             % self._flock_file)
+                return False
+            raise
+        except BaseException:
+            handle.close()
+            raise
+        self._flock_handle = handle
+        return True
+
+    def _os_unlock(self):
+        if self._flock_handle is None:
+            return False
+        try:
+            fcntl.flock(self._flock_handle, fcntl.LOCK_UN)
+        finally:
+            self._flock_handle.close()
+            self._flock_handle = None
+        return True
+
 
 class ReadLock(Lock):
 
     def __enter__(self):
+        if fcntl is not None and self._os_lock(fcntl.LOCK_SH, "read"):
+            return
         while True:
             with fasteners.InterProcessLock(self._count_lock_file, logger=logger):
                 readers = self._readers()
@@ -80,8 +157,11 @@ class ReadLock(Lock):
                     break
             self._info_locked()
             time.sleep(READ_BUSY_DELAY)
+        self._log_wait("read")
 
     def __exit__(self, exc_type, exc_val, exc_tb):   # @UnusedVariable
+        if self._os_unlock():
+            return
         with fasteners.InterProcessLock(self._count_lock_file, logger=logger):
             readers = self._readers()
             save(self._count_file, str(readers - 1))
@@ -89,7 +169,23 @@ class ReadLock(Lock):
 
 class WriteLock(Lock):
 
+    def try_acquire(self):
+        """ Acquires the lock only if no other process holds it, without waiting. If acquired,
+        it is released with __exit__
+        """
+        if fcntl is not None:
+            acquired = self._os_lock(fcntl.LOCK_EX, "write", wait=False)
+            if acquired is not False:
+                return acquired is True
+        with fasteners.InterProcessLock(self._count_lock_file, logger=logger):
+            if self._readers() != 0:
+                return False
+            save(self._count_file, "-1")
+            return True
+
     def __enter__(self):
+        if fcntl is not None and self._os_lock(fcntl.LOCK_EX, "write"):
+            return
         while True:
             with fasteners.InterProcessLock(self._count_lock_file, logger=logger):
                 readers = self._readers()
@@ -98,7 +194,10 @@ class WriteLock(Lock):
                     break
             self._info_locked()
             time.sleep(WRITE_BUSY_DELAY)
+        self._log_wait("write")
 
     def __exit__(self, exc_type, exc_val, exc_tb):  # @UnusedVariable
+        if self._os_unlock():
+            return
         with fasteners.InterProcessLock(self._count_lock_file, logger=logger):
             save(self._count_file, "0")
@@ -0,0 +1,33 @@
+from multiprocessing.pool import ThreadPool
+
+
+def run_in_parallel(function, items, workers, fail_fast=False):
+    """ Calls function(item) for every item using a pool of threads of 'workers' size, or
+    sequentially in the calling thread if there are not several workers or items.
+    Exceptions are not propagated, they are returned instead of the result, so callers
+    can report all the failed items. With 'fail_fast', the sequential calls stop at the first
+    exception, the last of the returned results.
+    :return: list of results (or raised exceptions), in the same order as items
+    """
+    def _safe_call(item):
+        try:
+            return function(item)
+        except Exception as exc:
+            return exc
+
+    items = list(items)
+    workers = min(workers or 1, len(items))
+    if workers <= 1:
+        results = []
+        for item in items:
+            results.append(_safe_call(item))
+            if fail_fast and isinstance(results[-1], Exception):
+                break
+        return results
+
+    pool = ThreadPool(workers)
+    try:
+        return pool.map(_safe_call, items)
+    finally:
+        pool.close()
+        pool.join()
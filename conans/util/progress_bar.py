@@ -2,8 +2,6 @@
 import os
 from contextlib import contextmanager
 
-from tqdm import tqdm
-
 TIMEOUT_BEAT_SECONDS = 30
 TIMEOUT_BEAT_CHARACTER = '.'
 
@@ -28,6 +26,7 @@ class _FileReaderWithProgressBar(object):
         self._output = output
         self._fileobj = fileobj
         self.seek(0, os.SEEK_END)
+        from tqdm import tqdm
         self._pb = tqdm(total=self.tell(), desc=desc, file=output, **pb_kwargs)
         self.seek(0)
 
@@ -51,6 +50,7 @@ class _FileReaderWithProgressBar(object):
 
     def pb_write(self, message):
         """ Allow to write messages to output without interfering with the progress bar """
+        from tqdm import tqdm
         tqdm.write(message, file=self._ori_output)
 
 
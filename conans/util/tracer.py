@@ -1,6 +1,8 @@
+import atexit
 import copy
 import json
 import os
+import threading
 import time
 from os.path import isdir
 
@@ -18,7 +20,8 @@ TRACER_ACTIONS = ["UPLOADED_RECIPE", "UPLOADED_PACKAGE",
                   "REST_API_CALL", "COMMAND",
                   "EXCEPTION",
                   "DOWNLOAD",
-                  "UNZIP", "ZIP"]
+                  "UNZIP", "ZIP",
+                  "LOCK_WAIT"]
 
 MASKED_FIELD = "**********"
 
@@ -46,13 +49,65 @@ def _get_tracer_file():
     return trace_path
 
 
+# The actions are buffered and written in batches, taking the file lock once per batch, so
+# tracing is cheap enough to be always enabled. They are flushed when the buffer is full, at the
+# end of every conan API call and at exit
+FLUSH_SIZE = 100
+_buffer = []  # [(trace file path, line)]
+_buffer_lock = threading.Lock()
+_flush_lock = threading.Lock()  # Keeps the order of the batches of concurrent flushes
+_valid_paths = set()
+
+
+def _get_tracer_format():
+    """ CONAN_TRACE_FORMAT: 'json' (default), sorted and readable, or 'compact', the shortest
+    json lines, in the order the fields are added
+    """
+    trace_format = os.environ.get("CONAN_TRACE_FORMAT", None) or "json"
+    if trace_format not in ("json", "compact"):
+        raise ConanException("Bad CONAN_TRACE_FORMAT value '%s', use 'json' or 'compact'"
+                             % trace_format)
+    return trace_format
+
+
+def _dumps(obj):
+    if _get_tracer_format() == "compact":
+        return json.dumps(obj, separators=(",", ":"))
+    return json.dumps(obj, sort_keys=True)
+
+
+def flush_trace():
+    """ Writes the buffered actions to their trace files """
+    with _flush_lock:
+        with _buffer_lock:
+            entries = _buffer[:]
+            del _buffer[:]
+        lines = {}
+        for filepath, line in entries:
+            lines.setdefault(filepath, []).append(line)
+        for filepath, file_lines in lines.items():
+            with fasteners.InterProcessLock(filepath + ".lock", logger=logger):
+                with open(filepath, "a") as logfile:
+                    logfile.write("".join(file_lines))
+
+
+atexit.register(flush_trace)
+
+
 def _append_to_log(obj):
-    """Add a new line to the log file locking the file to protect concurrent access"""
-    if _get_tracer_file():
-        filepath = _get_tracer_file()
-        with fasteners.InterProcessLock(filepath + ".lock", logger=logger):
-            with open(filepath, "a") as logfile:
-                logfile.write(json.dumps(obj, sort_keys=True) + "\n")
+    """Buffer a new line for the log file, the file is written in batches"""
+    filepath = os.environ.get("CONAN_TRACE_FILE", None)
+    if filepath is None:
+        return
+    if filepath not in _valid_paths:
+        _get_tracer_file()
+        _valid_paths.add(filepath)
+    line = _dumps(obj) + "\n"
+    with _buffer_lock:
+        _buffer.append((filepath, line))
+        full = len(_buffer) >= FLUSH_SIZE
+    if full:
+        flush_trace()
 
 
 def _append_action(action_name, props):
@@ -60,6 +115,7 @@ def _append_action(action_name, props):
     _validate_action(action_name)
     props["_action"] = action_name
     props["time"] = time.time()
+    props["pid"] = os.getpid()
     _append_to_log(props)
 
 
@@ -127,19 +183,22 @@ def log_package_got_from_local_cache(package_ref):
     _append_action("GOT_PACKAGE_FROM_LOCAL_CACHE", {"_id": str(package_ref)})
 
 
-def log_package_built(package_ref, duration, log_run=None):
+def log_package_built(package_ref, duration, log_run=None, phases=None):
+    """phases is a dict with the duration of every step of the build, as prepare, build..."""
     assert(isinstance(package_ref, PackageReference))
-    _append_action("PACKAGE_BUILT_FROM_SOURCES", {"_id": str(package_ref), "duration": duration, "log": log_run})
+    _append_action("PACKAGE_BUILT_FROM_SOURCES", {"_id": str(package_ref), "duration": duration,
+                                                  "log": log_run, "phases": phases or {}})
 
 
-def log_client_rest_api_call(url, method, duration, headers):
+def log_client_rest_api_call(url, method, duration, headers, status=None, size=None):
     headers = copy.copy(headers)
     headers["Authorization"] = MASKED_FIELD
     headers["X-Client-Anonymous-Id"] = MASKED_FIELD
     if "signature=" in url:
         url = url.split("signature=")[0] + "signature=%s" % MASKED_FIELD
     _append_action("REST_API_CALL", {"method": method, "url": url,
-                                     "duration": duration, "headers": headers})
+                                     "duration": duration, "headers": headers,
+                                     "status": status, "bytes": size})
 
 
 def log_command(name, parameters):
@@ -155,15 +214,31 @@ def log_exception(exc, message):
     _append_action("EXCEPTION", {"class": str(exc.__class__.__name__), "message": message})
 
 
-def log_download(url, duration):
-    _append_action("DOWNLOAD", {"url": url, "duration": duration})
+def log_download(url, duration, size=None, queue_wait=None):
+    """queue_wait is the time the download waited for a free worker, if done concurrently"""
+    _append_action("DOWNLOAD", {"url": url, "duration": duration, "bytes": size,
+                                "queue_wait": queue_wait})
+
+
+def _file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return None
 
 
 def log_uncompressed_file(src_path, duration, dest_folder):
-    _append_action("UNZIP", {"src": src_path, "dst": dest_folder, "duration": duration})
+    _append_action("UNZIP", {"src": src_path, "dst": dest_folder, "duration": duration,
+                             "bytes": _file_size(src_path)})
 
 
 def log_compressed_files(files, duration, tgz_path):
     files = files or {}
     files_compressed = [_file_document(name, path) for name, path in files.items()]
-    _append_action("ZIP", {"src": files_compressed, "dst": tgz_path, "duration": duration})
+    _append_action("ZIP", {"src": files_compressed, "dst": tgz_path, "duration": duration,
+                           "bytes": _file_size(tgz_path)})
+
+
+def log_lock_wait(locked_item, lock_type, duration):
+    _append_action("LOCK_WAIT", {"_id": str(locked_item), "lock": lock_type,
+                                 "duration": duration})
@@ -129,6 +129,7 @@ setup(
         'console_scripts': [
             'conan=conans.conan:run',
             'conan_server=conans.conan_server:run',
+            'conan_daemon=conans.conan_daemon:run',
             'conan_build_info=conans.build_info.command:run'
         ],
     },